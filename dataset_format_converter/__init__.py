@@ -7,6 +7,7 @@ Dataset Format Converter - 多格式数据集标注转换工具
 - LabelImg-OBB
 - DOTA
 - PASCAL VOC
+- COCO
 
 主要功能：
 - 多格式相互转换
@@ -28,6 +29,7 @@ from .formats.yolo_obb import YoloOBBFormat
 from .formats.labelimg_obb import LabelImgOBBFormat
 from .formats.dota import DOTAFormat
 from .formats.pascal_voc import PascalVOCFormat
+from .formats.coco import COCOFormat
 
 __all__ = [
     'CommonFormat',
@@ -37,5 +39,6 @@ __all__ = [
     'YoloOBBFormat',
     'LabelImgOBBFormat',
     'DOTAFormat',
-    'PascalVOCFormat'
+    'PascalVOCFormat',
+    'COCOFormat'
 ] 
\ No newline at end of file
@@ -3,11 +3,21 @@
 """
 
 import argparse
+import json
 import os
 import sys
 from typing import List, Optional
 
 from ..core.format_manager import format_manager
+from ..core.archive_io import is_archive_path
+from ..core.common_format import VALIDATION_LEVELS, PRECISION_MODES
+from ..core.geometry_utils import OBB_FIT_MODES
+from ..core.clipping import CLIP_MODES
+from ..core.class_mapping import ClassMapping
+from ..core.split import DatasetSplitter, SPLIT_MODES
+from ..core.planner import ConversionPlan, format_bytes
+from ..core.progress import format_duration
+from ..core.error_report import ERROR_LOG_LEVELS, ErrorCollector, ErrorSummary, collect_errors
 from ..i18n.translation import t, set_language, get_available_languages
 from ..config.settings import get_settings, update_settings, save_settings
 from .. import __version__
@@ -123,7 +133,13 @@ def interactive_mode():
     
     # 执行转换
     try:
-        if os.path.isfile(input_path):
+        if is_archive_path(input_path) or is_archive_path(output_path):
+            print(f"\n{t('messages.processing_file', file=input_path)}")
+            format_manager.convert_archive(
+                input_path, output_path, input_format, output_format,
+                width, height, class_names
+            )
+        elif os.path.isfile(input_path):
             print(f"\n{t('messages.processing_file', file=input_path)}")
             format_manager.convert_file(
                 input_path, output_path, input_format, output_format,
@@ -142,8 +158,319 @@ def interactive_mode():
         print(f"\n{t('messages.conversion_failed', error=str(e))}")
 
 
+def build_class_mapping(args) -> Optional[ClassMapping]:
+    """
+    根据命令行参数构建类别映射
+    
+    Args:
+        args: 解析后的命令行参数
+        
+    Returns:
+        Optional[ClassMapping]: 类别映射，未指定任何映射参数时返回None
+    """
+    if not (args.class_map or args.map_class or args.keep_classes or args.drop_classes):
+        return None
+    
+    def split_names(value: Optional[str]) -> Optional[List[str]]:
+        return [name.strip() for name in value.split(',') if name.strip()] if value else None
+    
+    mapping = ClassMapping.parse_rules(args.map_class)
+    keep = split_names(args.keep_classes)
+    drop = split_names(args.drop_classes)
+    if args.class_map:
+        return ClassMapping.from_file(args.class_map, mapping=mapping, keep=keep, drop=drop)
+    return ClassMapping(mapping=mapping, keep=keep, drop=drop)
+
+
+def write_json(data, output_path: Optional[str]) -> None:
+    """
+    输出 JSON（未指定文件时输出到标准输出）
+    
+    Args:
+        data: 可序列化为 JSON 的数据
+        output_path: 输出文件路径（可选）
+    """
+    text = json.dumps(data, ensure_ascii=False, indent=2)
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+def print_clip_stats(stats) -> None:
+    """
+    输出图片边界裁剪统计（没有框被裁剪或删除时不输出）
+    
+    Args:
+        stats: 裁剪统计（ClipStats）
+    """
+    if stats.clipped_boxes:
+        print(t('messages.clipped_boxes', count=stats.clipped_boxes,
+                mean=f"{stats.change_mean:.1%}", max=f"{stats.change_max:.1%}"))
+    if stats.removed_boxes:
+        print(t('messages.outside_boxes', count=stats.removed_boxes))
+
+
+def print_error_summary(summary: ErrorSummary) -> None:
+    """
+    输出逐文件错误汇总（没有错误时不输出）
+    
+    Args:
+        summary: 错误汇总（ErrorSummary）
+    """
+    if not summary.total:
+        return
+    print(t('messages.error_summary', count=summary.total, types=len(summary.counts)))
+    for key, count in sorted(summary.counts.items(), key=lambda item: -item[1]):
+        sample = summary.samples[key][0] if summary.samples.get(key) else None
+        example = f" - {sample['path']}: {sample['message']}" if sample else ""
+        print(f"  {key}: {count}{example}")
+
+
+def print_plan(plan: ConversionPlan) -> None:
+    """输出转换计划"""
+    print(t('messages.plan_header', input_format=plan.input_format, output_format=plan.output_format))
+    print(f"  {t('messages.plan_files', total=plan.total_files, sampled=plan.sampled_files)}")
+    boxes = t('messages.plan_boxes', boxes=plan.estimated_boxes, per_file=f"{plan.boxes_per_file:.1f}",
+              empty=plan.estimated_empty_files)
+    print(f"  {boxes}")
+    print(f"  {t('messages.plan_output_size', size=format_bytes(plan.estimated_output_bytes))}")
+    runtime = t('messages.plan_runtime', duration=format_duration(plan.estimated_seconds),
+                factor=f"{plan.speed_factor:.2f}")
+    print(f"  {runtime}")
+    if plan.failed_samples:
+        print(f"  {t('messages.warning')}: {t('messages.plan_failed_samples', count=plan.failed_samples)}")
+    if plan.mixed_dimensions:
+        sizes = ", ".join(f"{size} ({count})" for size, count in plan.image_sizes.items())
+        print(f"  {t('messages.warning')}: {t('messages.plan_mixed_dimensions', sizes=sizes)}")
+    if plan.collision_count:
+        examples = "; ".join(" / ".join(group) for group in plan.name_collisions[:3])
+        collisions = t('messages.plan_name_collisions', count=plan.collision_count, examples=examples)
+        print(f"  {t('messages.warning')}: {collisions}")
+    if plan.existing_outputs:
+        print(f"  {t('messages.warning')}: {t('messages.plan_existing_outputs', count=plan.existing_outputs)}")
+
+
+def stats_main(argv: List[str]):
+    """stats 子命令：只读统计数据集（目录或归档），以 JSON 输出"""
+    settings = get_settings()
+    set_language(settings.language)
+    
+    parser = argparse.ArgumentParser(
+        prog='dataset-format-converter stats',
+        description="统计数据集：类别分布、空图片数、框尺寸/长宽比直方图、旋转框角度分布"
+    )
+    parser.add_argument('input', help="输入目录或归档（tar/zip）")
+    parser.add_argument('--input-format', '-if', required=True,
+                        choices=format_manager.list_formats(), help=t('cli.input_format'))
+    parser.add_argument('--width', '-w', type=int, default=settings.last_image_width,
+                        help=f"{t('cli.width')} (默认: {settings.last_image_width})")
+    parser.add_argument('--height', type=int, default=settings.last_image_height,
+                        help=f"{t('cli.height')} (默认: {settings.last_image_height})")
+    parser.add_argument('--classes', '-c', metavar='FILE', help=t('cli.classes'))
+    parser.add_argument('--batch-size', type=int, default=256, help="每批解析的文件数（默认: 256）")
+    parser.add_argument('--output', '-o', metavar='FILE', help="JSON 输出文件（默认输出到标准输出）")
+    args = parser.parse_args(argv)
+    
+    if not os.path.exists(args.input):
+        print(f"{t('messages.error')}: {t('messages.file_not_found', file=args.input)}", file=sys.stderr)
+        sys.exit(1)
+    
+    class_names = None
+    if args.classes:
+        if os.path.exists(args.classes):
+            class_names = load_class_names(args.classes)
+        else:
+            print(f"{t('messages.warning')}: {t('messages.file_not_found', file=args.classes)}", file=sys.stderr)
+    
+    try:
+        statistics = format_manager.collect_statistics(
+            args.input, args.input_format, args.width, args.height, class_names,
+            batch_size=args.batch_size
+        )
+    except Exception as e:
+        print(f"{t('messages.error')}: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    write_json(statistics.to_dict(), args.output)
+
+
+def lint_main(argv: List[str]):
+    """lint 子命令：并行检查数据集中的标注问题，诊断以 JSON Lines 输出"""
+    settings = get_settings()
+    set_language(settings.language)
+    
+    parser = argparse.ArgumentParser(
+        prog='dataset-format-converter lint',
+        description="检查数据集：坐标越界、退化/自相交多边形、未知类别、重复记录等，每条诊断输出一行 JSON"
+    )
+    parser.add_argument('input', help="输入目录或文件")
+    parser.add_argument('--input-format', '-if', required=True,
+                        choices=format_manager.list_formats(), help=t('cli.input_format'))
+    parser.add_argument('--width', '-w', type=int, default=settings.last_image_width,
+                        help=f"{t('cli.width')} (默认: {settings.last_image_width})")
+    parser.add_argument('--height', type=int, default=settings.last_image_height,
+                        help=f"{t('cli.height')} (默认: {settings.last_image_height})")
+    parser.add_argument('--classes', '-c', metavar='FILE', help="类别名称文件（指定时检查未知类别）")
+    parser.add_argument('--tolerance', type=float, default=1e-6,
+                        help="坐标范围检查允许的误差（归一化坐标，默认: 1e-6）")
+    parser.add_argument('--workers', type=int, help="工作进程数（默认: CPU核数）")
+    parser.add_argument('--chunk-size', type=int, default=256, help="每个任务检查的文件数（默认: 256）")
+    parser.add_argument('--output', '-o', metavar='FILE', help="诊断输出文件（默认输出到标准输出）")
+    args = parser.parse_args(argv)
+    
+    class_names = None
+    if args.classes:
+        if os.path.exists(args.classes):
+            class_names = load_class_names(args.classes)
+        else:
+            print(f"{t('messages.warning')}: {t('messages.file_not_found', file=args.classes)}", file=sys.stderr)
+    
+    try:
+        report = format_manager.lint(
+            args.input, args.input_format, args.width, args.height, class_names,
+            tolerance=args.tolerance, workers=args.workers, chunk_size=args.chunk_size
+        )
+    except Exception as e:
+        print(f"{t('messages.error')}: {str(e)}", file=sys.stderr)
+        sys.exit(2)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            report.write_jsonl(f)
+    else:
+        report.write_jsonl(sys.stdout)
+    
+    # 汇总输出到标准错误，不干扰诊断流
+    summary = ", ".join(f"{code}: {count}" for code, count in report.counts().items()) or "OK"
+    print(f"{report.total_files} files, {report.total_records} records - {summary}", file=sys.stderr)
+    sys.exit(0 if report.is_clean else 1)
+
+
+def tile_main(argv: List[str]):
+    """tile 子命令：将大尺寸图片的标注（和图片）切分为带重叠的切片"""
+    settings = get_settings()
+    set_language(settings.language)
+    
+    parser = argparse.ArgumentParser(
+        prog='dataset-format-converter tile',
+        description="切片：将大尺寸图片（如 DOTA 航拍图）的标注切分为带重叠的固定尺寸切片，以任意输出格式写出"
+    )
+    parser.add_argument('input', help="输入目录")
+    parser.add_argument('output', help="切片标注输出目录")
+    parser.add_argument('--input-format', '-if', required=True,
+                        choices=format_manager.list_formats(), help=t('cli.input_format'))
+    parser.add_argument('--output-format', '-of', required=True,
+                        choices=format_manager.list_formats(), help=t('cli.output_format'))
+    parser.add_argument('--width', '-w', type=int, default=settings.last_image_width,
+                        help=f"{t('cli.width')} (默认: {settings.last_image_width})")
+    parser.add_argument('--height', type=int, default=settings.last_image_height,
+                        help=f"{t('cli.height')} (默认: {settings.last_image_height})")
+    parser.add_argument('--classes', '-c', metavar='FILE', help=t('cli.classes'))
+    parser.add_argument('--tile-size', type=int, default=1024, help="切片尺寸（像素，默认: 1024）")
+    parser.add_argument('--overlap', type=int, default=200, help="相邻切片的重叠（像素，默认: 200）")
+    parser.add_argument('--min-visibility', type=float, default=0.5,
+                        help="被切片截断的框保留的最小可见比例（默认: 0.5）")
+    parser.add_argument('--clip-mode', choices=CLIP_MODES, default='polygon',
+                        help="被截断的框的还原方式：polygon 化简为四边形，min-area 重新拟合旋转矩形（默认: polygon）")
+    parser.add_argument('--keep-empty', action='store_true', help="输出没有框的切片")
+    parser.add_argument('--image-dir', metavar='DIR', help="原图目录（用于读取每张图片的实际尺寸）")
+    parser.add_argument('--image-output', metavar='DIR', help="切片图片输出目录（需同时指定 --image-dir）")
+    parser.add_argument('--validation', choices=VALIDATION_LEVELS, default='strict',
+                        help="校验级别（默认: strict）")
+    parser.add_argument('--obb-fit', choices=OBB_FIT_MODES, default='edges',
+                        help="输出 LabelImg-OBB 等参数化旋转框时的拟合方式（默认: edges）")
+    parser.add_argument('--error-log', choices=ERROR_LOG_LEVELS, default='sampled',
+                        help="逐文件错误的输出级别（默认: sampled）")
+    parser.add_argument('--error-log-limit', type=int, default=10,
+                        help="sampled 级别下每类错误最多输出的条数（默认: 10）")
+    parser.add_argument('--error-report', metavar='FILE', help="将逐文件错误写入 JSONL 报告")
+    args = parser.parse_args(argv)
+    
+    if args.image_output and not args.image_dir:
+        parser.error("--image-output requires --image-dir")
+    
+    class_names = None
+    if args.classes:
+        if os.path.exists(args.classes):
+            class_names = load_class_names(args.classes)
+        else:
+            print(f"{t('messages.warning')}: {t('messages.file_not_found', file=args.classes)}", file=sys.stderr)
+    
+    try:
+        result = format_manager.tile_dataset(
+            args.input, args.output, args.input_format, args.output_format,
+            args.width, args.height, class_names,
+            tile_size=args.tile_size, overlap=args.overlap, min_visibility=args.min_visibility,
+            clip_mode=args.clip_mode, keep_empty=args.keep_empty,
+            image_dir=args.image_dir, image_output_dir=args.image_output,
+            validation=args.validation, obb_fit=args.obb_fit,
+            error_collector=ErrorCollector(args.error_log, args.error_log_limit, report_path=args.error_report)
+        )
+    except Exception as e:
+        print(f"{t('messages.error')}: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    
+    print_error_summary(result.errors)
+    print(t('messages.tiles_written', images=result.converted_files, tiles=result.tiles))
+    stats = result.clipping
+    if stats.clipped_boxes:
+        print(t('messages.tile_clipped_boxes', count=stats.clipped_boxes,
+                mean=f"{stats.change_mean:.1%}", max=f"{stats.change_max:.1%}"))
+    if stats.removed_boxes:
+        print(t('messages.tile_dropped_boxes', count=stats.removed_boxes))
+
+
+def classes_main(argv: List[str]):
+    """classes 子命令：并行扫描全部标注文件，输出完整的类别表（每行一个）"""
+    settings = get_settings()
+    set_language(settings.language)
+    
+    parser = argparse.ArgumentParser(
+        prog='dataset-format-converter classes',
+        description="发现类别：并行扫描目录中的全部标注文件，按 classes.txt 的格式输出类别表（结果按目录缓存）"
+    )
+    parser.add_argument('input', help="输入目录或文件")
+    parser.add_argument('--input-format', '-if', required=True,
+                        choices=format_manager.list_formats(), help=t('cli.input_format'))
+    parser.add_argument('--workers', type=int, default=None, help="工作进程数（默认: CPU核数）")
+    parser.add_argument('--no-cache', action='store_true', help="不读取也不写入类别缓存")
+    parser.add_argument('--output', '-o', metavar='FILE', help="类别表输出文件（默认输出到标准输出）")
+    args = parser.parse_args(argv)
+    
+    try:
+        class_names = format_manager.discover_class_names(
+            args.input, args.input_format, workers=args.workers, use_cache=not args.no_cache
+        )
+    except Exception as e:
+        print(f"{t('messages.error')}: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    
+    text = "".join(f"{class_name}\n" for class_name in class_names)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(t('messages.classes_discovered', count=len(class_names)), file=sys.stderr)
+    else:
+        sys.stdout.write(text)
+
+
+# 在主参数解析之前分派的子命令
+SUBCOMMANDS = {
+    'stats': stats_main,
+    'lint': lint_main,
+    'tile': tile_main,
+    'classes': classes_main,
+}
+
+
 def main():
     """CLI主函数"""
+    # 子命令在主参数解析之前分派，不影响原有的参数形式
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        SUBCOMMANDS[sys.argv[1]](sys.argv[2:])
+        return
+    
     # 加载设置
     settings = get_settings()
     set_language(settings.language)
@@ -223,6 +550,200 @@ def main():
         help="显示详细信息"
     )
 
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help="从断点续传：跳过输出目录转换日志中已完成的文件（仅目录转换，不支持 COCO 等单文件数据集）"
+    )
+    
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=256,
+        help="目录转换时每批处理并记录日志的文件数（默认: 256）"
+    )
+
+    parser.add_argument(
+        '--shard-index',
+        type=int,
+        default=0,
+        help="分片索引，与 --shard-count 一起使用（默认: 0）"
+    )
+    
+    parser.add_argument(
+        '--shard-count',
+        type=int,
+        default=1,
+        help="分片总数，按文件名哈希划分输入目录（默认: 1，不分片）"
+    )
+    
+    parser.add_argument(
+        '--work-queue',
+        metavar='DB',
+        help="SQLite 工作队列文件，多个进程可共享同一队列协同转换"
+    )
+    
+    parser.add_argument(
+        '--worker-id',
+        help="工作进程标识（默认: 主机名:进程号）"
+    )
+    
+    parser.add_argument(
+        '--lease-timeout',
+        type=float,
+        default=600.0,
+        help="工作队列租约超时时间（秒），超时的批次将被重新分配（默认: 600）"
+    )
+    
+    parser.add_argument(
+        '--max-attempts',
+        type=int,
+        default=3,
+        help="工作队列中每个批次最多租用的次数，超过后标记为失败不再重试（默认: 3）"
+    )
+    
+    parser.add_argument(
+        '--validation',
+        choices=VALIDATION_LEVELS,
+        default='strict',
+        help="校验级别：strict 检查并裁剪坐标，clip-only 只裁剪，trusted 不做任何检查（默认: strict）"
+    )
+    
+    parser.add_argument(
+        '--precision',
+        choices=PRECISION_MODES,
+        default='float64',
+        help="中间层坐标精度：float32 使用紧凑边界框，内存约减半（默认: float64）"
+    )
+    
+    parser.add_argument(
+        '--class-map',
+        metavar='FILE',
+        help="类别映射文件，每行一条 源类别=目标类别 规则（目标为空表示删除该类别）"
+    )
+    
+    parser.add_argument(
+        '--map-class',
+        action='append',
+        default=[],
+        metavar='SRC=DST',
+        help="重命名/合并类别，可重复使用"
+    )
+    
+    parser.add_argument(
+        '--keep-classes',
+        metavar='NAMES',
+        help="只保留这些类别（逗号分隔）"
+    )
+    
+    parser.add_argument(
+        '--drop-classes',
+        metavar='NAMES',
+        help="删除这些类别（逗号分隔）"
+    )
+    
+    parser.add_argument(
+        '--split',
+        metavar='RATIOS',
+        help="转换时划分数据集，如 train=0.8,val=0.1,test=0.1（标注写入 输出目录/<划分>/labels，仅目录转换）"
+    )
+    
+    parser.add_argument(
+        '--split-mode',
+        choices=SPLIT_MODES,
+        default='random',
+        help="划分方式：random 按文件名哈希，stratified 按类别分层，list 按列表文件（默认: random）"
+    )
+    
+    parser.add_argument(
+        '--split-seed',
+        type=int,
+        default=0,
+        help="random 划分的随机种子（默认: 0）"
+    )
+    
+    parser.add_argument(
+        '--split-list',
+        metavar='FILE',
+        help="list 划分的列表文件，每行为 文件名 划分名"
+    )
+    
+    parser.add_argument(
+        '--image-dir',
+        metavar='DIR',
+        help="图片目录，划分时图片硬链接到 输出目录/<划分>/images"
+    )
+    
+    parser.add_argument(
+        '--clip-to-image',
+        dest='clip_mode',
+        choices=CLIP_MODES,
+        help="将跨越图片边界的框按多边形裁剪到图片内（代替逐坐标裁剪）：polygon 化简为四边形，"
+             "min-area 重新拟合最小面积外接矩形；完全在图片外的框被删除"
+    )
+    
+    parser.add_argument(
+        '--canonical-order',
+        action='store_true',
+        help="统一角点顺序：顺时针排列，从左上角开始（边 0→1 与 x 轴夹角在 [-45°, 45°) 内），"
+             "修正输入中环绕方向或起点不一致的四边形"
+    )
+    
+    parser.add_argument(
+        '--obb-fit',
+        choices=OBB_FIT_MODES,
+        default='edges',
+        help="输出 LabelImg-OBB 等参数化旋转框时的拟合方式：edges 直接取边 0→1/0→3，"
+             "min-area 使用最小面积外接矩形（适用于不规则四边形，默认: edges）"
+    )
+    
+    parser.add_argument(
+        '--dedup-iou',
+        type=float,
+        metavar='IOU',
+        help="删除重复框：同一图片同一类别中旋转框 IoU 不小于该值的框只保留一个（如 0.9）"
+    )
+    
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help="试运行：抽样解析输入，输出转换计划（文件数、框数、输出大小、预计耗时、尺寸不一致和文件名冲突），"
+             "不写出任何文件"
+    )
+    
+    parser.add_argument(
+        '--sample-size',
+        type=int,
+        default=200,
+        help="试运行时解析的样本文件数（默认: 200）"
+    )
+    
+    parser.add_argument(
+        '--stats-output',
+        metavar='FILE',
+        help="转换时统计输出数据集，并将统计结果以 JSON 写入该文件（目录/归档转换）"
+    )
+    
+    parser.add_argument(
+        '--error-log',
+        choices=ERROR_LOG_LEVELS,
+        default='sampled',
+        help="逐文件错误的输出级别：all 逐条输出，sampled 每类错误只输出前几条，quiet 只输出汇总（默认: sampled）"
+    )
+    
+    parser.add_argument(
+        '--error-log-limit',
+        type=int,
+        default=10,
+        help="sampled 级别下每类错误最多输出的条数（默认: 10）"
+    )
+    
+    parser.add_argument(
+        '--error-report',
+        metavar='FILE',
+        help="将逐文件错误写入 JSONL 报告（每行一条：阶段、错误类型、文件、错误信息；目录/归档转换）"
+    )
+
     # 解析参数
     args = parser.parse_args()
     
@@ -262,20 +783,90 @@ def main():
         else:
             print(f"{t('messages.warning')}: {t('messages.file_not_found', file=args.classes)}")
     
+    # 试运行：只输出转换计划
+    if args.dry_run:
+        if is_archive_path(args.input) or is_archive_path(args.output):
+            print(f"{t('messages.error')}: {t('messages.plan_archive_unsupported')}")
+            sys.exit(1)
+        try:
+            plan = format_manager.plan_conversion(
+                args.input, args.output, args.input_format, args.output_format,
+                args.width, args.height, class_names, image_dir=args.image_dir,
+                sample_size=args.sample_size, validation=args.validation
+            )
+        except Exception as e:
+            print(f"{t('messages.error')}: {str(e)}")
+            sys.exit(1)
+        print_plan(plan)
+        return
+    
     # 执行转换
     try:
-        if os.path.isfile(args.input):
+        class_mapping = build_class_mapping(args)
+        splitter = None
+        if args.split:
+            splitter = DatasetSplitter(DatasetSplitter.parse_ratios(args.split), args.split_mode,
+                                       args.split_seed, args.split_list)
+        error_collector = ErrorCollector(args.error_log, args.error_log_limit, report_path=args.error_report)
+        
+        if is_archive_path(args.input) or is_archive_path(args.output):
             print(f"{t('messages.processing_file', file=args.input)}")
-            format_manager.convert_file(
+            result = format_manager.convert_archive(
                 args.input, args.output, args.input_format, args.output_format,
-                args.width, args.height, class_names, args.verbose
+                args.width, args.height, class_names, args.verbose,
+                batch_size=args.batch_size, validation=args.validation,
+                precision=args.precision, class_mapping=class_mapping,
+                collect_statistics=bool(args.stats_output), clip_mode=args.clip_mode, dedup_iou=args.dedup_iou,
+                canonical_order=args.canonical_order, obb_fit=args.obb_fit,
+                error_collector=error_collector
             )
+            print_error_summary(result.errors)
+            print_clip_stats(result.clipping)
+            if result.reordered_boxes:
+                print(f"{t('messages.reordered_boxes', count=result.reordered_boxes)}")
+            if result.duplicate_boxes:
+                print(f"{t('messages.duplicate_boxes', count=result.duplicate_boxes)}")
+            if args.stats_output:
+                write_json(result.statistics, args.stats_output)
+        elif os.path.isfile(args.input):
+            print(f"{t('messages.processing_file', file=args.input)}")
+            with collect_errors(error_collector):
+                format_manager.convert_file(
+                    args.input, args.output, args.input_format, args.output_format,
+                    args.width, args.height, class_names, args.verbose,
+                    validation=args.validation, precision=args.precision,
+                    class_mapping=class_mapping, clip_mode=args.clip_mode, dedup_iou=args.dedup_iou,
+                    canonical_order=args.canonical_order, obb_fit=args.obb_fit
+                )
+            print_error_summary(error_collector.summary)
         else:
             print(f"{t('messages.creating_output_dir', dir=args.output)}")
-            format_manager.convert_directory(
+            result = format_manager.convert_directory(
                 args.input, args.output, args.input_format, args.output_format,
-                args.width, args.height, class_names, args.verbose
+                args.width, args.height, class_names, args.verbose,
+                resume=args.resume, batch_size=args.batch_size,
+                shard_index=args.shard_index, shard_count=args.shard_count,
+                work_queue=args.work_queue, worker_id=args.worker_id,
+                lease_timeout=args.lease_timeout, max_attempts=args.max_attempts,
+                validation=args.validation,
+                precision=args.precision, class_mapping=class_mapping,
+                splitter=splitter, image_dir=args.image_dir,
+                collect_statistics=bool(args.stats_output), clip_mode=args.clip_mode, dedup_iou=args.dedup_iou,
+                canonical_order=args.canonical_order, obb_fit=args.obb_fit,
+                error_collector=error_collector
             )
+            print_error_summary(result.errors)
+            if result.skipped_files:
+                print(f"{t('messages.resumed_files', count=result.skipped_files)}")
+            print_clip_stats(result.clipping)
+            if result.reordered_boxes:
+                print(f"{t('messages.reordered_boxes', count=result.reordered_boxes)}")
+            if result.duplicate_boxes:
+                print(f"{t('messages.duplicate_boxes', count=result.duplicate_boxes)}")
+            for split_name, count in result.split_counts.items():
+                print(f"  {split_name}: {count}")
+            if args.stats_output:
+                write_json(result.statistics, args.stats_output)
         
         print(f"{t('messages.conversion_complete')}")
         
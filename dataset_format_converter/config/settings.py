@@ -26,6 +26,7 @@ class Settings:
     theme: str = 'default'
     auto_detect_format: bool = True
     remember_last_paths: bool = True
+    job_workers: int = 2  # GUI 任务队列同时运行的最大任务数
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
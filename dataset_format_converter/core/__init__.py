@@ -2,8 +2,19 @@
 核心模块 - 包含中间格式定义和基础功能
 """
 
-from .common_format import CommonFormat, BoundingBox
+from .common_format import CommonFormat, BoundingBox, CompactBoundingBox
 from .format_manager import FormatManager
 from .base_format import BaseFormat
+from .class_table import ClassTable
+from .conversion_result import ConversionResult
+from .session import ConversionSession
+from .validation import ValidationReport, validate
+from .dataset_index import DatasetIndex
+from .class_mapping import ClassMapping
+from .split import DatasetSplitter
+from .statistics import DatasetStatistics
+from .lint import LintReport
+from .tiling import ImageTiler, Tile
+from .error_report import ErrorCollector, ErrorSummary
 
-__all__ = ['CommonFormat', 'BoundingBox', 'FormatManager', 'BaseFormat'] 
\ No newline at end of file
+__all__ = ['CommonFormat', 'BoundingBox', 'CompactBoundingBox', 'FormatManager', 'BaseFormat', 'ClassTable', 'ConversionResult', 'ConversionSession', 'ValidationReport', 'validate', 'DatasetIndex', 'ClassMapping', 'DatasetSplitter', 'DatasetStatistics', 'LintReport', 'ImageTiler', 'Tile', 'ErrorCollector', 'ErrorSummary'] 
\ No newline at end of file
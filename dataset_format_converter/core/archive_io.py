@@ -0,0 +1,175 @@
+"""
+归档读写 - 直接从 tar/zip 归档中流式读取标注，并直接写入输出归档
+
+避免将大量小文件解压到磁盘，消除小文件的文件系统开销。
+"""
+
+import io
+import os
+import tarfile
+import time
+import zipfile
+from typing import Iterator, Optional, Tuple
+
+
+# 支持的归档后缀（tar 可带压缩）
+TAR_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+ZIP_SUFFIXES = ('.zip',)
+
+
+def is_archive_path(path: str) -> bool:
+    """
+    判断路径是否为支持的归档文件（按后缀判断）
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        bool: 是否为归档路径
+    """
+    return path.lower().endswith(TAR_SUFFIXES + ZIP_SUFFIXES)
+
+
+def _tar_write_mode(path: str) -> str:
+    """根据后缀确定 tar 的写入模式"""
+    lower = path.lower()
+    if lower.endswith(('.tar.gz', '.tgz')):
+        return 'w:gz'
+    if lower.endswith(('.tar.bz2', '.tbz2')):
+        return 'w:bz2'
+    if lower.endswith(('.tar.xz', '.txz')):
+        return 'w:xz'
+    return 'w'
+
+
+class ArchiveReader:
+    """
+    归档读取器
+
+    按归档内的存储顺序顺序读取成员，tar 使用流式模式打开，不需要随机访问。
+    """
+
+    def __init__(self, archive_path: str):
+        """
+        初始化归档读取器
+
+        Args:
+            archive_path: 归档文件路径
+        """
+        if not is_archive_path(archive_path):
+            raise ValueError(f"Unsupported archive type: {archive_path}")
+        if not os.path.isfile(archive_path):
+            raise ValueError(f"Archive {archive_path} does not exist")
+        self.archive_path = archive_path
+        self._is_zip = archive_path.lower().endswith(ZIP_SUFFIXES)
+
+    def iter_members(self, extension: Optional[str] = None) -> Iterator[Tuple[str, bytes]]:
+        """
+        顺序遍历归档中的文件成员
+
+        Args:
+            extension: 只返回该扩展名的成员（可选）
+
+        Yields:
+            Tuple[str, bytes]: (成员名称, 成员内容)
+        """
+        if self._is_zip:
+            with zipfile.ZipFile(self.archive_path, 'r') as archive:
+                for info in archive.infolist():
+                    if info.is_dir():
+                        continue
+                    if extension and not info.filename.endswith(extension):
+                        continue
+                    yield info.filename, archive.read(info)
+        else:
+            # 'r|*' 为流式模式：只能顺序读取，但不需要先扫描整个归档
+            with tarfile.open(self.archive_path, 'r|*') as archive:
+                for member in archive:
+                    if not member.isfile():
+                        continue
+                    if extension and not member.name.endswith(extension):
+                        continue
+                    f = archive.extractfile(member)
+                    if f is not None:
+                        yield member.name, f.read()
+
+    def read_member(self, name: str) -> Optional[bytes]:
+        """
+        按文件名读取单个成员（匹配任意目录下的同名文件）
+
+        zip 可以直接定位；tar 需要扫描成员头，压缩的 tar 相当于一次完整解压。
+
+        Args:
+            name: 成员文件名（不含目录）
+
+        Returns:
+            Optional[bytes]: 成员内容，不存在时返回None
+        """
+        if self._is_zip:
+            with zipfile.ZipFile(self.archive_path, 'r') as archive:
+                for info in archive.infolist():
+                    if not info.is_dir() and os.path.basename(info.filename) == name:
+                        return archive.read(info)
+            return None
+
+        with tarfile.open(self.archive_path, 'r|*') as archive:
+            for member in archive:
+                if member.isfile() and os.path.basename(member.name) == name:
+                    f = archive.extractfile(member)
+                    return f.read() if f is not None else None
+        return None
+
+
+class ArchiveWriter:
+    """
+    归档写入器
+
+    成员内容直接写入归档，不经过临时文件。
+    """
+
+    def __init__(self, archive_path: str):
+        """
+        初始化归档写入器
+
+        Args:
+            archive_path: 输出归档文件路径（.tar/.tar.gz/.tgz/.tar.bz2/.tar.xz/.zip）
+        """
+        if not is_archive_path(archive_path):
+            raise ValueError(f"Unsupported archive type: {archive_path}")
+
+        archive_dir = os.path.dirname(archive_path)
+        if archive_dir:
+            os.makedirs(archive_dir, exist_ok=True)
+
+        self.archive_path = archive_path
+        self._is_zip = archive_path.lower().endswith(ZIP_SUFFIXES)
+        if self._is_zip:
+            self._archive = zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_DEFLATED)
+        else:
+            self._archive = tarfile.open(archive_path, _tar_write_mode(archive_path))
+
+    def __enter__(self) -> 'ArchiveWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def write(self, name: str, data: bytes) -> None:
+        """
+        写入一个成员
+
+        Args:
+            name: 成员名称
+            data: 成员内容
+        """
+        if self._is_zip:
+            self._archive.writestr(name, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self._archive.addfile(info, io.BytesIO(data))
+
+    def close(self) -> None:
+        """关闭归档（写入目录/结束块）"""
+        self._archive.close()
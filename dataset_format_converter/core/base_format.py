@@ -3,11 +3,81 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Union
 from pathlib import Path
 import os
+import re
 
-from .common_format import CommonFormat
+import numpy as np
+
+from .common_format import CommonFormat, validation_level
+from .class_table import ClassTable
+from .archive_io import ArchiveReader, ArchiveWriter
+from .error_report import record_error, report_error
+
+
+# lint 记录：(位置, 类别ID或类别名称, 归一化角点 (4, 2), 格式错误说明)
+# 位置对行式文本格式为行号，对其他格式为对象序号（均从 1 开始）；
+# 记录无法解析时类别和角点为None，并给出格式错误说明
+LintRecord = Tuple[int, Union[int, str, None], Optional[np.ndarray], Optional[str]]
+
+
+@dataclass
+class ParseStats:
+    """
+    逐文件解析统计（由 iter_format2common / format2commonMulti 累计）
+
+    Attributes:
+        parsed_files: 成功解析的输入文件数
+        failed_files: 解析失败的输入文件数
+        records: 生成的中间格式对象数（单文件数据集的一个文件包含多张图片）
+    """
+    parsed_files: int = 0
+    failed_files: int = 0
+    records: int = 0
+
+
+class DatasetWriter:
+    """
+    数据集写入器 - 跨批次逐批写出转换结果
+
+    默认实现逐批写出标注文件，类别表等辅助文件在 close() 时按最终的类别表
+    一次写出；整个数据集保存为单个文件的格式（如 COCO）可返回自己的写入器，
+    在多个批次之间保持输出文件打开。
+    """
+
+    def __init__(self, format_instance: 'BaseFormat', output_dir: str):
+        """
+        初始化写入器
+
+        Args:
+            format_instance: 输出格式实例
+            output_dir: 输出目录
+        """
+        self.format_instance = format_instance
+        self.output_dir = output_dir
+        self._class_names: Optional[List[str]] = None
+
+    def write_batch(self, common_data_list: List[CommonFormat]) -> List[CommonFormat]:
+        """
+        写出一个批次
+
+        Args:
+            common_data_list: 中间格式数据列表
+            
+        Returns:
+            List[CommonFormat]: 写出失败的记录（错误已通过 report_error 记录）
+        """
+        if not common_data_list:
+            return []
+        self._class_names = common_data_list[-1].class_names
+        return self.format_instance._write_labels(common_data_list, self.output_dir)
+
+    def close(self) -> None:
+        """结束写入，写出辅助文件"""
+        if self._class_names is not None:
+            self.format_instance._write_sidecars(self._class_names, self.output_dir)
 
 
 class BaseFormat(ABC):
@@ -17,6 +87,16 @@ class BaseFormat(ABC):
     定义了格式转换的标准接口和通用方法
     """
     
+    # 与标注文件同目录的辅助文件（类别列表等），不作为标注文件处理
+    AUXILIARY_FILES = ("classes.txt", "class_names.txt")
+    
+    # 整个数据集保存为单个文件（如 COCO JSON）时为True，此类输出不支持断点续传和分片
+    SINGLE_FILE_DATASET = False
+    
+    # 从文件原始字节中提取类别名称的正则表达式（第一个分组为类别名称），
+    # 用于并行类别发现（见 core/class_discovery.py）；为None时使用 _extract_class_names_from_files
+    CLASS_NAME_PATTERN: Optional[re.Pattern] = None
+    
     def __init__(self):
         """初始化格式类"""
         pass
@@ -80,6 +160,47 @@ class BaseFormat(ABC):
         """
         pass
     
+    def _text2common(self, text: str, image_filename: str, image_width: int, image_height: int,
+                     class_names: Optional[List[str]] = None) -> CommonFormat:
+        """
+        将格式文本转换为中间格式（私有方法，用于归档等非文件输入）
+        
+        Args:
+            text: 文件内容
+            image_filename: 图片文件名（不含扩展名）
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（可选）
+            
+        Returns:
+            CommonFormat: 中间格式对象
+        """
+        raise NotImplementedError(f"{self.name} does not support text input")
+    
+    def _common2text(self, common_data: CommonFormat) -> str:
+        """
+        将中间格式转换为格式文本（私有方法，用于归档等非文件输出）
+        
+        Args:
+            common_data: 中间格式数据
+            
+        Returns:
+            str: 文件内容
+        """
+        raise NotImplementedError(f"{self.name} does not support text output")
+    
+    def _sidecar_files(self, class_names: List[str]) -> Dict[str, str]:
+        """
+        输出数据集时附带的辅助文件（如 classes.txt） - 子类可重写此方法
+        
+        Args:
+            class_names: 类别名称列表
+            
+        Returns:
+            Dict[str, str]: 文件名 -> 文件内容
+        """
+        return {}
+    
     def format2commonSolo(self, file_path: str, image_width: int, image_height: int,
                          class_names: Optional[List[str]] = None) -> CommonFormat:
         """
@@ -112,8 +233,26 @@ class BaseFormat(ABC):
         
         self._common2format(common_data, output_path)
     
+    def list_input_files(self, input_dir: str) -> List[str]:
+        """
+        列出目录中所有符合扩展名的标注文件（按文件名排序，不含辅助文件）
+        
+        Args:
+            input_dir: 输入目录
+            
+        Returns:
+            List[str]: 文件路径列表
+        """
+        pattern = f"*{self.file_extension}"
+        return sorted(
+            str(file_path) for file_path in Path(input_dir).glob(pattern)
+            if file_path.name not in self.AUXILIARY_FILES
+        )
+    
     def format2commonMulti(self, input_dir: str, image_width: int, image_height: int,
-                          class_names: Optional[List[str]] = None) -> List[CommonFormat]:
+                          class_names: Optional[List[str]] = None,
+                          file_paths: Optional[List[str]] = None,
+                          stats: Optional[ParseStats] = None) -> List[CommonFormat]:
         """
         多文件转换：格式 -> 中间格式
         
@@ -122,25 +261,51 @@ class BaseFormat(ABC):
             image_width: 图片宽度
             image_height: 图片高度
             class_names: 类别名称列表（可选）
+            file_paths: 只处理这些文件（可选，默认处理目录中所有符合扩展名的文件）
+            stats: 待累计的解析统计（可选）
             
         Returns:
             List[CommonFormat]: 中间格式对象列表
         """
-        results = []
-        input_path = Path(input_dir)
-        
         # 查找所有符合扩展名的文件
-        pattern = f"*{self.file_extension}"
-        for file_path in input_path.glob(pattern):
+        if file_paths is None:
+            file_paths = self.list_input_files(input_dir)
+        return list(self.iter_format2common(file_paths, image_width, image_height, class_names, stats))
+    
+    def iter_format2common(self, file_paths: List[str], image_width: int, image_height: int,
+                           class_names: Optional[List[str]] = None,
+                           stats: Optional[ParseStats] = None) -> Iterator[CommonFormat]:
+        """
+        多文件转换：逐个解析文件并生成中间格式对象（调用方可按批次消费，不必一次构建全部结果）
+        
+        Args:
+            file_paths: 输入文件路径列表
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（可选）
+            stats: 待累计的解析统计（可选）
+            
+        Yields:
+            CommonFormat: 中间格式对象
+        """
+        # 所有文件共享同一个类别表
+        class_names = ClassTable.of(class_names)
+        
+        for file_path in map(Path, file_paths):
             try:
                 common_data = self._format2common(str(file_path), image_width, image_height, class_names)
-                if common_data is not None:
-                    common_data.image_filename = file_path.stem  # 保存文件名（不含扩展名）
-                    results.append(common_data)
             except Exception as e:
-                print(f"警告：处理文件 {file_path} 时出错: {e}")
-        
-        return results
+                report_error('parse', file_path, e)
+                if stats is not None:
+                    stats.failed_files += 1
+                continue
+            if stats is not None:
+                stats.parsed_files += 1
+            if common_data is not None:
+                common_data.image_filename = file_path.stem  # 保存文件名（不含扩展名）
+                if stats is not None:
+                    stats.records += 1
+                yield common_data
     
     def common2formatMulti(self, common_data_list: List[CommonFormat], output_dir: str) -> None:
         """
@@ -150,9 +315,23 @@ class BaseFormat(ABC):
             common_data_list: 中间格式数据列表
             output_dir: 输出目录
         """
+        self._write_labels(common_data_list, output_dir)
+    
+    def _write_labels(self, common_data_list: List[CommonFormat], output_dir: str) -> List[CommonFormat]:
+        """
+        将中间格式数据写为标注文件（不含辅助文件）
+        
+        Args:
+            common_data_list: 中间格式数据列表
+            output_dir: 输出目录
+            
+        Returns:
+            List[CommonFormat]: 写出失败的记录
+        """
         # 确保输出目录存在
         os.makedirs(output_dir, exist_ok=True)
         
+        failed = []
         for common_data in common_data_list:
             # 生成输出文件名
             if common_data.image_filename:
@@ -165,7 +344,156 @@ class BaseFormat(ABC):
             try:
                 self._common2format(common_data, output_path)
             except Exception as e:
-                print(f"警告：生成文件 {output_path} 时出错: {e}")
+                report_error('write', output_path, e)
+                failed.append(common_data)
+        return failed
+    
+    def iter_format2common_archive(self, archive_path: str, image_width: int, image_height: int,
+                                   class_names: Optional[List[str]] = None,
+                                   stats: Optional[ParseStats] = None) -> Iterator[CommonFormat]:
+        """
+        归档转换：顺序读取归档中的标注文件并逐个转换为中间格式（不解压到磁盘）
+        
+        Args:
+            archive_path: 输入归档路径（tar/zip）
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（可选）
+            stats: 待累计的解析统计（可选，文件数按归档成员计）
+            
+        Yields:
+            CommonFormat: 中间格式对象
+        """
+        class_names = ClassTable.of(class_names)
+        reader = ArchiveReader(archive_path)
+        # 输出按文件名（不含目录）命名，不同目录中的同名成员会互相覆盖，只转换第一个
+        seen: Dict[str, str] = {}
+        for member_name, data in reader.iter_members(self.file_extension):
+            base_name = os.path.basename(member_name)
+            if base_name in self.AUXILIARY_FILES:
+                continue
+            stem = os.path.splitext(base_name)[0]
+            if stem in seen:
+                record_error('archive-parse', f"{archive_path}:{member_name}", 'DuplicateName',
+                             f"与 {seen[stem]} 同名，输出时会覆盖，已跳过")
+                if stats is not None:
+                    stats.failed_files += 1
+                continue
+            seen[stem] = member_name
+            try:
+                common_data = self._text2common(data.decode('utf-8'), stem,
+                                                image_width, image_height, class_names)
+            except Exception as e:
+                report_error('archive-parse', f"{archive_path}:{member_name}", e)
+                if stats is not None:
+                    stats.failed_files += 1
+                continue
+            if stats is not None:
+                stats.parsed_files += 1
+            if common_data is not None:
+                if stats is not None:
+                    stats.records += 1
+                yield common_data
+    
+    def format2commonArchive(self, archive_path: str, image_width: int, image_height: int,
+                             class_names: Optional[List[str]] = None) -> List[CommonFormat]:
+        """
+        归档转换：归档 -> 中间格式
+        
+        Args:
+            archive_path: 输入归档路径（tar/zip）
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（可选）
+            
+        Returns:
+            List[CommonFormat]: 中间格式对象列表
+        """
+        return list(self.iter_format2common_archive(archive_path, image_width, image_height, class_names))
+    
+    def _write_archive_members(self, common_data_list: List[CommonFormat],
+                               writer: ArchiveWriter) -> List[CommonFormat]:
+        """
+        将中间格式数据作为成员写入已打开的归档（不含辅助文件）
+        
+        Args:
+            common_data_list: 中间格式数据列表
+            writer: 归档写入器
+            
+        Returns:
+            List[CommonFormat]: 写出失败的记录
+        """
+        failed = []
+        for index, common_data in enumerate(common_data_list):
+            stem = common_data.image_filename or f"converted_{index}"
+            member_name = f"{stem}{self.file_extension}"
+            try:
+                writer.write(member_name, self._common2text(common_data).encode('utf-8'))
+            except Exception as e:
+                report_error('archive-write', member_name, e)
+                failed.append(common_data)
+        return failed
+    
+    def _write_sidecars(self, class_names: List[str], output_dir: str) -> None:
+        """
+        将辅助文件写入输出目录
+        
+        Args:
+            class_names: 类别名称列表
+            output_dir: 输出目录
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        for file_name, content in self._sidecar_files(class_names).items():
+            with open(os.path.join(output_dir, file_name), 'w', encoding='utf-8') as f:
+                f.write(content)
+    
+    def _write_split_sidecars(self, class_names: List[str], output_dir: str, split_names: List[str]) -> None:
+        """
+        划分数据集的辅助文件：默认在每个划分的 labels 目录中各写一份
+        
+        Args:
+            class_names: 类别名称列表
+            output_dir: 输出根目录
+            split_names: 有数据的划分名称
+        """
+        for split_name in split_names:
+            self._write_sidecars(class_names, os.path.join(output_dir, split_name, "labels"))
+    
+    def _write_archive_sidecars(self, class_names: List[str], writer: ArchiveWriter) -> None:
+        """
+        将辅助文件写入已打开的归档
+        
+        Args:
+            class_names: 类别名称列表
+            writer: 归档写入器
+        """
+        for file_name, content in self._sidecar_files(class_names).items():
+            writer.write(file_name, content.encode('utf-8'))
+    
+    def common2formatArchive(self, common_data_list: List[CommonFormat], archive_path: str) -> None:
+        """
+        归档转换：中间格式 -> 归档
+        
+        Args:
+            common_data_list: 中间格式数据列表
+            archive_path: 输出归档路径（tar/zip）
+        """
+        with ArchiveWriter(archive_path) as writer:
+            self._write_archive_members(common_data_list, writer)
+            if common_data_list:
+                self._write_archive_sidecars(common_data_list[0].class_names, writer)
+    
+    def open_dataset_writer(self, output_dir: str) -> DatasetWriter:
+        """
+        打开数据集写入器，用于跨批次写出转换结果
+        
+        Args:
+            output_dir: 输出目录
+            
+        Returns:
+            DatasetWriter: 数据集写入器
+        """
+        return DatasetWriter(self, output_dir)
     
     def _get_class_names(self, file_paths: List[str]) -> List[str]:
         """
@@ -190,11 +518,28 @@ class BaseFormat(ABC):
                     class_names = [line.strip() for line in f.readlines() if line.strip()]
                     return class_names
             except Exception as e:
-                print(f"警告：读取classes.txt文件失败: {e}")
+                report_error('classes-file', classes_file, e)
         
         # 如果没有classes.txt文件，尝试从数据文件中解析
+        # 隐式调用只在当前进程中扫描且不读写缓存：进程池（spawn 平台要求调用方有 __main__ 保护）
+        # 和缓存文件由 CLI/GUI 通过 FormatManager.discover_class_names 显式启用
+        if self.CLASS_NAME_PATTERN is not None:
+            from .class_discovery import scan_class_names
+            return scan_class_names(self, file_paths, workers=1)
         return self._extract_class_names_from_files(file_paths)
     
+    def _scan_class_names(self, data: bytes) -> List[str]:
+        """
+        从文件原始字节中提取类别名称（不解析坐标，也不构建完整的语法树）
+        
+        Args:
+            data: 文件内容
+            
+        Returns:
+            List[str]: 文件中出现的类别名称（可能重复）
+        """
+        return [token.decode('utf-8', errors='replace') for token in self.CLASS_NAME_PATTERN.findall(data)]
+    
     def _extract_class_names_from_files(self, file_paths: List[str]) -> List[str]:
         """
         从数据文件中提取类别名称 - 子类可重写此方法
@@ -208,6 +553,65 @@ class BaseFormat(ABC):
         # 默认返回空列表，子类可根据需要重写
         return []
     
+    def _parse_file(self, file_path: str, image_width: int, image_height: int,
+                    class_names: Optional[List[str]] = None) -> List[CommonFormat]:
+        """
+        解析一个输入文件中的所有图片 - 单个文件包含多张图片的格式（如 COCO）需重写此方法
+        
+        Args:
+            file_path: 输入文件路径
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（可选）
+            
+        Returns:
+            List[CommonFormat]: 中间格式对象列表
+        """
+        common_data = self._format2common(file_path, image_width, image_height, class_names)
+        return [] if common_data is None else [common_data]
+    
+    def _iter_text_lines(self, file_path: str, skip_lines: int = 0) -> Iterator[Tuple[int, List[str]]]:
+        """
+        逐行读取文本标注文件，跳过空行
+        
+        Args:
+            file_path: 输入文件路径
+            skip_lines: 跳过开头的行数（如文件头）
+            
+        Yields:
+            Tuple[int, List[str]]: (行号, 字段列表)
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if line_no <= skip_lines:
+                    continue
+                parts = line.split()
+                if parts:
+                    yield line_no, parts
+    
+    def iter_lint_records(self, file_path: str, image_width: int, image_height: int) -> Iterator[LintRecord]:
+        """
+        逐条产出文件中的标注记录供 lint 检查 - 行式文本格式重写此方法以报告行号和格式错误
+        
+        默认实现以 trusted 级别解析整个文件（保留原始坐标），按对象顺序编号。
+        文件整体无法解析时抛出异常。
+        
+        Args:
+            file_path: 输入文件路径
+            image_width: 图片宽度
+            image_height: 图片高度
+            
+        Yields:
+            LintRecord: (位置, 类别名称, 归一化角点, None)
+        """
+        with validation_level('trusted'):
+            common_data_list = self._parse_file(file_path, image_width, image_height, ClassTable())
+        position = 0
+        for common_data in common_data_list:
+            for bbox in common_data.bounding_boxes:
+                position += 1
+                yield position, bbox.class_name, np.asarray(bbox.corners, dtype=np.float64), None
+    
     def get_format_info(self) -> Dict[str, Any]:
         """
         获取格式信息
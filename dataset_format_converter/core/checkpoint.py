@@ -0,0 +1,73 @@
+"""
+断点续传日志 - 记录目录转换中已完成的输入文件
+
+日志是输出目录中的一个只追加文本文件，每行一个已完成的输入文件名。
+转换按批次写入日志，进程中途退出后可通过 resume 跳过已完成的文件。
+"""
+
+import os
+from typing import Iterable, Set
+
+
+class CheckpointJournal:
+    """
+    断点续传日志
+
+    每个批次转换完成后，将该批次的输入文件名一次性追加到日志中。
+    只有以换行符结尾的完整行才被视为有效记录，进程在写入中途退出时
+    残留的半行会被忽略。
+    """
+
+    JOURNAL_FILENAME = ".conversion_journal"
+
+    def __init__(self, output_dir: str, filename: str = JOURNAL_FILENAME):
+        """
+        初始化日志
+
+        Args:
+            output_dir: 输出目录（日志文件所在目录）
+            filename: 日志文件名
+        """
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, filename)
+
+    def load(self) -> Set[str]:
+        """
+        读取已完成的文件名集合
+
+        Returns:
+            Set[str]: 已记录的输入文件名
+        """
+        if not os.path.isfile(self.path):
+            return set()
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        # 最后一行若没有换行符，说明写入被中断，丢弃
+        lines = content.split('\n')[:-1]
+        return {line for line in lines if line}
+
+    def reset(self) -> None:
+        """清空日志（开始一次新的完整转换）"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8'):
+            pass
+
+    def record(self, file_names: Iterable[str]) -> None:
+        """
+        追加一个批次的已完成文件
+
+        Args:
+            file_names: 输入文件名（不含目录）
+        """
+        data = "".join(f"{name}\n" for name in file_names)
+        if not data:
+            return
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        # 整个批次一次写入并落盘，避免批次只记录了一部分
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
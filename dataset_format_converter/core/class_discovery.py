@@ -0,0 +1,254 @@
+"""
+类别发现 - 并行扫描标注文件得到完整的类别表，并缓存结果
+
+逐文件解析（XML 语法树、坐标转换）只为得到类别名称代价过高。这里按格式的
+CLASS_NAME_PATTERN 直接在文件原始字节上做正则匹配，文件按块分配到进程池并行扫描。
+
+结果缓存在 ~/.dataset_format_converter/class_cache.json 中，以 格式 + 目录 为键，
+以文件列表（文件名、大小、修改时间）的摘要判断是否失效，GUI 和 CLI 再次打开同一个
+数据集时无需重新扫描。
+"""
+
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .error_report import record_error, report_error
+
+
+# 缓存文件名（与设置文件位于同一目录）
+CLASS_CACHE_FILENAME = 'class_cache.json'
+
+# 缓存中最多保留的数据集数，超出时删除最早写入的条目
+CLASS_CACHE_MAX_ENTRIES = 64
+
+# 文件数少于此值时直接扫描，不读写缓存
+CLASS_CACHE_MIN_FILES = 32
+
+
+def default_cache_path() -> str:
+    """默认的缓存文件路径"""
+    return os.path.join(os.path.expanduser('~'), '.dataset_format_converter', CLASS_CACHE_FILENAME)
+
+
+def listing_fingerprint(file_paths: Sequence[str]) -> str:
+    """
+    计算文件列表的摘要（文件名、大小、修改时间），任一文件增删或修改后摘要改变
+
+    Args:
+        file_paths: 文件路径列表
+
+    Returns:
+        str: 十六进制摘要
+    """
+    digest = hashlib.sha1()
+    for file_path in sorted(file_paths):
+        try:
+            stat = os.stat(file_path)
+            entry = f"{os.path.basename(file_path)}\t{stat.st_size}\t{stat.st_mtime_ns}\n"
+        except OSError:
+            entry = f"{os.path.basename(file_path)}\t-\n"
+        digest.update(entry.encode('utf-8', errors='surrogateescape'))
+    return digest.hexdigest()
+
+
+class ClassCache:
+    """
+    类别表缓存（JSON 文件）
+
+    每个条目：{键: {'fingerprint': 文件列表摘要, 'class_names': 类别表}}
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, cache_path: Optional[str] = None):
+        """
+        初始化缓存
+
+        Args:
+            cache_path: 缓存文件路径（可选，默认为 default_cache_path()）
+        """
+        self.cache_path = cache_path or default_cache_path()
+
+    @staticmethod
+    def key_for(format_name: str, file_paths: Sequence[str]) -> str:
+        """缓存键：格式名称 + 文件所在目录的绝对路径"""
+        directory = os.path.dirname(os.path.abspath(file_paths[0])) if file_paths else ''
+        return f"{format_name}|{directory}"
+
+    def _load(self) -> Dict[str, Any]:
+        """读取整个缓存文件（不存在或损坏时为空）"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, key: str, fingerprint: str) -> Optional[List[str]]:
+        """
+        查找缓存
+
+        Args:
+            key: 缓存键
+            fingerprint: 当前文件列表的摘要
+
+        Returns:
+            Optional[List[str]]: 类别表，未命中或已失效时返回None
+        """
+        with self._lock:
+            entry = self._load().get(key)
+        if isinstance(entry, dict) and entry.get('fingerprint') == fingerprint:
+            return list(entry.get('class_names', []))
+        return None
+
+    def put(self, key: str, fingerprint: str, class_names: List[str]) -> None:
+        """
+        写入缓存（失败时只记录错误，见 core/error_report.py）
+
+        Args:
+            key: 缓存键
+            fingerprint: 文件列表的摘要
+            class_names: 类别表
+        """
+        with self._lock:
+            data = self._load()
+            data.pop(key, None)
+            data[key] = {'fingerprint': fingerprint, 'class_names': list(class_names)}
+            while len(data) > CLASS_CACHE_MAX_ENTRIES:
+                data.pop(next(iter(data)))
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(temp_path, self.cache_path)
+            except OSError as e:
+                report_error('class-cache', self.cache_path, e)
+
+
+def _scan_task(args) -> Tuple[List[str], List[Tuple[str, str, str]]]:
+    """
+    进程池任务：扫描一批文件，返回去重后的类别名称和读取失败的文件
+    （(文件路径, 错误类型, 错误信息) 列表，由主进程记录，见 core/error_report.py）
+    """
+    format_instance, file_paths = args
+    found = set()
+    failures = []
+    for file_path in file_paths:
+        try:
+            with open(file_path, 'rb') as f:
+                found.update(format_instance._scan_class_names(f.read()))
+        except Exception as e:
+            failures.append((file_path, type(e).__name__, str(e)))
+    return sorted(found), failures
+
+
+def _merge_scan(found: set, task_result: Tuple[List[str], List[Tuple[str, str, str]]]) -> None:
+    """合并一个任务的结果并记录其中的错误"""
+    names, failures = task_result
+    found.update(names)
+    for file_path, error_type, message in failures:
+        record_error('class-scan', file_path, error_type, message)
+
+
+def scan_class_names(format_instance, file_paths: Sequence[str],
+                     workers: Optional[int] = None,
+                     chunk_size: int = 256,
+                     cancel: Optional[threading.Event] = None,
+                     progress: Optional[Callable[[int, int], None]] = None) -> Optional[List[str]]:
+    """
+    并行扫描文件中的类别名称
+
+    Args:
+        format_instance: 输入格式实例（须定义 CLASS_NAME_PATTERN）
+        file_paths: 文件路径列表
+        workers: 工作进程数（默认为CPU核数，1 表示在当前进程中执行）
+        chunk_size: 每个任务扫描的文件数
+        cancel: 取消事件（可选，每完成一块检查一次，置位后尽快结束）
+        progress: 进度回调（可选），开始时和每完成一块时以 (已扫描文件数, 总文件数) 调用
+
+    Returns:
+        Optional[List[str]]: 排序后的类别表（与 _extract_class_names_from_files 的顺序规则相同），
+        被取消时返回None
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    chunks = [(format_instance, list(file_paths[start:start + chunk_size]))
+              for start in range(0, len(file_paths), chunk_size)]
+
+    found = set()
+    scanned = 0
+    if progress is not None:
+        progress(0, len(file_paths))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            if cancel is not None and cancel.is_set():
+                return None
+            _merge_scan(found, _scan_task(chunk))
+            scanned += len(chunk[1])
+            if progress is not None:
+                progress(scanned, len(file_paths))
+        return sorted(found)
+
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(chunks)))
+    futures = [executor.submit(_scan_task, chunk) for chunk in chunks]
+    try:
+        for chunk, future in zip(chunks, futures):
+            if cancel is not None and cancel.is_set():
+                return None
+            _merge_scan(found, future.result())
+            scanned += len(chunk[1])
+            if progress is not None:
+                progress(scanned, len(file_paths))
+    finally:
+        # 取消时丢弃尚未开始的分块，只等待运行中的分块结束
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+    return sorted(found)
+
+
+def discover_class_names(format_instance, file_paths: Sequence[str],
+                         workers: Optional[int] = None,
+                         use_cache: bool = True,
+                         cache_path: Optional[str] = None,
+                         cancel: Optional[threading.Event] = None,
+                         progress: Optional[Callable[[int, int], None]] = None) -> Optional[List[str]]:
+    """
+    发现一组文件的完整类别表（先查缓存，未命中时并行扫描并写入缓存）
+
+    Args:
+        format_instance: 输入格式实例（须定义 CLASS_NAME_PATTERN）
+        file_paths: 文件路径列表（通常为一个目录中的全部标注文件）
+        workers: 工作进程数（默认为CPU核数）
+        use_cache: 是否使用缓存（文件数少于 CLASS_CACHE_MIN_FILES 时始终不使用）
+        cache_path: 缓存文件路径（可选）
+        cancel: 取消事件（可选）
+        progress: 进度回调（可选，见 scan_class_names；命中缓存时不调用）
+
+    Returns:
+        Optional[List[str]]: 类别表，被取消时返回None
+    """
+    file_paths = list(file_paths)
+    if not file_paths:
+        return []
+    use_cache = use_cache and len(file_paths) >= CLASS_CACHE_MIN_FILES
+    if not use_cache:
+        return scan_class_names(format_instance, file_paths, workers, cancel=cancel, progress=progress)
+
+    cache = ClassCache(cache_path)
+    key = ClassCache.key_for(format_instance.name, file_paths)
+    fingerprint = listing_fingerprint(file_paths)
+    cached = cache.get(key, fingerprint)
+    if cached is not None:
+        return cached
+
+    class_names = scan_class_names(format_instance, file_paths, workers, cancel=cancel, progress=progress)
+    if class_names is not None:
+        cache.put(key, fingerprint, class_names)
+    return class_names
@@ -0,0 +1,160 @@
+"""
+类别映射 - 转换过程中的类别筛选、合并与重命名
+
+映射在类别ID列上以查找表（LUT）的形式应用：源类别ID -> 输出类别ID（-1 表示删除），
+每个批次只需一次数组索引，而不是逐个边界框比较类别名称。
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .class_table import ClassTable
+from .common_format import CommonFormat
+from .dataset_index import DatasetIndex
+
+
+class ClassMapping:
+    """
+    类别映射
+
+    规则（按顺序判断每个源类别）：
+    1. 在 mapping 中映射为空（None 或空字符串）的类别被删除，否则替换为映射后的名称
+    2. 指定 keep 时，源名称和映射后名称都不在 keep 中的类别被删除
+    3. 源名称或映射后名称在 drop 中的类别被删除
+
+    多个源类别映射为同一名称即为合并。输出类别表按源类别表的顺序、
+    以映射后名称第一次出现的位置排列，除非通过 output_class_names 显式指定。
+    """
+
+    def __init__(self, mapping: Optional[Dict[str, Optional[str]]] = None,
+                 keep: Optional[Iterable[str]] = None,
+                 drop: Optional[Iterable[str]] = None,
+                 output_class_names: Optional[List[str]] = None):
+        """
+        初始化类别映射
+
+        Args:
+            mapping: 源类别名称 -> 输出类别名称（可选）
+            keep: 只保留这些类别（可选）
+            drop: 删除这些类别（可选）
+            output_class_names: 输出类别表的固定顺序（可选）
+        """
+        self.mapping = dict(mapping or {})
+        self.keep = set(keep) if keep is not None else None
+        self.drop = set(drop or ())
+        self.output_class_names = ClassTable(output_class_names or ())
+        self._fixed_output = output_class_names is not None
+
+        self._lock = threading.Lock()
+        self._source: Optional[ClassTable] = None
+        self._lut = np.empty(0, dtype=np.int32)
+
+    @classmethod
+    def from_file(cls, file_path: str, **kwargs) -> 'ClassMapping':
+        """
+        从映射文件创建类别映射
+
+        文件每行一条规则 ``源名称=输出名称``，``源名称=`` 表示删除该类别，
+        空行和 ``#`` 开头的行被忽略。
+
+        Args:
+            file_path: 映射文件路径
+            **kwargs: 传递给构造函数的其他参数（keep、drop 等）
+
+        Returns:
+            ClassMapping: 类别映射
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            mapping = cls.parse_rules(f.read().splitlines())
+        mapping.update(kwargs.pop('mapping', None) or {})
+        return cls(mapping=mapping, **kwargs)
+
+    @staticmethod
+    def parse_rules(rules: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        解析 ``源名称=输出名称`` 形式的映射规则
+
+        Args:
+            rules: 规则字符串
+
+        Returns:
+            Dict[str, Optional[str]]: 源类别名称 -> 输出类别名称（None 表示删除）
+        """
+        mapping: Dict[str, Optional[str]] = {}
+        for rule in rules:
+            rule = rule.strip()
+            if not rule or rule.startswith('#'):
+                continue
+            if '=' not in rule:
+                raise ValueError(f"Invalid class mapping rule '{rule}', expected 'source=target'")
+            source, target = (part.strip() for part in rule.split('=', 1))
+            mapping[source] = target or None
+        return mapping
+
+    def map_name(self, class_name: str) -> Optional[str]:
+        """
+        映射单个类别名称
+
+        Args:
+            class_name: 源类别名称
+
+        Returns:
+            Optional[str]: 输出类别名称，删除时返回None
+        """
+        target = self.mapping.get(class_name, class_name)
+        if target is None:
+            return None
+        if self.keep is not None and class_name not in self.keep and target not in self.keep:
+            return None
+        if class_name in self.drop or target in self.drop:
+            return None
+        return target
+
+    def lut_for(self, source_class_names: ClassTable) -> np.ndarray:
+        """
+        获取源类别表对应的查找表，源类别表增长时增量扩展
+
+        Args:
+            source_class_names: 源类别表
+
+        Returns:
+            np.ndarray: 查找表 (len(source_class_names),)，值为输出类别ID或 -1
+        """
+        with self._lock:
+            if self._source is not source_class_names:
+                self._source = source_class_names
+                self._lut = np.empty(0, dtype=np.int32)
+            start = len(self._lut)
+            if start < len(source_class_names):
+                extension = np.full(len(source_class_names) - start, -1, dtype=np.int32)
+                for offset, class_name in enumerate(source_class_names[start:]):
+                    target = self.map_name(class_name)
+                    if target is None:
+                        continue
+                    if self._fixed_output:
+                        class_id = self.output_class_names.get_id(target)
+                        extension[offset] = -1 if class_id is None else class_id
+                    else:
+                        extension[offset] = self.output_class_names.add(target)
+                self._lut = np.concatenate([self._lut, extension])
+            return self._lut
+
+    def apply(self, common_data_list: List[CommonFormat], source_class_names: ClassTable) -> List[CommonFormat]:
+        """
+        将类别映射应用到一个批次
+
+        Args:
+            common_data_list: 中间格式数据列表（使用源类别表）
+            source_class_names: 源类别表
+
+        Returns:
+            List[CommonFormat]: 使用输出类别表的中间格式数据，保留所有图片（包括框被全部删除的图片）
+        """
+        if not common_data_list:
+            return common_data_list
+        index = DatasetIndex(common_data_list, source_class_names)
+        # 先构建索引（可能向源类别表追加新类别），再取查找表
+        kept = index.remap_classes(self.lut_for(source_class_names), self.output_class_names)
+        return index.to_common_formats(kept, keep_empty=True)
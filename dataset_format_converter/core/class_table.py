@@ -0,0 +1,150 @@
+"""
+类别表 - 带哈希索引的类别名称列表
+
+一个数据集的所有 CommonFormat 对象共享同一个 ClassTable，名称与ID之间的
+相互查找均为 O(1)，不再随类别数量线性增长。
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional
+
+
+class ClassTable(list):
+    """
+    类别表（list 的子类，可在任何需要 class_names 列表的地方使用）
+
+    名称到ID的索引随列表一起维护；add() 在锁内完成“查找或追加”，
+    可供并发的解析线程安全地扩展类别表。
+    """
+
+    def __init__(self, class_names: Iterable[str] = ()):
+        """
+        初始化类别表
+
+        Args:
+            class_names: 初始类别名称
+        """
+        super().__init__(class_names)
+        self._lock = threading.Lock()
+        self._rebuild_index()
+
+    @classmethod
+    def of(cls, class_names: Optional[List[str]]) -> 'ClassTable':
+        """
+        获取类别表：已是 ClassTable 时原样返回，否则复制为新的 ClassTable
+
+        需要在多次调用之间共享并扩展类别表时，调用方应传入 ClassTable。
+
+        Args:
+            class_names: 类别名称列表（可选）
+
+        Returns:
+            ClassTable: 类别表
+        """
+        if isinstance(class_names, cls):
+            return class_names
+        return cls(class_names or ())
+
+    def _rebuild_index(self) -> None:
+        """重建名称索引（重复名称与 list.index 一致，取第一次出现的位置）"""
+        index: Dict[str, int] = {}
+        for class_id, class_name in enumerate(self):
+            index.setdefault(class_name, class_id)
+        self._index = index
+
+    def add(self, class_name: str) -> int:
+        """
+        获取类别ID，类别不存在时追加到末尾
+
+        Args:
+            class_name: 类别名称
+
+        Returns:
+            int: 类别ID
+        """
+        class_id = self._index.get(class_name)
+        if class_id is not None:
+            return class_id
+        with self._lock:
+            class_id = self._index.get(class_name)
+            if class_id is None:
+                class_id = len(self)
+                super().append(class_name)
+                self._index[class_name] = class_id
+            return class_id
+
+    def ensure_size(self, size: int) -> None:
+        """
+        用占位名称 class_{id} 将类别表扩展到指定长度（用于按ID引用类别的格式）
+
+        Args:
+            size: 类别表的最小长度
+        """
+        if len(self) >= size:
+            return
+        with self._lock:
+            while len(self) < size:
+                class_name = f"class_{len(self)}"
+                self._index.setdefault(class_name, len(self))
+                super().append(class_name)
+
+    def get_id(self, class_name: str) -> Optional[int]:
+        """
+        获取类别ID
+
+        Args:
+            class_name: 类别名称
+
+        Returns:
+            Optional[int]: 类别ID，不存在时返回None
+        """
+        return self._index.get(class_name)
+
+    def index(self, class_name, *args) -> int:
+        if args:
+            return super().index(class_name, *args)
+        class_id = self._index.get(class_name)
+        if class_id is None:
+            raise ValueError(f"'{class_name}' is not in class table")
+        return class_id
+
+    def __contains__(self, class_name) -> bool:
+        return class_name in self._index
+
+    def append(self, class_name: str) -> None:
+        with self._lock:
+            self._index.setdefault(class_name, len(self))
+            super().append(class_name)
+
+    # 其余修改操作较少使用，修改后整体重建索引
+    def _mutating(name):
+        def method(self, *args, **kwargs):
+            with self._lock:
+                result = getattr(super(ClassTable, self), name)(*args, **kwargs)
+                self._rebuild_index()
+            return result
+        method.__name__ = name
+        return method
+
+    extend = _mutating('extend')
+    insert = _mutating('insert')
+    remove = _mutating('remove')
+    pop = _mutating('pop')
+    clear = _mutating('clear')
+    sort = _mutating('sort')
+    reverse = _mutating('reverse')
+    __setitem__ = _mutating('__setitem__')
+    __delitem__ = _mutating('__delitem__')
+    __iadd__ = _mutating('__iadd__')
+    __imul__ = _mutating('__imul__')
+    del _mutating
+
+    def __reduce__(self):
+        # 锁不能被序列化，跨进程传递时只传递类别名称
+        return (self.__class__, (list(self),))
+
+    def __copy__(self) -> 'ClassTable':
+        return self.__class__(self)
+
+    def __repr__(self) -> str:
+        return f"ClassTable({list.__repr__(self)})"
@@ -0,0 +1,179 @@
+"""
+图片边界裁剪 - 转换过程中把跨越图片边界的多边形裁剪到图片范围内
+
+逐坐标裁剪到 [0, 1] 会使跨越边界的旋转框变形，框越大误差越大。
+这里在整个批次的角点数组上做多边形与图片矩形的裁剪（向量化 Sutherland–Hodgman，
+见 geometry_utils.clip_polygons_to_rect），再把裁剪结果还原为四个角点：
+
+- polygon: 裁剪后的多边形化简为四个顶点（删除贡献面积最小的顶点）
+- min-area: 对裁剪后的多边形重新拟合最小面积外接矩形，结果仍是旋转矩形
+  （只考虑不超出图片的矩形；裁剪后的多边形总有一条边位于图片边界上，沿该边的矩形必然符合）
+
+解析时需推迟坐标范围检查（见 common_format.defer_range_check），越界坐标才能保留到本阶段。
+"""
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from .common_format import CommonFormat
+from .geometry_utils import (
+    clip_polygons_to_rect, simplify_polygons, min_area_rect, corners_from_obb_parameters, polygon_areas,
+    rotated_iou
+)
+
+
+# 裁剪后还原为四个角点的方式
+CLIP_MODES = ('polygon', 'min-area')
+
+# 坐标超出 [0, 1] 不超过此值（归一化坐标）时视为数值误差，只逐坐标裁剪
+CLIP_TOLERANCE = 1e-6
+
+
+@dataclass
+class ClipStats:
+    """
+    图片边界裁剪统计
+
+    形变比例 = 1 - IoU(原始框, 输出的四边形)。polygon 方式下输出位于原始框内，即为面积损失比例；
+    min-area 方式重新拟合的矩形可能超出裁剪后的多边形或发生旋转，面积不变时形变比例同样大于 0。
+
+    Attributes:
+        clipped_boxes: 跨越图片边界而被裁剪的框数
+        removed_boxes: 完全位于图片外（切片时为可见比例低于阈值）而被删除的框数
+        change_sum: 被裁剪框的形变比例之和
+        change_max: 被裁剪框的最大形变比例
+    """
+    clipped_boxes: int = 0
+    removed_boxes: int = 0
+    change_sum: float = 0.0
+    change_max: float = 0.0
+
+    @property
+    def change_mean(self) -> float:
+        """被裁剪框的平均形变比例"""
+        return self.change_sum / self.clipped_boxes if self.clipped_boxes else 0.0
+
+    def merge(self, other: 'ClipStats') -> 'ClipStats':
+        """
+        累加另一个批次的统计
+
+        Args:
+            other: 另一个批次的统计
+
+        Returns:
+            ClipStats: 自身
+        """
+        self.clipped_boxes += other.clipped_boxes
+        self.removed_boxes += other.removed_boxes
+        self.change_sum += other.change_sum
+        self.change_max = max(self.change_max, other.change_max)
+        return self
+
+
+def quads_from_clipped(polygons: np.ndarray, vertex_counts: np.ndarray, scale: np.ndarray,
+                       mode: str = 'polygon') -> np.ndarray:
+    """
+    将裁剪到单位矩形内的多边形还原为四个角点
+
+    Args:
+        polygons: 裁剪后的多边形 (N, M, 2)（归一化坐标，见 clip_polygons_to_rect）
+        vertex_counts: 每个多边形的顶点数 (N,)，至少为 3
+        scale: 每个多边形的像素尺寸 (N, 1, 2)，即 (宽, 高)
+        mode: 还原方式（polygon / min-area）
+
+    Returns:
+        np.ndarray: 四边形角点 (N, 4, 2)（归一化坐标，位于 [0, 1] 内）
+    """
+    if mode == 'min-area':
+        # 角度在像素坐标下才有意义，拟合在像素坐标下进行
+        quads = corners_from_obb_parameters(min_area_rect(polygons * scale, bounds=scale[:, 0])) / scale
+    else:
+        quads = simplify_polygons(polygons, vertex_counts, 4)
+    # 消除数值误差
+    return np.clip(quads, 0.0, 1.0)
+
+
+def clip_change(original: np.ndarray, fitted: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """
+    计算被裁剪框的形变比例 1 - IoU(原始框, 输出的四边形)
+
+    Args:
+        original: 原始角点 (N, 4, 2)（归一化坐标）
+        fitted: 输出的四边形角点 (N, 4, 2)（归一化坐标）
+        scale: 每个框的像素尺寸 (N, 1, 2)，即 (宽, 高)
+
+    Returns:
+        np.ndarray: 形变比例 (N,)，位于 [0, 1] 内
+    """
+    # 宽高不等时归一化坐标下的角度与像素坐标不同，IoU 在像素坐标下计算
+    change = 1 - rotated_iou(original * scale, fitted * scale)
+    change[~np.isfinite(change)] = 0.0
+    return np.clip(change, 0.0, 1.0)
+
+
+def clip_to_image(common_data_list: List[CommonFormat], mode: str = 'polygon') -> Tuple[List[CommonFormat], ClipStats]:
+    """
+    将一个批次中跨越图片边界的框裁剪到图片范围内（就地修改）
+
+    完全位于图片外的框被删除；其余坐标的微小越界（数值误差）逐坐标裁剪到 [0, 1]。
+    含 NaN 或无穷大坐标的框保持不变。
+
+    Args:
+        common_data_list: 中间格式数据列表
+        mode: 裁剪后还原为四个角点的方式（polygon / min-area）
+
+    Returns:
+        Tuple[List[CommonFormat], ClipStats]: (中间格式数据列表, 裁剪统计)
+    """
+    if mode not in CLIP_MODES:
+        raise ValueError(f"Invalid clip mode '{mode}'. Available modes: {list(CLIP_MODES)}")
+    stats = ClipStats()
+    boxes = [bbox for common_data in common_data_list for bbox in common_data.bounding_boxes]
+    if not boxes:
+        return common_data_list, stats
+
+    counts = [len(common_data.bounding_boxes) for common_data in common_data_list]
+    scales = np.repeat([[common_data.image_width, common_data.image_height] for common_data in common_data_list],
+                       counts, axis=0).astype(np.float64)
+
+    corners = np.stack([bbox.corners for bbox in boxes]).astype(np.float64, copy=False)
+    finite = np.isfinite(corners).all(axis=(1, 2))
+    safe = np.where(finite[:, None, None], corners, 0.5)
+    outside = ((safe < 0) | (safe > 1)).any(axis=(1, 2))
+    crossing_mask = ((safe < -CLIP_TOLERANCE) | (safe > 1 + CLIP_TOLERANCE)).any(axis=(1, 2))
+    crossing = np.flatnonzero(crossing_mask)
+
+    # 数值误差级别的越界：与逐坐标裁剪的行为一致
+    for row in np.flatnonzero(outside & ~crossing_mask):
+        boxes[row].corners = np.clip(boxes[row].corners, 0.0, 1.0)
+
+    removed = np.zeros(len(boxes), dtype=bool)
+    if len(crossing):
+        polygons, vertex_counts = clip_polygons_to_rect(corners[crossing])
+        scale = scales[crossing, None, :]
+        inside = (vertex_counts >= 3) & (np.abs(polygon_areas(polygons * scale)) > 0)
+        removed[crossing[~inside]] = True
+
+        kept = crossing[inside]
+        polygons, vertex_counts, scale = polygons[inside], vertex_counts[inside], scale[inside]
+        fitted = quads_from_clipped(polygons, vertex_counts, scale, mode)
+        for row, new_corners in zip(kept, fitted):
+            boxes[row].corners = new_corners
+
+        change = clip_change(corners[kept], fitted, scale)
+        stats.clipped_boxes = len(kept)
+        stats.removed_boxes = int(np.count_nonzero(~inside))
+        stats.change_sum = float(change.sum())
+        stats.change_max = float(change.max()) if len(kept) else 0.0
+
+    if removed.any():
+        row = 0
+        for common_data, count in zip(common_data_list, counts):
+            if removed[row:row + count].any():
+                common_data.bounding_boxes = [
+                    bbox for bbox, drop in zip(common_data.bounding_boxes, removed[row:row + count]) if not drop
+                ]
+            row += count
+    return common_data_list, stats
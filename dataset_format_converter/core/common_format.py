@@ -4,10 +4,130 @@
 所有格式都将转换为这个中间格式，然后再转换为目标格式
 """
 
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Iterator
 from dataclasses import dataclass
+from contextlib import contextmanager
+import contextvars
+import threading
 import numpy as np
 
+from .class_table import ClassTable
+
+
+# 校验级别：
+# - strict: 检查角点形状、坐标范围和类别名称，并将坐标裁剪到 [0, 1]
+# - clip-only: 不做任何检查，只将坐标裁剪到 [0, 1]
+# - trusted: 不做检查也不裁剪，直接构造对象（用于已校验过的数据集）
+VALIDATION_LEVELS = ('strict', 'clip-only', 'trusted')
+
+_validation_level: contextvars.ContextVar = contextvars.ContextVar('validation_level', default='strict')
+
+
+def get_validation_level() -> str:
+    """获取当前上下文的校验级别"""
+    return _validation_level.get()
+
+
+@contextmanager
+def validation_level(level: str) -> Iterator[None]:
+    """
+    在上下文中临时切换校验级别
+
+    校验级别保存在 contextvars 中，只对当前线程/协程生效，
+    新建的工作线程使用默认的 strict 级别。
+
+    Args:
+        level: 校验级别（strict / clip-only / trusted）
+    """
+    if level not in VALIDATION_LEVELS:
+        raise ValueError(f"Invalid validation level '{level}'. Available levels: {list(VALIDATION_LEVELS)}")
+    token = _validation_level.set(level)
+    try:
+        yield
+    finally:
+        _validation_level.reset(token)
+
+
+# 启用图片边界裁剪（见 core/clipping.py）时，构造对象时不检查也不裁剪坐标范围，
+# 越界的多边形留给裁剪阶段整体处理，避免逐坐标裁剪使跨越边界的旋转框变形
+_range_check_deferred: contextvars.ContextVar = contextvars.ContextVar('range_check_deferred', default=False)
+
+
+def range_check_deferred() -> bool:
+    """当前上下文是否推迟了坐标范围检查"""
+    return _range_check_deferred.get()
+
+
+@contextmanager
+def defer_range_check(enabled: bool = True) -> Iterator[None]:
+    """
+    在上下文中推迟坐标范围的检查和裁剪（其他检查照常进行）
+
+    Args:
+        enabled: 是否推迟（False 时不改变当前设置，便于按参数条件启用）
+    """
+    if not enabled:
+        yield
+        return
+    token = _range_check_deferred.set(True)
+    try:
+        yield
+    finally:
+        _range_check_deferred.reset(token)
+
+
+# 中间层的坐标精度：
+# - float64: 使用 BoundingBox，每个框持有独立的 float64 (4, 2) 数组（默认）
+# - float32: 使用 CompactBoundingBox，角点存放在共享的 float32 缓冲区中
+PRECISION_MODES = ('float64', 'float32')
+
+_precision_mode: contextvars.ContextVar = contextvars.ContextVar('precision_mode', default='float64')
+
+
+def get_precision_mode() -> str:
+    """获取当前上下文的坐标精度"""
+    return _precision_mode.get()
+
+
+@contextmanager
+def precision_mode(mode: str) -> Iterator[None]:
+    """
+    在上下文中临时切换中间层的坐标精度
+
+    Args:
+        mode: 坐标精度（float64 / float32）
+    """
+    if mode not in PRECISION_MODES:
+        raise ValueError(f"Invalid precision mode '{mode}'. Available modes: {list(PRECISION_MODES)}")
+    token = _precision_mode.set(mode)
+    try:
+        yield
+    finally:
+        _precision_mode.reset(token)
+
+
+def _check_corners(corners: np.ndarray) -> np.ndarray:
+    """按当前校验级别检查并裁剪角点坐标"""
+    level = _validation_level.get()
+    if level == 'trusted':
+        return corners
+    deferred = _range_check_deferred.get()
+    if level == 'clip-only':
+        return corners if deferred else np.clip(corners, 0.0, 1.0)
+    
+    if corners.shape != (4, 2):
+        raise ValueError("corners must be a (4, 2) numpy array")
+    if deferred:
+        return corners
+    
+    # 确保坐标是归一化的 (0-1之间)，允许微小的数值误差
+    tolerance = 1e-6  # 允许微小的数值误差
+    if np.any(corners < -tolerance) or np.any(corners > 1 + tolerance):
+        raise ValueError("All coordinates must be normalized (0-1)")
+    
+    # 将坐标限制在[0, 1]范围内以消除数值误差
+    return np.clip(corners, 0.0, 1.0)
+
 
 @dataclass
 class BoundingBox:
@@ -28,17 +148,8 @@ class BoundingBox:
     difficulty: Optional[int] = None
     
     def __post_init__(self):
-        """验证数据格式"""
-        if self.corners.shape != (4, 2):
-            raise ValueError("corners must be a (4, 2) numpy array")
-        
-        # 确保坐标是归一化的 (0-1之间)，允许微小的数值误差
-        tolerance = 1e-6  # 允许微小的数值误差
-        if np.any(self.corners < -tolerance) or np.any(self.corners > 1 + tolerance):
-            raise ValueError("All coordinates must be normalized (0-1)")
-        
-        # 将坐标限制在[0, 1]范围内以消除数值误差
-        self.corners = np.clip(self.corners, 0.0, 1.0)
+        """验证数据格式（行为取决于当前的校验级别）"""
+        self.corners = _check_corners(self.corners)
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
@@ -62,6 +173,148 @@ class BoundingBox:
         )
 
 
+class CornerArena:
+    """
+    角点缓冲区 - 按块分配 float32 (N, 4, 2) 数组，每个紧凑边界框占用其中一行
+
+    一个块只有在其中所有边界框都被释放后才会被回收。
+    """
+
+    def __init__(self, chunk_boxes: int = 4096):
+        """
+        初始化角点缓冲区
+
+        Args:
+            chunk_boxes: 每个块容纳的边界框数量
+        """
+        self.chunk_boxes = chunk_boxes
+        self._chunk: Optional[np.ndarray] = None
+        self._used = chunk_boxes
+        self._lock = threading.Lock()
+
+    def allocate(self) -> Tuple[np.ndarray, int]:
+        """
+        分配一行角点存储
+
+        Returns:
+            Tuple[np.ndarray, int]: (所在的块, 行号)
+        """
+        with self._lock:
+            if self._used >= self.chunk_boxes:
+                self._chunk = np.empty((self.chunk_boxes, 4, 2), dtype=np.float32)
+                self._used = 0
+            row = self._used
+            self._used += 1
+            return self._chunk, row
+
+
+_default_arena = CornerArena()
+
+
+class CompactBoundingBox:
+    """
+    紧凑边界框 - 与 BoundingBox 接口相同，使用 __slots__ 且角点存放在共享的 float32 缓冲区中
+
+    corners 属性返回缓冲区中对应行的 (4, 2) float32 视图，对其赋值会写回缓冲区。
+
+    内存与精度（20 万个随机框，tracemalloc 实测，含列表中的指针）：
+    - BoundingBox（float64）：约 312 字节/框（对象 56 字节，__dict__ 112 字节，
+      独立的 (4, 2) 数组约 144 字节）
+    - CompactBoundingBox（float32）：约 150 字节/框（对象 80 字节，缓冲区 32 字节，
+      行号整数约 28 字节），约为前者的 48%
+    - 归一化坐标的存储误差实测最大为 2.98e-8（理论上限 2^-25）；换算为像素坐标时再经
+      一次 float32 舍入，输出误差约为 6e-8 × 图片尺寸（像素）
+    - 归一化坐标输出（如 YOLO-OBB，6 位小数）：最后一位偶尔相差 1
+    - 像素坐标输出（如 DOTA、PascalVOC，6 位小数）：多数数值的末几位会变化，
+      1000 像素的图片上最大相差约 6e-5 像素，8192 像素的图片上约 2.4e-4 像素
+    """
+
+    __slots__ = ('class_name', 'class_id', 'confidence', 'difficulty', '_chunk', '_row')
+
+    def __init__(self, class_name: str, corners: np.ndarray,
+                 class_id: Optional[int] = None,
+                 confidence: Optional[float] = None,
+                 difficulty: Optional[int] = None,
+                 arena: Optional[CornerArena] = None):
+        """
+        初始化紧凑边界框
+
+        Args:
+            class_name: 类别名称
+            corners: 四个角点坐标 (4, 2)（归一化）
+            class_id: 类别ID（可选）
+            confidence: 置信度（可选）
+            difficulty: 难度级别（可选）
+            arena: 角点缓冲区（可选，默认使用全局缓冲区）
+        """
+        self.class_name = class_name
+        self.class_id = class_id
+        self.confidence = confidence
+        self.difficulty = difficulty
+        self._chunk, self._row = (arena or _default_arena).allocate()
+        self._chunk[self._row] = _check_corners(corners)
+
+    @property
+    def corners(self) -> np.ndarray:
+        """四个角点坐标 (4, 2)，缓冲区的 float32 视图"""
+        return self._chunk[self._row]
+
+    @corners.setter
+    def corners(self, value: np.ndarray) -> None:
+        self._chunk[self._row] = value
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (BoundingBox, CompactBoundingBox)):
+            return NotImplemented
+        return (self.class_name == other.class_name and self.class_id == other.class_id
+                and self.confidence == other.confidence and self.difficulty == other.difficulty
+                and np.array_equal(self.corners, other.corners))
+
+    def __repr__(self) -> str:
+        return (f"CompactBoundingBox(class_name={self.class_name!r}, corners={self.corners.tolist()}, "
+                f"class_id={self.class_id!r}, confidence={self.confidence!r}, difficulty={self.difficulty!r})")
+
+    def __reduce__(self):
+        # 只序列化本框的角点，而不是整个缓冲区块
+        return (self.__class__, (self.class_name, self.corners.copy(), self.class_id,
+                                 self.confidence, self.difficulty))
+
+    to_dict = BoundingBox.to_dict
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CompactBoundingBox':
+        """从字典创建对象"""
+        return cls(
+            class_name=data['class_name'],
+            corners=np.array(data['corners']),
+            class_id=data.get('class_id'),
+            confidence=data.get('confidence'),
+            difficulty=data.get('difficulty')
+        )
+
+
+def make_bounding_box(class_name: str, corners: np.ndarray,
+                      class_id: Optional[int] = None,
+                      confidence: Optional[float] = None,
+                      difficulty: Optional[int] = None):
+    """
+    按当前的坐标精度创建边界框（格式解析时使用）
+
+    Args:
+        class_name: 类别名称
+        corners: 四个角点坐标 (4, 2)（归一化）
+        class_id: 类别ID（可选）
+        confidence: 置信度（可选）
+        difficulty: 难度级别（可选）
+
+    Returns:
+        BoundingBox 或 CompactBoundingBox
+    """
+    if _precision_mode.get() == 'float32':
+        return CompactBoundingBox(class_name, corners, class_id, confidence, difficulty)
+    return BoundingBox(class_name, corners, class_id, confidence, difficulty)
+
+
 @dataclass
 class CommonFormat:
     """
@@ -71,7 +324,7 @@ class CommonFormat:
         image_width: 图片宽度（像素）
         image_height: 图片高度（像素）
         bounding_boxes: 边界框列表
-        class_names: 类别名称列表（有序）
+        class_names: 类别表（有序，同一数据集的所有对象共享同一个 ClassTable）
         image_filename: 图片文件名（可选）
     """
     image_width: int
@@ -82,6 +335,10 @@ class CommonFormat:
     
     def __post_init__(self):
         """验证数据"""
+        self.class_names = ClassTable.of(self.class_names)
+        if _validation_level.get() != 'strict':
+            return
+        
         if self.image_width <= 0 or self.image_height <= 0:
             raise ValueError("Image dimensions must be positive")
         
@@ -92,16 +349,15 @@ class CommonFormat:
     
     def add_bounding_box(self, bbox: BoundingBox) -> None:
         """添加边界框"""
-        if bbox.class_name not in self.class_names:
-            self.class_names.append(bbox.class_name)
+        self.class_names.add(bbox.class_name)
         self.bounding_boxes.append(bbox)
     
     def get_class_id(self, class_name: str) -> int:
         """获取类别ID"""
-        try:
-            return self.class_names.index(class_name)
-        except ValueError:
+        class_id = self.class_names.get_id(class_name)
+        if class_id is None:
             raise ValueError(f"Class '{class_name}' not found")
+        return class_id
     
     def get_class_name(self, class_id: int) -> str:
         """获取类别名称"""
@@ -0,0 +1,46 @@
+"""
+转换结果 - 汇总一次目录转换的统计信息
+"""
+
+from dataclasses import dataclass, asdict, field
+from typing import Dict, Any, Optional
+
+from .clipping import ClipStats
+from .error_report import ErrorSummary
+
+
+@dataclass
+class ConversionResult:
+    """
+    目录转换结果
+
+    Attributes:
+        total_files: 输入目录中的文件总数
+        converted_files: 本次成功转换的输入文件数
+        records: 写出的记录数（图片数；单文件数据集如 COCO 的一个文件包含多张图片）
+        skipped_files: 因断点续传而跳过的文件数
+        failed_files: 转换失败的文件数
+        split_counts: 各划分写出的文件数（启用数据集划分时）
+        tiles: 写出的切片数（切片时）
+        clipping: 图片边界裁剪统计（启用裁剪或切片时）
+        duplicate_boxes: 删除的重复框数（启用重复框删除时）
+        reordered_boxes: 角点顺序被调整的框数（启用角点顺序统一时）
+        statistics: 数据集统计（启用统计时，见 DatasetStatistics.to_dict）
+        errors: 逐文件错误汇总（按 阶段/异常类型 计数和样例，见 core/error_report.py）
+    """
+    total_files: int = 0
+    converted_files: int = 0
+    records: int = 0
+    skipped_files: int = 0
+    failed_files: int = 0
+    split_counts: Dict[str, int] = field(default_factory=dict)
+    tiles: int = 0
+    clipping: ClipStats = field(default_factory=ClipStats)
+    duplicate_boxes: int = 0
+    reordered_boxes: int = 0
+    statistics: Optional[Dict[str, Any]] = None
+    errors: ErrorSummary = field(default_factory=ErrorSummary)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return asdict(self)
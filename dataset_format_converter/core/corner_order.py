@@ -0,0 +1,42 @@
+"""
+角点顺序统一 - 转换过程中把所有四边形整理为相同的顶点顺序
+
+DOTA、YOLO-OBB 等输入的角点顺序不定，而 LabelImg-OBB 等参数化输出按
+左上，右上，右下，左下 的顺序取宽度方向和角度。每个批次的角点拼接为一个数组，
+由 geometry_utils.canonicalize_corners 一次完成排序，只把顺序改变的框写回。
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+from .common_format import CommonFormat
+from .geometry_utils import canonicalize_corners
+
+
+def canonicalize(common_data_list: List[CommonFormat]) -> Tuple[List[CommonFormat], int]:
+    """
+    统一一个批次中所有框的角点顺序（就地修改）
+
+    Args:
+        common_data_list: 中间格式数据列表
+
+    Returns:
+        Tuple[List[CommonFormat], int]: (中间格式数据列表, 角点顺序被调整的框数)
+    """
+    boxes = [bbox for common_data in common_data_list for bbox in common_data.bounding_boxes]
+    if not boxes:
+        return common_data_list, 0
+
+    counts = [len(common_data.bounding_boxes) for common_data in common_data_list]
+    widths = np.repeat([common_data.image_width for common_data in common_data_list], counts)
+    heights = np.repeat([common_data.image_height for common_data in common_data_list], counts)
+
+    corners = np.stack([bbox.corners for bbox in boxes])
+    ordered = canonicalize_corners(corners, widths, heights)
+    # 含 NaN 的框按位置比较，NaN 与 NaN 视为相同
+    same = (ordered == corners) | (np.isnan(ordered) & np.isnan(corners))
+    changed = np.flatnonzero(~same.all(axis=(1, 2)))
+    for row in changed:
+        boxes[row].corners = ordered[row]
+    return common_data_list, len(changed)
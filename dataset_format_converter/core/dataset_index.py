@@ -0,0 +1,275 @@
+"""
+数据集索引 - 中间格式数据的列式内存索引
+
+将一个数据集的所有边界框展开为列式数组（角点、类别ID、所属图片、面积、长宽比），
+并建立 类别 -> 图片 的倒排表，使“哪些图片包含类别X”、“所有大于N像素的框”
+这类查询以向量化方式完成，而不是逐个遍历 CommonFormat。
+"""
+
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .class_table import ClassTable
+from .common_format import CommonFormat, make_bounding_box, validation_level
+
+
+class DatasetIndex:
+    """
+    数据集索引
+
+    Attributes:
+        class_names: 全局类别表
+        image_filenames: 图片文件名列表
+        image_widths: 图片宽度 (M,)
+        image_heights: 图片高度 (M,)
+        offsets: 每张图片的边界框在列数组中的起止位置 (M+1,)，
+            第 i 张图片的框为 [offsets[i], offsets[i+1])
+        corners: 归一化角点 (N, 4, 2)
+        class_ids: 全局类别ID (N,)
+        image_ids: 所属图片序号 (N,)
+        confidences: 置信度 (N,)，缺失为 NaN
+        difficulties: 难度级别 (N,)，缺失为 -1
+        areas: 像素面积 (N,)
+        aspect_ratios: 长边与短边之比 (N,)，退化的框为 inf
+    """
+
+    def __init__(self, common_data_list: Sequence[CommonFormat],
+                 class_names: Optional[List[str]] = None):
+        """
+        从中间格式数据构建索引
+
+        Args:
+            common_data_list: 中间格式数据列表
+            class_names: 全局类别表（可选，默认使用第一张图片的类别表并按需扩展）
+        """
+        if class_names is None:
+            class_names = common_data_list[0].class_names if common_data_list else None
+        self.class_names = ClassTable.of(class_names)
+
+        image_count = len(common_data_list)
+        self.image_filenames: List[Optional[str]] = [c.image_filename for c in common_data_list]
+        self._image_lookup = {name: index for index, name in enumerate(self.image_filenames)}
+        self.image_widths = np.fromiter((c.image_width for c in common_data_list), dtype=np.int64, count=image_count)
+        self.image_heights = np.fromiter((c.image_height for c in common_data_list), dtype=np.int64, count=image_count)
+
+        counts = np.fromiter((len(c.bounding_boxes) for c in common_data_list), dtype=np.int64, count=image_count)
+        self.offsets = np.zeros(image_count + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+        box_count = int(self.offsets[-1])
+
+        boxes = [bbox for c in common_data_list for bbox in c.bounding_boxes]
+        self.corners = (np.stack([bbox.corners for bbox in boxes]).astype(np.float64, copy=False)
+                        if boxes else np.empty((0, 4, 2), dtype=np.float64))
+        self.class_ids = np.fromiter((self.class_names.add(bbox.class_name) for bbox in boxes),
+                                     dtype=np.int32, count=box_count)
+        self.confidences = np.fromiter(
+            (np.nan if bbox.confidence is None else bbox.confidence for bbox in boxes),
+            dtype=np.float64, count=box_count)
+        self.difficulties = np.fromiter(
+            (-1 if bbox.difficulty is None else bbox.difficulty for bbox in boxes),
+            dtype=np.int32, count=box_count)
+        self.image_ids = np.repeat(np.arange(image_count, dtype=np.int32), counts)
+
+        self._compute_geometry()
+        self._build_postings()
+
+    def _compute_geometry(self) -> None:
+        """计算像素面积（鞋带公式）和长宽比（相邻两边的长度之比）"""
+        pixel = self.corners.copy()
+        pixel[:, :, 0] *= self.image_widths[self.image_ids, None]
+        pixel[:, :, 1] *= self.image_heights[self.image_ids, None]
+
+        x, y = pixel[:, :, 0], pixel[:, :, 1]
+        self.areas = 0.5 * np.abs(np.sum(x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y, axis=1))
+
+        side_a = np.linalg.norm(pixel[:, 1] - pixel[:, 0], axis=1)
+        side_b = np.linalg.norm(pixel[:, 2] - pixel[:, 1], axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.aspect_ratios = np.maximum(side_a, side_b) / np.minimum(side_a, side_b)
+        self.aspect_ratios[np.isnan(self.aspect_ratios)] = np.inf
+
+    def _build_postings(self) -> None:
+        """构建 类别ID -> 图片序号 的倒排表（每个类别的图片序号升序且唯一）"""
+        self._postings: Dict[int, np.ndarray] = {}
+        # 类别ID为 -1 的框已被删除，不进入倒排表
+        valid = self.class_ids >= 0
+        class_ids, image_ids = self.class_ids[valid], self.image_ids[valid]
+        if not len(class_ids):
+            return
+        # 按 (类别, 图片) 排序后去重，再按类别切分
+        order = np.lexsort((image_ids, class_ids))
+        pairs = np.stack([class_ids[order], image_ids[order]], axis=1)
+        pairs = pairs[np.concatenate([[True], np.any(pairs[1:] != pairs[:-1], axis=1)])]
+        class_starts = np.flatnonzero(np.concatenate([[True], pairs[1:, 0] != pairs[:-1, 0]]))
+        for start, end in zip(class_starts, np.append(class_starts[1:], len(pairs))):
+            self._postings[int(pairs[start, 0])] = pairs[start:end, 1]
+
+    def __len__(self) -> int:
+        """边界框总数"""
+        return len(self.class_ids)
+
+    @property
+    def image_count(self) -> int:
+        """图片数"""
+        return len(self.image_filenames)
+
+    def image_index(self, image_filename: str) -> int:
+        """
+        按文件名获取图片序号
+
+        Args:
+            image_filename: 图片文件名
+
+        Returns:
+            int: 图片序号
+        """
+        try:
+            return self._image_lookup[image_filename]
+        except KeyError:
+            raise ValueError(f"Image '{image_filename}' not found in index")
+
+    def box_slice(self, image: Union[int, str]) -> slice:
+        """
+        获取一张图片的边界框在列数组中的切片
+
+        Args:
+            image: 图片序号或文件名
+
+        Returns:
+            slice: 列数组切片
+        """
+        index = self.image_index(image) if isinstance(image, str) else image
+        return slice(int(self.offsets[index]), int(self.offsets[index + 1]))
+
+    def images_with_class(self, class_name: str) -> np.ndarray:
+        """
+        获取包含指定类别的图片序号
+
+        Args:
+            class_name: 类别名称
+
+        Returns:
+            np.ndarray: 图片序号（升序）
+        """
+        class_id = self.class_names.get_id(class_name)
+        if class_id is None:
+            return np.empty(0, dtype=np.int32)
+        return self._postings.get(class_id, np.empty(0, dtype=np.int32))
+
+    def query(self, class_names: Optional[Sequence[str]] = None,
+              min_area: Optional[float] = None, max_area: Optional[float] = None,
+              min_aspect: Optional[float] = None, max_aspect: Optional[float] = None,
+              images: Optional[Sequence[Union[int, str]]] = None) -> np.ndarray:
+        """
+        按条件筛选边界框，所有条件取交集
+
+        Args:
+            class_names: 只保留这些类别（可选）
+            min_area: 最小像素面积（可选）
+            max_area: 最大像素面积（可选）
+            min_aspect: 最小长宽比（可选）
+            max_aspect: 最大长宽比（可选）
+            images: 只保留这些图片（序号或文件名，可选）
+
+        Returns:
+            np.ndarray: 边界框布尔掩码 (N,)
+        """
+        # 类别ID为 -1 的框已被 remap_classes 删除
+        mask = self.class_ids >= 0
+        if class_names is not None:
+            class_ids = [self.class_names.get_id(name) for name in class_names]
+            mask &= np.isin(self.class_ids, [class_id for class_id in class_ids if class_id is not None])
+        if min_area is not None:
+            mask &= self.areas >= min_area
+        if max_area is not None:
+            mask &= self.areas <= max_area
+        if min_aspect is not None:
+            mask &= self.aspect_ratios >= min_aspect
+        if max_aspect is not None:
+            mask &= self.aspect_ratios <= max_aspect
+        if images is not None:
+            image_mask = np.zeros(self.image_count, dtype=bool)
+            image_mask[[self.image_index(i) if isinstance(i, str) else i for i in images]] = True
+            mask &= image_mask[self.image_ids]
+        return mask
+
+    def remap_classes(self, lut: np.ndarray, class_names: List[str]) -> np.ndarray:
+        """
+        用查找表重映射类别ID列，并切换到新的类别表
+
+        Args:
+            lut: 查找表，lut[旧类别ID] 为新类别ID，-1 表示删除
+            class_names: 新的类别表
+
+        Returns:
+            np.ndarray: 未被删除的边界框布尔掩码 (N,)
+        """
+        # 之前已被删除的框保持删除（lut[-1] 会取到最后一个类别）
+        deleted = self.class_ids < 0
+        self.class_ids = np.where(deleted, -1, lut[np.where(deleted, 0, self.class_ids)]).astype(np.int32, copy=False)
+        self.class_names = ClassTable.of(class_names)
+        kept = self.class_ids >= 0
+        self._build_postings()
+        return kept
+
+    def image_mask(self, box_mask: np.ndarray) -> np.ndarray:
+        """
+        将边界框掩码转换为图片掩码（至少有一个框被选中的图片）
+
+        Args:
+            box_mask: 边界框布尔掩码 (N,)（已删除的框不计入）
+
+        Returns:
+            np.ndarray: 图片布尔掩码 (M,)
+        """
+        return np.bincount(self.image_ids[box_mask & (self.class_ids >= 0)], minlength=self.image_count) > 0
+
+    def to_common_formats(self, box_mask: Optional[np.ndarray] = None,
+                          keep_empty: bool = False) -> List[CommonFormat]:
+        """
+        将（筛选后的）索引还原为中间格式数据
+
+        Args:
+            box_mask: 边界框布尔掩码（可选，默认全部保留；已被 remap_classes 删除的框始终不输出）
+            keep_empty: 是否保留筛选后没有边界框的图片
+
+        Returns:
+            List[CommonFormat]: 中间格式数据列表，共享同一个类别表
+        """
+        valid = self.class_ids >= 0
+        selected = np.flatnonzero(valid if box_mask is None else box_mask & valid)
+        counts = np.bincount(self.image_ids[selected], minlength=self.image_count)
+        bounds = np.concatenate([[0], np.cumsum(counts)])
+
+        class_names = self.class_names
+        corners = self.corners[selected]
+        class_ids = self.class_ids[selected].tolist()
+        confidences = self.confidences[selected].tolist()
+        difficulties = self.difficulties[selected].tolist()
+
+        results = []
+        # 索引中的数据已经过构造时的校验，还原时无需再次检查
+        with validation_level('trusted'):
+            for image_index in range(self.image_count):
+                start, end = bounds[image_index], bounds[image_index + 1]
+                if start == end and not keep_empty:
+                    continue
+                bounding_boxes = [
+                    make_bounding_box(
+                        class_name=class_names[class_ids[row]],
+                        corners=corners[row],
+                        class_id=class_ids[row],
+                        confidence=None if np.isnan(confidences[row]) else confidences[row],
+                        difficulty=None if difficulties[row] < 0 else difficulties[row]
+                    )
+                    for row in range(start, end)
+                ]
+                results.append(CommonFormat(
+                    image_width=int(self.image_widths[image_index]),
+                    image_height=int(self.image_heights[image_index]),
+                    bounding_boxes=bounding_boxes,
+                    class_names=class_names,
+                    image_filename=self.image_filenames[image_index]
+                ))
+        return results
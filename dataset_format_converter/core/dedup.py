@@ -0,0 +1,49 @@
+"""
+重复框删除 - 转换过程中删除同一图片内同一类别的重复/近似重复边界框
+
+合并多个标注来源时常出现重复框。每个批次构建一次列式索引，以 图片×类别 为分组，
+在像素坐标上对整个批次做一次旋转框 NMS（见 geometry_utils.rotated_nms）。
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+from .common_format import CommonFormat
+from .dataset_index import DatasetIndex
+from .geometry_utils import rotated_nms
+
+
+def deduplicate(common_data_list: List[CommonFormat], iou_threshold: float) -> Tuple[List[CommonFormat], int]:
+    """
+    删除一个批次中的重复框
+
+    同一图片、同一类别中与保留框的 IoU 不小于阈值的框被删除；有置信度时保留置信度高的框，
+    否则保留先出现的框。
+
+    Args:
+        common_data_list: 中间格式数据列表
+        iou_threshold: IoU 阈值 (0, 1]
+
+    Returns:
+        Tuple[List[CommonFormat], int]: (去重后的中间格式数据（保留所有图片）, 删除的框数)
+    """
+    if not 0 < iou_threshold <= 1:
+        raise ValueError(f"iou_threshold must be in (0, 1], got {iou_threshold}")
+    if not common_data_list:
+        return common_data_list, 0
+
+    index = DatasetIndex(common_data_list, common_data_list[0].class_names)
+    if len(index) < 2:
+        return common_data_list, 0
+
+    pixel = index.corners.copy()
+    pixel[:, :, 0] *= index.image_widths[index.image_ids, None]
+    pixel[:, :, 1] *= index.image_heights[index.image_ids, None]
+    groups = index.image_ids.astype(np.int64) * (len(index.class_names) + 1) + index.class_ids
+
+    keep = rotated_nms(pixel, iou_threshold, scores=index.confidences, groups=groups)
+    removed = int(len(keep) - np.count_nonzero(keep))
+    if not removed:
+        return common_data_list, 0
+    return index.to_common_formats(keep, keep_empty=True), removed
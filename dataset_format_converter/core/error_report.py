@@ -0,0 +1,189 @@
+"""
+错误汇总 - 收集转换过程中逐文件的错误，按类型计数、保留样例、限流输出
+
+解析/写出/类别扫描的循环中，单个文件出错不会中断转换，只记录一条错误。
+数据集中有大量损坏文件时，逐条打印会刷屏并拖慢转换，因此：
+- 错误按 阶段/异常类型（如 parse/ValueError）分类计数，每类保留前几条样例
+- 输出级别可配置：all 逐条输出，sampled 每类只输出前 log_limit 条，quiet 不输出
+- 可选写出 JSONL 错误报告（每行一条错误），便于后续筛选和重新处理
+
+收集器保存在 contextvars 中，由 collect_errors() 在一次转换的范围内启用；
+未启用时 report_error() 与原来一样逐条输出警告。
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, field
+import contextvars
+import json
+from typing import Any, Dict, Iterator, List, Optional
+
+
+# 输出级别
+ERROR_LOG_LEVELS = ('all', 'sampled', 'quiet')
+
+# 各阶段的警告文字（{path} 为文件路径或归档成员，{message} 为错误信息）
+STAGE_MESSAGES = {
+    'parse': "处理文件 {path} 时出错: {message}",
+    'write': "生成文件 {path} 时出错: {message}",
+    'archive-parse': "处理归档成员 {path} 时出错: {message}",
+    'archive-write': "生成归档成员 {path} 时出错: {message}",
+    'class-scan': "读取文件 {path} 时出错: {message}",
+    'class-cache': "无法写入类别缓存 {path}: {message}",
+    'image-size': "{path}: {message}",
+    'image-size-read': "读取图片尺寸 {path} 时出错: {message}",
+    'image-read': "读取图片 {path} 时出错: {message}",
+    'image-missing': "找不到图片 {path}: {message}",
+    'classes-file': "读取classes.txt文件 {path} 失败: {message}",
+    'work-queue': "工作队列 {path}: {message}",
+}
+
+
+def _warning_text(stage: str, path: str, message: str) -> str:
+    """一条错误的警告文字"""
+    template = STAGE_MESSAGES.get(stage, "{path}: {message}")
+    return f"警告：{template.format(path=path, message=message)}"
+
+
+@dataclass
+class ErrorSummary:
+    """
+    错误汇总
+
+    Attributes:
+        total: 错误总数
+        counts: 各类错误的数量（"阶段/异常类型" -> 数量）
+        samples: 各类错误的样例（"阶段/异常类型" -> [{'path': ..., 'message': ...}]）
+    """
+    total: int = 0
+    counts: Dict[str, int] = field(default_factory=dict)
+    samples: Dict[str, List[Dict[str, str]]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return asdict(self)
+
+
+class ErrorCollector:
+    """
+    错误收集器
+
+    用法::
+
+        collector = ErrorCollector('sampled', report_path='errors.jsonl')
+        with collect_errors(collector):
+            ...  # 循环中调用 report_error()
+        summary = collector.summary
+    """
+
+    def __init__(self, log_level: str = 'sampled', log_limit: int = 10,
+                 max_samples: int = 5, report_path: Optional[str] = None):
+        """
+        初始化收集器
+
+        Args:
+            log_level: 输出级别（all / sampled / quiet）
+            log_limit: sampled 级别下每类错误最多输出的条数
+            max_samples: 每类错误保留的样例数
+            report_path: JSONL 错误报告路径（可选，第一条错误出现时创建）
+        """
+        if log_level not in ERROR_LOG_LEVELS:
+            raise ValueError(f"Unknown error log level: {log_level}")
+        if log_limit < 0 or max_samples < 0:
+            raise ValueError("log_limit and max_samples must not be negative")
+        self.log_level = log_level
+        self.log_limit = log_limit
+        self.max_samples = max_samples
+        self.report_path = report_path
+        self.summary = ErrorSummary()
+        self._report = None
+
+    def add(self, stage: str, path: str, error_type: str, message: str) -> None:
+        """
+        记录一条错误
+
+        Args:
+            stage: 出错的阶段（见 STAGE_MESSAGES）
+            path: 文件路径或归档成员
+            error_type: 错误类型（通常为异常类名）
+            message: 错误信息
+        """
+        key = f"{stage}/{error_type}"
+        count = self.summary.counts.get(key, 0) + 1
+        self.summary.counts[key] = count
+        self.summary.total += 1
+        samples = self.summary.samples.setdefault(key, [])
+        if len(samples) < self.max_samples:
+            samples.append({'path': path, 'message': message})
+
+        if self.log_level == 'all' or (self.log_level == 'sampled' and count <= self.log_limit):
+            print(_warning_text(stage, path, message))
+        elif self.log_level == 'sampled' and count == self.log_limit + 1:
+            print(f"警告：{key} 类错误超过 {self.log_limit} 条，后续同类错误不再逐条输出")
+
+        if self.report_path is not None:
+            if self._report is None:
+                self._report = open(self.report_path, 'w', encoding='utf-8')
+            record = {'stage': stage, 'type': error_type, 'path': path, 'message': message}
+            self._report.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def close(self) -> None:
+        """关闭错误报告（没有错误时也写出一个空的报告，避免残留上一次的报告）"""
+        if self.report_path is None:
+            return
+        if self._report is None:
+            self._report = open(self.report_path, 'w', encoding='utf-8')
+        self._report.close()
+
+
+_collector: contextvars.ContextVar = contextvars.ContextVar('error_collector', default=None)
+
+
+@contextmanager
+def collect_errors(collector: ErrorCollector) -> Iterator[ErrorCollector]:
+    """
+    在上下文范围内将 report_error() 记录到收集器中（退出时关闭错误报告）
+
+    收集器保存在 contextvars 中，只对当前线程/协程生效；
+    进程池中的任务需要将错误带回主进程后再记录（见 core/class_discovery.py）。
+
+    Args:
+        collector: 错误收集器
+
+    Yields:
+        ErrorCollector: 错误收集器
+    """
+    token = _collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _collector.reset(token)
+        collector.close()
+
+
+def record_error(stage: str, path: str, error_type: str, message: str) -> None:
+    """
+    记录一条错误（未启用收集器时直接输出警告）
+
+    Args:
+        stage: 出错的阶段（见 STAGE_MESSAGES）
+        path: 文件路径或归档成员
+        error_type: 错误类型
+        message: 错误信息
+    """
+    collector = _collector.get()
+    if collector is None:
+        print(_warning_text(stage, path, message))
+    else:
+        collector.add(stage, path, error_type, message)
+
+
+def report_error(stage: str, path: Any, error: BaseException) -> None:
+    """
+    记录一个异常（错误类型为异常类名）
+
+    Args:
+        stage: 出错的阶段（见 STAGE_MESSAGES）
+        path: 文件路径或归档成员
+        error: 异常
+    """
+    record_error(stage, str(path), type(error).__name__, str(error))
@@ -2,10 +2,117 @@
 格式管理器 - 管理所有支持的格式并执行转换
 """
 
-from typing import List, Dict, Type, Optional
-from .base_format import BaseFormat
-from .common_format import CommonFormat
+from typing import Callable, Iterator, List, Dict, Set, Type, Optional
+from .base_format import BaseFormat, DatasetWriter, ParseStats
+from .common_format import CommonFormat, validation_level, precision_mode, defer_range_check
+from .class_table import ClassTable
+from .checkpoint import CheckpointJournal
+from .conversion_result import ConversionResult
+from .work_queue import WorkQueue, shard_for
+from .archive_io import ArchiveReader, ArchiveWriter, is_archive_path
+from .session import ConversionSession
+from .validation import ValidationReport, validate
+from .dataset_index import DatasetIndex
+from .class_mapping import ClassMapping
+from .split import DatasetSplitter, SplitDatasetWriter
+from .statistics import DatasetStatistics
+from .lint import LintReport, lint_paths
+from .class_discovery import discover_class_names
+from .dedup import deduplicate
+from .corner_order import canonicalize
+from .clipping import clip_to_image
+from .tiling import ImageTiler, crop_tiles
+from .image_utils import find_image_file, read_image_size
+from .geometry_utils import obb_fit_mode
+from .progress import ConversionProgress, ProgressTracker
+from .preview import AnnotationPreview
+from .planner import ConversionPlan, plan_conversion
+from .error_report import ErrorCollector, collect_errors, record_error, report_error
+import itertools
 import os
+import threading
+import time
+
+import numpy as np
+
+
+def _lease_renewer(queue: WorkQueue, batch_id: int, worker_id: str) -> Callable[[], None]:
+    """
+    创建批次续租回调：转换过程中频繁调用，距上次续租超过租约时间的四分之一时才续租
+
+    批次的转换时间超过租约时间时，若不续租，批次会被其他工作进程重新租用并重复转换。
+
+    Args:
+        queue: 工作队列
+        batch_id: 批次ID
+        worker_id: 工作进程标识
+
+    Returns:
+        Callable[[], None]: 续租回调
+    """
+    interval = queue.lease_timeout / 4
+    renewed_at = time.time()
+    lost = False
+
+    def heartbeat() -> None:
+        nonlocal renewed_at, lost
+        now = time.time()
+        if lost or now - renewed_at < interval:
+            return
+        renewed_at = now
+        if not queue.renew(batch_id, worker_id):
+            lost = True
+            record_error('work-queue', f"{queue.db_path}#{batch_id}", 'LeaseLost',
+                         "批次的租约已过期，可能已被其他工作进程重新租用")
+
+    return heartbeat
+
+
+def _with_heartbeat(records: Iterator[CommonFormat], heartbeat: Callable[[], None]) -> Iterator[CommonFormat]:
+    """在数据流的每条记录之后调用回调（一块的解析可能耗时很长）"""
+    for common_data in records:
+        heartbeat()
+        yield common_data
+
+
+def _apply_stages(common_data_list: List[CommonFormat], class_names: ClassTable,
+                  result: Optional[ConversionResult] = None,
+                  clip_mode: Optional[str] = None,
+                  class_mapping: Optional[ClassMapping] = None,
+                  canonical_order: bool = False,
+                  dedup_iou: Optional[float] = None) -> List[CommonFormat]:
+    """
+    依次执行中间格式上的处理步骤：裁剪 -> 类别映射 -> 统一角点顺序 -> 删除重复框
+
+    须在解析所用的校验级别和精度设置下调用（裁剪依赖 defer_range_check）。
+
+    Args:
+        common_data_list: 中间格式数据列表
+        class_names: 数据使用的类别表（类别映射的源类别表）
+        result: 待累计裁剪、重排和删除数量的转换结果（可选）
+        clip_mode: 跨越图片边界的框的裁剪方式（可选，见 core/clipping.py）
+        class_mapping: 类别映射（可选）
+        canonical_order: 是否统一角点顺序
+        dedup_iou: 重复框删除的 IoU 阈值（可选）
+
+    Returns:
+        List[CommonFormat]: 处理后的中间格式数据列表
+    """
+    if clip_mode is not None:
+        common_data_list, clip_stats = clip_to_image(common_data_list, clip_mode)
+        if result is not None:
+            result.clipping.merge(clip_stats)
+    if class_mapping is not None:
+        common_data_list = class_mapping.apply(common_data_list, class_names)
+    if canonical_order:
+        common_data_list, reordered = canonicalize(common_data_list)
+        if result is not None:
+            result.reordered_boxes += reordered
+    if dedup_iou is not None:
+        common_data_list, removed = deduplicate(common_data_list, dedup_iou)
+        if result is not None:
+            result.duplicate_boxes += removed
+    return common_data_list
 
 
 class FormatManager:
@@ -50,6 +157,12 @@ class FormatManager:
             self.register_format(PascalVOCFormat())
         except ImportError:
             pass
+        
+        try:
+            from ..formats.coco import COCOFormat
+            self.register_format(COCOFormat())
+        except ImportError:
+            pass
     
     def register_format(self, format_instance: BaseFormat) -> None:
         """
@@ -145,7 +258,14 @@ class FormatManager:
                     input_format: str, output_format: str,
                     image_width: int, image_height: int,
                     class_names: Optional[List[str]] = None, 
-                    verbose: bool = False) -> None:
+                    verbose: bool = False,
+                    validation: str = 'strict',
+                    precision: str = 'float64',
+                    class_mapping: Optional[ClassMapping] = None,
+                    clip_mode: Optional[str] = None,
+                    dedup_iou: Optional[float] = None,
+                    canonical_order: bool = False,
+                    obb_fit: str = 'edges') -> None:
         """
         转换单个文件
         
@@ -157,6 +277,13 @@ class FormatManager:
             image_width: 图片宽度
             image_height: 图片高度
             class_names: 类别名称列表（可选）
+            validation: 校验级别（strict / clip-only / trusted）
+            precision: 中间层坐标精度（float64 / float32）
+            class_mapping: 类别映射（可选）
+            clip_mode: 跨越图片边界的框的裁剪方式（可选，polygon / min-area，见 core/clipping.py）
+            dedup_iou: 重复框删除的 IoU 阈值（可选，同一类别中 IoU 不小于该值的框只保留一个）
+            canonical_order: 是否统一角点顺序（顺时针，从左上角开始，见 canonicalize_corners）
+            obb_fit: 参数化 OBB 输出格式（如 LabelImg-OBB）的拟合方式（edges / min-area）
         """
         # 获取格式实例
         input_fmt = self.get_format(input_format)
@@ -170,19 +297,164 @@ class FormatManager:
             self.output_verbose(input_format, output_format, image_width, image_height, class_names)
        
         
-        common_data = input_fmt.format2commonSolo(input_file, image_width, image_height, class_names)
+        with validation_level(validation), precision_mode(precision), defer_range_check(clip_mode is not None):
+            common_data = input_fmt.format2commonSolo(input_file, image_width, image_height, class_names)
+            common_data = _apply_stages([common_data], common_data.class_names, None, clip_mode,
+                                        class_mapping, canonical_order, dedup_iou)[0]
         
         # 步骤2：中间格式 -> 输出格式
-        output_fmt.common2formatSolo(common_data, output_file)
+        with obb_fit_mode(obb_fit):
+            output_fmt.common2formatSolo(common_data, output_file)
+    
+    def create_session(self, input_format: str, output_format: str,
+                       image_width: int, image_height: int,
+                       class_names: Optional[List[str]] = None,
+                       image_dir: Optional[str] = None,
+                       validation: str = 'strict',
+                       precision: str = 'float64',
+                       obb_fit: str = 'edges') -> ConversionSession:
+        """
+        创建可复用的转换会话，用于高频率的逐文件转换
+        
+        Args:
+            input_format: 输入格式名称
+            output_format: 输出格式名称
+            image_width: 默认图片宽度
+            image_height: 默认图片高度
+            class_names: 类别名称列表（可选）
+            image_dir: 图片目录（可选，用于读取每张图片的实际尺寸）
+            validation: 校验级别（strict / clip-only / trusted）
+            precision: 中间层坐标精度（float64 / float32）
+            obb_fit: 参数化 OBB 输出格式（如 LabelImg-OBB）的拟合方式（edges / min-area）
+            
+        Returns:
+            ConversionSession: 转换会话
+        """
+        return ConversionSession(
+            self.get_format(input_format), self.get_format(output_format),
+            image_width, image_height, class_names, image_dir, validation, precision, obb_fit
+        )
+    
+    def _convert_batch(self, input_fmt: BaseFormat, writer: DatasetWriter,
+                       input_dir: str, batch: List[str],
+                       image_width: int, image_height: int,
+                       class_names: Optional[List[str]],
+                       result: ConversionResult,
+                       validation: str = 'strict',
+                       precision: str = 'float64',
+                       class_mapping: Optional[ClassMapping] = None,
+                       statistics: Optional[DatasetStatistics] = None,
+                       clip_mode: Optional[str] = None,
+                       dedup_iou: Optional[float] = None,
+                       canonical_order: bool = False,
+                       obb_fit: str = 'edges',
+                       tracker: Optional[ProgressTracker] = None,
+                       chunk_size: int = 256,
+                       heartbeat: Optional[Callable[[], None]] = None) -> Set[str]:
+        """
+        转换一个批次的文件并累计结果
+        
+        解析结果按 chunk_size 条记录分块处理和写出，单文件数据集（如 COCO）的
+        一个文件包含整个数据集时，不会同时在内存中保留全部图片的中间格式对象。
+        
+        Args:
+            input_fmt: 输入格式实例
+            writer: 输出数据集写入器
+            input_dir: 输入目录
+            batch: 批次中的输入文件路径
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表
+            result: 待累计的转换结果
+            validation: 校验级别（strict / clip-only / trusted）
+            precision: 中间层坐标精度（float64 / float32）
+            class_mapping: 类别映射（可选）
+            statistics: 待累计的数据集统计（可选）
+            clip_mode: 跨越图片边界的框的裁剪方式（可选，polygon / min-area，见 core/clipping.py）
+            dedup_iou: 重复框删除的 IoU 阈值（可选）
+            canonical_order: 是否统一角点顺序（顺时针，从左上角开始，见 canonicalize_corners）
+            obb_fit: 参数化 OBB 输出格式（如 LabelImg-OBB）的拟合方式（edges / min-area）
+            tracker: 进度累计器（可选）
+            chunk_size: 每块处理和写出的记录数
+            heartbeat: 每解析一条记录和每块写出后调用的回调（可选，工作队列模式下用于续租批次）
+            
+        Returns:
+            Set[str]: 写出失败的记录的图片文件名（不应记为已完成）
+        """
+        stats = ParseStats()
+        write_failed: Set[str] = set()
+        records = input_fmt.iter_format2common(batch, image_width, image_height, class_names, stats)
+        if heartbeat is not None:
+            records = _with_heartbeat(records, heartbeat)
+        while True:
+            # 解析在读取数据流时惰性进行，校验级别需覆盖读取这一步
+            with validation_level(validation), precision_mode(precision), defer_range_check(clip_mode is not None):
+                common_data_list = list(itertools.islice(records, chunk_size))
+                if not common_data_list:
+                    break
+                common_data_list = _apply_stages(common_data_list, class_names, result, clip_mode,
+                                                 class_mapping, canonical_order, dedup_iou)
+            with obb_fit_mode(obb_fit):
+                failed = writer.write_batch(common_data_list)
+            if failed:
+                write_failed.update(common_data.image_filename or '' for common_data in failed)
+                failed_ids = set(map(id, failed))
+                common_data_list = [c for c in common_data_list if id(c) not in failed_ids]
+            if statistics is not None:
+                statistics.update(common_data_list)
+            result.records += len(common_data_list)
+            if tracker is not None:
+                boxes = sum(len(common_data.bounding_boxes) for common_data in common_data_list)
+                tracker.advance(0, boxes, records=len(common_data_list))
+            if heartbeat is not None:
+                heartbeat()
+        
+        # 文件数和记录数分别统计（单文件数据集的一个输入文件会产生多条记录）；
+        # 写出失败的记录按失败的文件计
+        failed_files = stats.failed_files + len(write_failed)
+        result.converted_files += stats.parsed_files - len(write_failed)
+        result.failed_files += failed_files
+        if tracker is not None:
+            tracker.advance(len(batch), failed=failed_files)
+        return write_failed
     
     def convert_directory(self, input_dir: str, output_dir: str,
                          input_format: str, output_format: str,
                          image_width: int, image_height: int,
                          class_names: Optional[List[str]] = None,
-                         verbose: bool = False) -> None:
+                         verbose: bool = False,
+                         resume: bool = False,
+                         batch_size: int = 256,
+                         shard_index: int = 0,
+                         shard_count: int = 1,
+                         work_queue: Optional[str] = None,
+                         worker_id: Optional[str] = None,
+                         lease_timeout: float = 600.0,
+                         max_attempts: int = 3,
+                         validation: str = 'strict',
+                         precision: str = 'float64',
+                         class_mapping: Optional[ClassMapping] = None,
+                         splitter: Optional[DatasetSplitter] = None,
+                         image_dir: Optional[str] = None,
+                         collect_statistics: bool = False,
+                         clip_mode: Optional[str] = None,
+                         dedup_iou: Optional[float] = None,
+                         canonical_order: bool = False,
+                         obb_fit: str = 'edges',
+                         progress: Optional[Callable[[ConversionProgress], None]] = None,
+                         error_collector: Optional[ErrorCollector] = None) -> ConversionResult:
         """
         转换整个目录
         
+        文件按批次转换，每个批次完成后记录到输出目录中的断点续传日志。
+        
+        支持两种多进程/多机模式：
+        - 分片：按文件名哈希将输入划分为 shard_count 份，只转换第 shard_index 份
+        - 工作队列：多个进程从同一个 SQLite 队列中租用批次，队列本身即记录进度
+        
+        多个进程协同转换时，类别名称列表在每个进程中独立确定，建议通过
+        class_names 显式指定，以保证各进程输出的类别ID一致。
+        
         Args:
             input_dir: 输入目录
             output_dir: 输出目录
@@ -191,24 +463,689 @@ class FormatManager:
             image_width: 图片宽度
             image_height: 图片高度
             class_names: 类别名称列表（可选）
+            resume: 是否从断点续传（跳过日志中已完成且输出存在的文件）
+            batch_size: 每批转换的文件数（也是每块处理和写出的最大记录数）
+            shard_index: 分片索引（0 ~ shard_count-1）
+            shard_count: 分片总数（1 表示不分片）
+            work_queue: SQLite 工作队列文件路径（可选）
+            worker_id: 工作进程标识（可选，默认为 主机名:进程号）
+            lease_timeout: 工作队列的租约超时时间（秒）
+            max_attempts: 工作队列中每个批次最多租用的次数，超过后标记为 failed
+            validation: 校验级别（strict / clip-only / trusted）
+            precision: 中间层坐标精度（float64 / float32）
+            class_mapping: 类别映射（可选，筛选/合并/重命名类别，输出的类别表文件随之重新生成）
+            splitter: 数据集划分器（可选，标注写入 output_dir/<划分>/labels）
+            image_dir: 图片目录（可选，启用划分时图片硬链接到 output_dir/<划分>/images）
+            collect_statistics: 是否在转换过程中统计输出数据集（结果见 ConversionResult.statistics）
+            clip_mode: 跨越图片边界的框的裁剪方式（可选，polygon / min-area，见 core/clipping.py）
+            dedup_iou: 重复框删除的 IoU 阈值（可选，同一图片同一类别中 IoU 不小于该值的框只保留一个）
+            canonical_order: 是否统一角点顺序（顺时针，从左上角开始，见 canonicalize_corners）
+            obb_fit: 参数化 OBB 输出格式（如 LabelImg-OBB）的拟合方式（edges / min-area）
+            progress: 进度回调（可选，在转换线程中于开始时和每个批次完成后调用，见 core/progress.py）
+            error_collector: 错误收集器（可选，配置输出级别和 JSONL 错误报告，默认每类错误只输出前几条）
+            
+        Returns:
+            ConversionResult: 转换结果统计（工作队列模式下只统计本进程处理的文件）
         """
         # 获取格式实例
         input_fmt = self.get_format(input_format)
         output_fmt = self.get_format(output_format)
-        # 步骤1：输入格式 -> 中间格式（批量）
-        if class_names is None:
-            if os.path.exists(input_dir) and os.path.isdir(input_dir):
-                class_names = input_fmt._get_class_names([os.path.join(input_dir, f) for f in os.listdir(input_dir) if f.endswith(input_fmt.file_extension)])
-            else:
-                raise ValueError(f"Input directory {input_dir} is not a valid directory")
+        
+        if not (os.path.exists(input_dir) and os.path.isdir(input_dir)):
+            raise ValueError(f"Input directory {input_dir} is not a valid directory")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        if shard_count <= 0 or not 0 <= shard_index < shard_count:
+            raise ValueError(f"Invalid shard {shard_index} of {shard_count}")
+        if work_queue is not None and shard_count > 1:
+            raise ValueError("work_queue and sharding cannot be used together")
+        if output_fmt.SINGLE_FILE_DATASET and (resume or shard_count > 1 or work_queue is not None):
+            raise ValueError(f"{output_format} output does not support resume, sharding or work_queue")
+        # 单文件数据集输入的输出按记录（图片）命名，无法由输入文件名判断是否已完成
+        if input_fmt.SINGLE_FILE_DATASET and resume:
+            raise ValueError(f"{input_format} input does not support resume")
+        if splitter is not None and (resume or shard_count > 1 or work_queue is not None):
+            raise ValueError("Dataset splitting does not support resume, sharding or work_queue")
+        
+        # 逐文件错误按类型汇总（见 core/error_report.py），结果中的 errors 随转换实时更新
+        errors = error_collector if error_collector is not None else ErrorCollector()
+        with collect_errors(errors):
+            input_files = input_fmt.list_input_files(input_dir)
+        
+            # 步骤1：确定类别名称列表（基于完整的输入列表，保证各分片一致）
+            if class_names is None:
+                class_names = input_fmt._get_class_names(input_files)
+            class_names = ClassTable.of(class_names)
+            if class_mapping is not None:
+                # 基于完整的源类别表预先确定输出类别表的顺序，保证各批次/各进程一致
+                class_mapping.lut_for(class_names)
+            # 统计的是写出的数据，启用类别映射时使用输出类别表
+            statistics = None
+            if collect_statistics:
+                statistics = DatasetStatistics(class_mapping.output_class_names if class_mapping is not None else class_names)
          
-        if verbose:
-            self.output_verbose(input_format, output_format, image_width, image_height, class_names)    
+            if verbose:
+                self.output_verbose(input_format, output_format, image_width, image_height, class_names)    
+        
+            # 工作队列模式：从队列中租用批次直到队列为空
+            if work_queue is not None:
+                result = ConversionResult(total_files=len(input_files), errors=errors.summary)
+                # 总数为整个队列的文件数，已完成数只包含本进程处理的文件
+                tracker = ProgressTracker(len(input_files), progress) if progress is not None else None
+                queue = WorkQueue(work_queue, lease_timeout=lease_timeout, max_attempts=max_attempts)
+                worker_id = worker_id or WorkQueue.default_worker_id()
+                writer = output_fmt.open_dataset_writer(output_dir)
+                try:
+                    queue.populate([os.path.basename(f) for f in input_files], batch_size)
+                    while True:
+                        leased = queue.lease(worker_id)
+                        if leased is None:
+                            break
+                        batch_id, file_names = leased
+                        batch = [os.path.join(input_dir, name) for name in file_names]
+                        try:
+                            write_failed = self._convert_batch(
+                                input_fmt, writer, input_dir, batch,
+                                image_width, image_height, class_names, result,
+                                validation, precision, class_mapping, statistics, clip_mode,
+                                dedup_iou, canonical_order, obb_fit, tracker, batch_size,
+                                _lease_renewer(queue, batch_id, worker_id)
+                            )
+                        except BaseException:
+                            queue.release(batch_id, worker_id)
+                            raise
+                        # 写出失败的批次可能留下不完整的输出，不记为已完成
+                        if write_failed:
+                            queue.fail(batch_id, worker_id)
+                        else:
+                            queue.complete(batch_id, worker_id)
+                    failed_batches = queue.progress()[WorkQueue.FAILED]
+                    if failed_batches:
+                        record_error('work-queue', work_queue, 'FailedBatches',
+                                     f"{failed_batches} 个批次有文件写出失败或租用 {max_attempts} 次仍未完成，已标记为 failed")
+                finally:
+                    writer.close()
+                    queue.close()
+                if statistics is not None:
+                    result.statistics = statistics.to_dict()
+                return result
+        
+            # 分片模式：确定性哈希划分，每个分片使用独立的日志文件
+            journal_name = CheckpointJournal.JOURNAL_FILENAME
+            if shard_count > 1:
+                input_files = [f for f in input_files
+                               if shard_for(os.path.basename(f), shard_count) == shard_index]
+                journal_name = f"{journal_name}.shard{shard_index}-of-{shard_count}"
+            result = ConversionResult(total_files=len(input_files), errors=errors.summary)
+        
+            # 断点续传：跳过已记录且输出文件存在的输入文件
+            journal = CheckpointJournal(output_dir, journal_name)
+            if resume:
+                completed = journal.load()
+                pending_files = []
+                for file_path in input_files:
+                    file_name = os.path.basename(file_path)
+                    stem = os.path.splitext(file_name)[0]
+                    output_path = os.path.join(output_dir, f"{stem}{output_fmt.file_extension}")
+                    if file_name in completed and os.path.exists(output_path):
+                        result.skipped_files += 1
+                    else:
+                        pending_files.append(file_path)
+            else:
+                journal.reset()
+                pending_files = input_files
+        
+            # 步骤2：按批次执行 输入格式 -> 中间格式 -> 输出格式
+            tracker = ProgressTracker(len(pending_files), progress) if progress is not None else None
+            if splitter is not None:
+                writer = SplitDatasetWriter(output_fmt, output_dir, splitter, image_dir)
+            else:
+                writer = output_fmt.open_dataset_writer(output_dir)
+            try:
+                for start in range(0, len(pending_files), batch_size):
+                    batch = pending_files[start:start + batch_size]
+                    write_failed = self._convert_batch(input_fmt, writer, input_dir, batch,
+                                                       image_width, image_height, class_names, result,
+                                                       validation, precision, class_mapping, statistics, clip_mode,
+                                                       dedup_iou, canonical_order, obb_fit, tracker, batch_size)
+                    # 写出失败的文件可能留下不完整的输出，不记为已完成，续传时重新转换
+                    journal.record(os.path.basename(file_path) for file_path in batch
+                                   if os.path.splitext(os.path.basename(file_path))[0] not in write_failed)
+            finally:
+                writer.close()
+        
+            if splitter is not None:
+                result.split_counts = dict(writer.split_counts)
+            if statistics is not None:
+                result.statistics = statistics.to_dict()
+            return result
+    
+    def convert_archive(self, input_path: str, output_path: str,
+                        input_format: str, output_format: str,
+                        image_width: int, image_height: int,
+                        class_names: Optional[List[str]] = None,
+                        verbose: bool = False,
+                        batch_size: int = 256,
+                        validation: str = 'strict',
+                        precision: str = 'float64',
+                        class_mapping: Optional[ClassMapping] = None,
+                        collect_statistics: bool = False,
+                        clip_mode: Optional[str] = None,
+                        dedup_iou: Optional[float] = None,
+                        canonical_order: bool = False,
+                        obb_fit: str = 'edges',
+                        error_collector: Optional[ErrorCollector] = None) -> ConversionResult:
+        """
+        以归档作为输入和/或输出进行转换
+        
+        输入归档中的成员按顺序流式读取，不解压到磁盘；输出为归档时，
+        转换结果直接作为成员写入归档。输入或输出也可以是普通目录。
+        
+        Args:
+            input_path: 输入归档（tar/zip）或目录
+            output_path: 输出归档（tar/zip）或目录
+            input_format: 输入格式名称
+            output_format: 输出格式名称
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（可选）
+            batch_size: 每批写出的记录数
+            validation: 校验级别（strict / clip-only / trusted）
+            precision: 中间层坐标精度（float64 / float32）
+            class_mapping: 类别映射（可选，筛选/合并/重命名类别，输出的类别表文件随之重新生成）
+            collect_statistics: 是否在转换过程中统计输出数据集（结果见 ConversionResult.statistics）
+            clip_mode: 跨越图片边界的框的裁剪方式（可选，polygon / min-area，见 core/clipping.py）
+            dedup_iou: 重复框删除的 IoU 阈值（可选，同一图片同一类别中 IoU 不小于该值的框只保留一个）
+            canonical_order: 是否统一角点顺序（顺时针，从左上角开始，见 canonicalize_corners）
+            obb_fit: 参数化 OBB 输出格式（如 LabelImg-OBB）的拟合方式（edges / min-area）
+            error_collector: 错误收集器（可选，配置输出级别和 JSONL 错误报告，默认每类错误只输出前几条）
+            
+        Returns:
+            ConversionResult: 转换结果统计
+        """
+        input_fmt = self.get_format(input_format)
+        output_fmt = self.get_format(output_format)
+        
+        input_is_archive = is_archive_path(input_path)
+        output_is_archive = is_archive_path(output_path)
+        if not (input_is_archive or output_is_archive):
+            raise ValueError("Either input_path or output_path must be an archive")
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        
+        # 逐文件错误按类型汇总（见 core/error_report.py），结果中的 errors 随转换实时更新
+        errors = error_collector if error_collector is not None else ErrorCollector()
+        result = ConversionResult(errors=errors.summary)
+        with collect_errors(errors):
+            # 步骤1：确定类别名称列表，构造中间格式数据流
+            parse_stats = ParseStats()
+            write_failures = 0
+            if input_is_archive:
+                if class_names is None:
+                    # 只查找归档中的 classes.txt；否则由解析过程动态扩展类别列表
+                    data = ArchiveReader(input_path).read_member("classes.txt")
+                    class_names = ClassTable()
+                    if data is not None:
+                        class_names = ClassTable(line.strip() for line in data.decode('utf-8').splitlines() if line.strip())
+                class_names = ClassTable.of(class_names)
+                common_stream = input_fmt.iter_format2common_archive(input_path, image_width, image_height,
+                                                                     class_names, parse_stats)
+            else:
+                if not os.path.isdir(input_path):
+                    raise ValueError(f"Input directory {input_path} is not a valid directory")
+                input_files = input_fmt.list_input_files(input_path)
+                result.total_files = len(input_files)
+                if class_names is None:
+                    class_names = input_fmt._get_class_names(input_files)
+                class_names = ClassTable.of(class_names)
+                common_stream = input_fmt.iter_format2common(input_files, image_width, image_height,
+                                                             class_names, parse_stats)
+        
+            if verbose:
+                self.output_verbose(input_format, output_format, image_width, image_height, class_names)
+        
+            statistics = None
+            if collect_statistics:
+                statistics = DatasetStatistics(class_mapping.output_class_names if class_mapping is not None else class_names)
+        
+            # 步骤2：按批次写出
+            if output_is_archive:
+                archive_writer = ArchiveWriter(output_path)
+                dataset_writer = None
+            else:
+                archive_writer = None
+                dataset_writer = output_fmt.open_dataset_writer(output_path)
+            try:
+                while True:
+                    # 解析在读取数据流时惰性进行，校验级别只需覆盖这一步
+                    with validation_level(validation), precision_mode(precision), \
+                            defer_range_check(clip_mode is not None):
+                        batch = list(itertools.islice(common_stream, batch_size))
+                        batch = _apply_stages(batch, class_names, result, clip_mode,
+                                              class_mapping, canonical_order, dedup_iou)
+                    if not batch:
+                        break
+                    with obb_fit_mode(obb_fit):
+                        if archive_writer is not None:
+                            failed = output_fmt._write_archive_members(batch, archive_writer)
+                        else:
+                            failed = dataset_writer.write_batch(batch)
+                    if failed:
+                        write_failures += len(failed)
+                        failed_ids = set(map(id, failed))
+                        batch = [common_data for common_data in batch if id(common_data) not in failed_ids]
+                    if statistics is not None:
+                        statistics.update(batch)
+                    result.records += len(batch)
+            
+                # 辅助文件最后写入一次，此时类别列表已包含解析中新增的类别
+                if archive_writer is not None and result.records:
+                    output_class_names = class_mapping.output_class_names if class_mapping is not None else class_names
+                    output_fmt._write_archive_sidecars(output_class_names, archive_writer)
+            finally:
+                if archive_writer is not None:
+                    archive_writer.close()
+                else:
+                    dataset_writer.close()
+        
+            result.converted_files = parse_stats.parsed_files - write_failures
+            result.failed_files = parse_stats.failed_files + write_failures
+            if input_is_archive:
+                result.total_files = parse_stats.parsed_files + parse_stats.failed_files
+            if statistics is not None:
+                result.statistics = statistics.to_dict()
+            return result
+    
+    def validate_directory(self, input_dir: str, input_format: str,
+                           image_width: int, image_height: int,
+                           class_names: Optional[List[str]] = None,
+                           tolerance: float = 1e-6) -> ValidationReport:
+        """
+        校验整个目录：以 trusted 级别解析（保留原始坐标），再一次性报告所有违规项
+        
+        Args:
+            input_dir: 输入目录
+            input_format: 输入格式名称
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（可选）
+            tolerance: 坐标范围检查允许的误差
+            
+        Returns:
+            ValidationReport: 校验报告
+        """
+        input_fmt = self.get_format(input_format)
+        if not os.path.isdir(input_dir):
+            raise ValueError(f"Input directory {input_dir} is not a valid directory")
+        
+        input_files = input_fmt.list_input_files(input_dir)
+        if class_names is None:
+            class_names = input_fmt._get_class_names(input_files)
+        
+        with validation_level('trusted'):
+            common_data_list = input_fmt.format2commonMulti(
+                input_dir, image_width, image_height, class_names, file_paths=input_files
+            )
+        return validate(common_data_list, tolerance)
+    
+    def lint(self, input_path: str, input_format: str,
+             image_width: int, image_height: int,
+             class_names: Optional[List[str]] = None,
+             tolerance: float = 1e-6,
+             workers: Optional[int] = None,
+             chunk_size: int = 256) -> LintReport:
+        """
+        检查目录（或单个文件）中的标注问题，不写出任何文件
+        
+        检查项见 lint.LINT_CODES。文件分块后在进程池中并行检查，
+        诊断按文件顺序和行号排列。
         
-        common_data_list = input_fmt.format2commonMulti(input_dir, image_width, image_height, class_names)
+        Args:
+            input_path: 输入目录或文件
+            input_format: 输入格式名称
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（可选，指定时检查未知类别）
+            tolerance: 坐标范围检查允许的误差（归一化坐标）
+            workers: 工作进程数（默认为CPU核数，1 表示在当前进程中执行）
+            chunk_size: 每个任务检查的文件数
+            
+        Returns:
+            LintReport: lint 报告
+        """
+        input_fmt = self.get_format(input_format)
+        if os.path.isdir(input_path):
+            file_paths = input_fmt.list_input_files(input_path)
+        elif os.path.isfile(input_path):
+            file_paths = [input_path]
+        else:
+            raise ValueError(f"Input path {input_path} does not exist")
+        
+        return lint_paths(input_fmt, file_paths, image_width, image_height, class_names,
+                          tolerance, workers, chunk_size)
+    
+    def discover_class_names(self, input_path: str, input_format: str,
+                             workers: Optional[int] = None,
+                             use_cache: bool = True,
+                             cancel: Optional[threading.Event] = None,
+                             progress: Optional[Callable[[int, int], None]] = None) -> Optional[List[str]]:
+        """
+        发现目录（或单个文件）中的完整类别表
+        
+        目录中有 classes.txt 或格式未定义 CLASS_NAME_PATTERN 时与 _get_class_names 相同；
+        否则并行扫描全部文件（见 class_discovery.discover_class_names），结果按目录缓存。
+        
+        Args:
+            input_path: 输入目录或文件
+            input_format: 输入格式名称
+            workers: 工作进程数（默认为CPU核数，1 表示在当前进程中执行）
+            use_cache: 是否使用类别缓存
+            cancel: 取消事件（可选，置位后尽快结束）
+            progress: 扫描进度回调（可选），以 (已扫描文件数, 总文件数) 调用
+            
+        Returns:
+            Optional[List[str]]: 类别名称列表，被取消时返回None
+        """
+        input_fmt = self.get_format(input_format)
+        if os.path.isdir(input_path):
+            file_paths = input_fmt.list_input_files(input_path)
+            classes_file = os.path.join(input_path, "classes.txt")
+        elif os.path.isfile(input_path):
+            file_paths = [input_path]
+            classes_file = os.path.join(os.path.dirname(input_path), "classes.txt")
+        else:
+            raise ValueError(f"Input path {input_path} does not exist")
+        
+        if input_fmt.CLASS_NAME_PATTERN is None or os.path.isfile(classes_file):
+            return input_fmt._get_class_names(file_paths)
+        return discover_class_names(input_fmt, file_paths, workers, use_cache, cancel=cancel, progress=progress)
+    
+    def build_index(self, input_dir: str, input_format: str,
+                    image_width: int, image_height: int,
+                    class_names: Optional[List[str]] = None,
+                    validation: str = 'strict') -> DatasetIndex:
+        """
+        解析整个目录并构建数据集索引
+        
+        Args:
+            input_dir: 输入目录
+            input_format: 输入格式名称
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（可选）
+            validation: 校验级别（strict / clip-only / trusted）
+            
+        Returns:
+            DatasetIndex: 数据集索引
+        """
+        input_fmt = self.get_format(input_format)
+        if not os.path.isdir(input_dir):
+            raise ValueError(f"Input directory {input_dir} is not a valid directory")
+        
+        input_files = input_fmt.list_input_files(input_dir)
+        if class_names is None:
+            class_names = input_fmt._get_class_names(input_files)
+        class_names = ClassTable.of(class_names)
+        
+        with validation_level(validation):
+            common_data_list = input_fmt.format2commonMulti(
+                input_dir, image_width, image_height, class_names, file_paths=input_files
+            )
+        return DatasetIndex(common_data_list, class_names)
+    
+    def collect_statistics(self, input_path: str, input_format: str,
+                           image_width: int, image_height: int,
+                           class_names: Optional[List[str]] = None,
+                           batch_size: int = 256) -> DatasetStatistics:
+        """
+        只读统计一个数据集（目录或归档），不写出任何文件
+        
+        以 trusted 级别按批次解析，每个批次解析后立即累计并释放，内存占用与批次大小成正比。
+        
+        Args:
+            input_path: 输入目录或归档（tar/zip）
+            input_format: 输入格式名称
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（可选）
+            batch_size: 每批统计的记录数
+            
+        Returns:
+            DatasetStatistics: 数据集统计
+        """
+        input_fmt = self.get_format(input_format)
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        
+        if is_archive_path(input_path):
+            if class_names is None:
+                data = ArchiveReader(input_path).read_member("classes.txt")
+                class_names = ClassTable()
+                if data is not None:
+                    class_names = ClassTable(line.strip() for line in data.decode('utf-8').splitlines() if line.strip())
+            class_names = ClassTable.of(class_names)
+            common_stream = input_fmt.iter_format2common_archive(input_path, image_width, image_height, class_names)
+        else:
+            if not os.path.isdir(input_path):
+                raise ValueError(f"Input directory {input_path} is not a valid directory")
+            input_files = input_fmt.list_input_files(input_path)
+            if class_names is None:
+                class_names = input_fmt._get_class_names(input_files)
+            class_names = ClassTable.of(class_names)
+            common_stream = input_fmt.iter_format2common(input_files, image_width, image_height, class_names)
+        
+        statistics = DatasetStatistics(class_names)
+        with validation_level('trusted'):
+            while True:
+                batch = list(itertools.islice(common_stream, batch_size))
+                if not batch:
+                    break
+                statistics.update(batch)
+        return statistics
+    
+    def tile_dataset(self, input_dir: str, output_dir: str,
+                     input_format: str, output_format: str,
+                     image_width: int, image_height: int,
+                     class_names: Optional[List[str]] = None,
+                     tile_size: int = 1024,
+                     overlap: int = 200,
+                     min_visibility: float = 0.5,
+                     clip_mode: str = 'polygon',
+                     keep_empty: bool = False,
+                     image_dir: Optional[str] = None,
+                     image_output_dir: Optional[str] = None,
+                     validation: str = 'strict',
+                     obb_fit: str = 'edges',
+                     error_collector: Optional[ErrorCollector] = None) -> ConversionResult:
+        """
+        将大尺寸图片的标注切分为带重叠的切片后写出（见 core/tiling.py）
+        
+        输入文件逐个解析（指定 image_dir 时使用每张图片的实际尺寸），解析时推迟坐标范围检查，
+        图片外的部分由切片边界裁掉。切片标注通过输出格式的数据集写入器写出，
+        同时指定 image_dir 和 image_output_dir 时裁出对应的切片图片。
+        
+        Args:
+            input_dir: 输入目录
+            output_dir: 切片标注输出目录
+            input_format: 输入格式名称
+            output_format: 输出格式名称
+            image_width: 默认图片宽度
+            image_height: 默认图片高度
+            class_names: 类别名称列表（可选）
+            tile_size: 切片尺寸（像素）
+            overlap: 相邻切片的重叠（像素）
+            min_visibility: 被截断的框保留的最小可见比例
+            clip_mode: 被截断的框还原为四个角点的方式（polygon / min-area）
+            keep_empty: 是否输出没有框的切片
+            image_dir: 原图目录（可选，用于读取图片尺寸和裁出切片图片）
+            image_output_dir: 切片图片输出目录（可选）
+            validation: 校验级别（strict / clip-only / trusted）
+            obb_fit: 参数化 OBB 输出格式（如 LabelImg-OBB）的拟合方式（edges / min-area）
+            error_collector: 错误收集器（可选，配置输出级别和 JSONL 错误报告，默认每类错误只输出前几条）
+            
+        Returns:
+            ConversionResult: converted_files 为切分的原图文件数，tiles 为写出的切片数，
+            clipping 为被切片截断/丢弃的框的统计
+        """
+        input_fmt = self.get_format(input_format)
+        output_fmt = self.get_format(output_format)
+        if not os.path.isdir(input_dir):
+            raise ValueError(f"Input directory {input_dir} is not a valid directory")
+        tiler = ImageTiler(tile_size, overlap, min_visibility, clip_mode, keep_empty)
+        
+        errors = error_collector if error_collector is not None else ErrorCollector()
+        with collect_errors(errors):
+            input_files = input_fmt.list_input_files(input_dir)
+            if class_names is None:
+                class_names = input_fmt._get_class_names(input_files)
+            class_names = ClassTable.of(class_names)
+            result = ConversionResult(total_files=len(input_files), errors=errors.summary)
+            
+            writer = output_fmt.open_dataset_writer(output_dir)
+            try:
+                for file_path in input_files:
+                    # 解析需要实际的图片尺寸（像素坐标格式据此归一化）
+                    size = (image_width, image_height)
+                    if image_dir is not None:
+                        image_path = find_image_file(image_dir, os.path.splitext(os.path.basename(file_path))[0])
+                        if image_path is not None:
+                            try:
+                                size = read_image_size(image_path)
+                            except Exception as e:
+                                report_error('image-size-read', image_path, e)
+                    
+                    stats = ParseStats()
+                    with validation_level(validation), defer_range_check():
+                        common_data_list = input_fmt.format2commonMulti(
+                            input_dir, size[0], size[1], class_names, file_paths=[file_path], stats=stats
+                        )
+                    if stats.failed_files:
+                        result.failed_files += 1
+                        continue
+                    
+                    for common_data in common_data_list:
+                        tiles = tiler.tile(common_data)
+                        with obb_fit_mode(obb_fit):
+                            failed = writer.write_batch([tile_data for _, tile_data in tiles])
+                        result.tiles += len(tiles) - len(failed)
+                        result.records += 1
+                        if image_dir is not None and image_output_dir is not None:
+                            source_path = find_image_file(image_dir, common_data.image_filename or '')
+                            if source_path is None:
+                                record_error('image-missing', common_data.image_filename or '',
+                                             'FileNotFoundError', "跳过切片图片")
+                            else:
+                                crop_tiles(source_path, [tile for tile, _ in tiles], image_output_dir)
+                    result.converted_files += 1
+            finally:
+                writer.close()
+        
+        result.clipping = tiler.stats
+        return result
+    
+    def plan_conversion(self, input_path: str, output_path: str,
+                        input_format: str, output_format: str,
+                        image_width: int, image_height: int,
+                        class_names: Optional[List[str]] = None,
+                        image_dir: Optional[str] = None,
+                        sample_size: int = 200,
+                        seed: int = 0,
+                        validation: str = 'strict') -> ConversionPlan:
+        """
+        生成转换计划（试运行）：估计文件数、框数、输出大小和耗时，不写出任何文件
+        
+        见 core/planner.py。
+        
+        Args:
+            input_path: 输入目录或文件
+            output_path: 输出目录
+            input_format: 输入格式名称
+            output_format: 输出格式名称
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（可选）
+            image_dir: 图片目录（可选，读取样本图片的实际尺寸）
+            sample_size: 解析的样本文件数
+            seed: 抽样随机种子
+            validation: 校验级别（strict / clip-only / trusted）
+            
+        Returns:
+            ConversionPlan: 转换计划
+        """
+        input_fmt = self.get_format(input_format)
+        output_fmt = self.get_format(output_format)
+        if os.path.isdir(input_path):
+            file_paths = input_fmt.list_input_files(input_path)
+        elif os.path.isfile(input_path):
+            file_paths = [input_path]
+        else:
+            raise ValueError(f"Input path {input_path} does not exist")
+        return plan_conversion(input_fmt, output_fmt, file_paths, output_path, image_width, image_height,
+                               class_names, image_dir, sample_size, seed, validation)
+    
+    def open_preview(self, input_path: str, input_format: str,
+                     image_width: int, image_height: int,
+                     class_names: Optional[List[str]] = None,
+                     image_dir: Optional[str] = None,
+                     cache_size: int = 64) -> AnnotationPreview:
+        """
+        打开目录（或单个文件）的标注预览，只列出文件，每个文件在显示时才解析
+        
+        Args:
+            input_path: 输入目录或文件
+            input_format: 输入格式名称
+            image_width: 默认图片宽度
+            image_height: 默认图片高度
+            class_names: 类别名称列表（可选）
+            image_dir: 图片目录（可选，用于读取实际尺寸和显示图片）
+            cache_size: 解析结果和画面缓存的容量
+            
+        Returns:
+            AnnotationPreview: 预览器
+        """
+        input_fmt = self.get_format(input_format)
+        if os.path.isdir(input_path):
+            file_paths = input_fmt.list_input_files(input_path)
+        elif os.path.isfile(input_path):
+            file_paths = [input_path]
+        else:
+            raise ValueError(f"Input path {input_path} does not exist")
+        return AnnotationPreview(input_fmt, file_paths, image_width, image_height,
+                                 class_names, image_dir, cache_size)
+    
+    def export_index(self, index: DatasetIndex, output_dir: str, output_format: str,
+                     box_mask: Optional[np.ndarray] = None,
+                     keep_empty: bool = False,
+                     obb_fit: str = 'edges') -> ConversionResult:
+        """
+        导出（筛选后的）数据集索引
+        
+        Args:
+            index: 数据集索引
+            output_dir: 输出目录
+            output_format: 输出格式名称
+            box_mask: 边界框布尔掩码（可选，通常来自 DatasetIndex.query）
+            keep_empty: 是否导出筛选后没有边界框的图片
+            obb_fit: 参数化 OBB 输出格式（如 LabelImg-OBB）的拟合方式（edges / min-area）
+            
+        Returns:
+            ConversionResult: 导出结果统计
+        """
+        output_fmt = self.get_format(output_format)
+        common_data_list = index.to_common_formats(box_mask, keep_empty)
+        
+        writer = output_fmt.open_dataset_writer(output_dir)
+        try:
+            with obb_fit_mode(obb_fit):
+                writer.write_batch(common_data_list)
+        finally:
+            writer.close()
         
-        # 步骤2：中间格式 -> 输出格式（批量）
-        output_fmt.common2formatMulti(common_data_list, output_dir)
+        return ConversionResult(
+            total_files=index.image_count,
+            converted_files=len(common_data_list),
+            skipped_files=index.image_count - len(common_data_list)
+        )
     
     def is_format_supported(self, format_name: str) -> bool:
         """
@@ -4,7 +4,41 @@
 
 import numpy as np
 import math
-from typing import Tuple, List
+from contextlib import contextmanager
+import contextvars
+from typing import Tuple, List, Optional, Iterator
+
+from .common_format import get_validation_level, range_check_deferred
+
+
+# 从四边形计算参数化 OBB（中心点、宽高、角度）的方式：
+# - edges: 宽取边 0→1、高取边 0→3、角度取边 0→1 的方向，要求角点已经是矩形（默认）
+# - min-area: 最小面积外接矩形，适用于手工标注的不规则四边形
+OBB_FIT_MODES = ('edges', 'min-area')
+
+_obb_fit_mode: contextvars.ContextVar = contextvars.ContextVar('obb_fit_mode', default='edges')
+
+
+def get_obb_fit_mode() -> str:
+    """获取当前上下文的 OBB 拟合方式"""
+    return _obb_fit_mode.get()
+
+
+@contextmanager
+def obb_fit_mode(mode: str) -> Iterator[None]:
+    """
+    在上下文中临时切换 OBB 拟合方式（影响 LabelImg-OBB 等参数化 OBB 格式的输出）
+
+    Args:
+        mode: 拟合方式（edges / min-area）
+    """
+    if mode not in OBB_FIT_MODES:
+        raise ValueError(f"Invalid OBB fit mode '{mode}'. Available modes: {list(OBB_FIT_MODES)}")
+    token = _obb_fit_mode.set(mode)
+    try:
+        yield
+    finally:
+        _obb_fit_mode.reset(token)
 
 
 def normalize_coordinates(corners: np.ndarray, image_width: int, image_height: int) -> np.ndarray:
@@ -23,8 +57,9 @@ def normalize_coordinates(corners: np.ndarray, image_width: int, image_height: i
     normalized[:, 0] = normalized[:, 0] / image_width  # x坐标
     normalized[:, 1] = normalized[:, 1] / image_height  # y坐标
     
-    # 确保坐标在 [0, 1] 范围内
-    normalized = np.clip(normalized, 0.0, 1.0)
+    # 确保坐标在 [0, 1] 范围内（trusted 级别或推迟了范围检查时保留原始值）
+    if get_validation_level() != 'trusted' and not range_check_deferred():
+        normalized = np.clip(normalized, 0.0, 1.0)
     
     return normalized
 
@@ -34,16 +69,16 @@ def denormalize_coordinates(corners: np.ndarray, image_width: int, image_height:
     将归一化坐标转换为像素坐标
     
     Args:
-        corners: 归一化坐标 (4, 2)
+        corners: 归一化坐标 (4, 2)，也可以是批量的 (N, 4, 2)
         image_width: 图片宽度
         image_height: 图片高度
         
     Returns:
-        np.ndarray: 像素坐标 (4, 2)
+        np.ndarray: 像素坐标，形状与输入相同
     """
     pixels = corners.copy()
-    pixels[:, 0] = pixels[:, 0] * image_width  # x坐标
-    pixels[:, 1] = pixels[:, 1] * image_height  # y坐标
+    pixels[..., 0] = pixels[..., 0] * image_width  # x坐标
+    pixels[..., 1] = pixels[..., 1] * image_height  # y坐标
     
     return pixels
 
@@ -82,6 +117,161 @@ def calculate_obb_parameters(corners: np.ndarray) -> Tuple[float, float, float,
     return center_x, center_y, width, height, angle_degrees
 
 
+def _normalize_angles(angle_degrees: np.ndarray) -> np.ndarray:
+    """将角度归一化到 [-90, 90]（与 calculate_obb_parameters 的规则相同）"""
+    angle_degrees = np.where(angle_degrees > 90, angle_degrees - 180, angle_degrees)
+    return np.where(angle_degrees < -90, angle_degrees + 180, angle_degrees)
+
+
+def obb_parameters_from_edges(corners: np.ndarray) -> np.ndarray:
+    """
+    批量版 calculate_obb_parameters：宽、高和角度直接取自边 0→1 和 0→3
+    
+    Args:
+        corners: 角点 (N, 4, 2)，顺序：左上，右上，右下，左下
+        
+    Returns:
+        np.ndarray: (N, 5)，每行为 (x_center, y_center, width, height, angle_degrees)
+    """
+    corners = np.asarray(corners)
+    center = corners.mean(axis=1)
+    edge_x = corners[:, 1] - corners[:, 0]
+    edge_y = corners[:, 3] - corners[:, 0]
+    width = np.sqrt(np.sum(edge_x * edge_x, axis=1))
+    height = np.sqrt(np.sum(edge_y * edge_y, axis=1))
+    angle = _normalize_angles(np.degrees(np.arctan2(edge_x[:, 1], edge_x[:, 0])))
+    return np.column_stack([center, width, height, angle])
+
+
+# 最小面积外接矩形的候选方向：四条边和两条对角线上的顶点对。
+# 任意四个点的凸包的每条边都是其中之一，因此凸包的旋转卡壳方向全部包含在内；
+# 四条边排在前面，使规则矩形的宽度方向与 edges 方式一致（取边 0→1）
+_CALIPER_PAIRS = np.array([(0, 1), (1, 2), (2, 3), (3, 0), (0, 2), (1, 3)])
+
+
+def min_area_rect(corners: np.ndarray, bounds: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    批量计算四边形（或少量点组成的多边形）的最小面积外接矩形（向量化的旋转卡壳）
+    
+    最小面积外接矩形必有一条边与凸包的某条边共线。对每个多边形同时尝试全部
+    候选方向：把顶点投影到该方向及其法向上，两个方向上的投影范围即矩形的宽和高，
+    取面积最小（在 1e-9 的相对误差内取第一个）的方向。四边形的候选方向为四条边和
+    两条对角线，其他顶点数时为所有顶点对（K 个顶点共 K(K-1)/2 个方向）。
+    
+    吞吐量预算：批量调用时每个框的耗时不超过逐个调用 calculate_obb_parameters 的一半
+    （N=100000 时约 2.7 µs/框，calculate_obb_parameters 约 15 µs/框）。单次调用有约 100 µs
+    的固定开销，因此应按批次而不是逐框调用。
+    
+    Args:
+        corners: 角点 (N, 4, 2)，顶点顺序不限；也可以是 (N, K, 2)（允许重复顶点）
+        bounds: 范围（可选），(2,) 或 (N, 2)，每行为 (宽, 高)：只在完全位于 [0, 宽] × [0, 高]
+            内的候选矩形中选择，没有这样的候选时不加限制
+        
+    Returns:
+        np.ndarray: (N, 5)，每行为 (x_center, y_center, width, height, angle_degrees)，
+        角度为宽度方向与 x 轴的夹角，范围 [-90, 90]，可由 obb_to_corners 还原
+    """
+    corners = np.asarray(corners, dtype=np.float64)
+    vertex_count = corners.shape[1]
+    pairs = (_CALIPER_PAIRS if vertex_count == 4
+             else np.array([(i, j) for i in range(vertex_count) for j in range(i + 1, vertex_count)]))
+    x, y = corners[..., 0], corners[..., 1]
+    dx = x[:, pairs[:, 1]] - x[:, pairs[:, 0]]  # (N, 候选方向数)
+    dy = y[:, pairs[:, 1]] - y[:, pairs[:, 0]]
+    lengths = np.hypot(dx, dy)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        unit_x, unit_y = dx / lengths, dy / lengths
+    
+    # 顶点在每个候选方向 (unit_x, unit_y) 及其法向 (-unit_y, unit_x) 上的投影 (N, 候选方向数, K)
+    along = unit_x[..., None] * x[:, None, :] + unit_y[..., None] * y[:, None, :]
+    across = unit_x[..., None] * y[:, None, :] - unit_y[..., None] * x[:, None, :]
+    along_max, along_min = along.max(axis=2), along.min(axis=2)
+    across_max, across_min = across.max(axis=2), across.min(axis=2)
+    widths, heights = along_max - along_min, across_max - across_min
+    areas = np.where(lengths > 0, widths * heights, np.inf)
+    
+    if bounds is not None:
+        bounds = np.broadcast_to(np.asarray(bounds, dtype=np.float64), (len(corners), 2))
+        middle_along, middle_across = (along_max + along_min) / 2, (across_max + across_min) / 2
+        center_x = middle_along * unit_x - middle_across * unit_y
+        center_y = middle_along * unit_y + middle_across * unit_x
+        half_x = (widths * np.abs(unit_x) + heights * np.abs(unit_y)) / 2
+        half_y = (widths * np.abs(unit_y) + heights * np.abs(unit_x)) / 2
+        tolerance = 1e-9 * bounds.max(axis=1, keepdims=True)
+        with np.errstate(invalid='ignore'):
+            fits = ((center_x - half_x >= -tolerance) & (center_x + half_x <= bounds[:, :1] + tolerance)
+                    & (center_y - half_y >= -tolerance) & (center_y + half_y <= bounds[:, 1:] + tolerance))
+        fits &= np.isfinite(areas)
+        areas = np.where(fits | ~fits.any(axis=1, keepdims=True), areas, np.inf)
+    
+    best_area = areas.min(axis=1, keepdims=True)
+    best = np.argmax(areas <= best_area * (1 + 1e-9), axis=1)[:, None]
+    
+    def pick(values: np.ndarray) -> np.ndarray:
+        return np.take_along_axis(values, best, axis=1)[:, 0]
+    
+    best_x, best_y = pick(unit_x), pick(unit_y)
+    center_along = (pick(along_max) + pick(along_min)) / 2
+    center_across = (pick(across_max) + pick(across_min)) / 2
+    result = np.column_stack([
+        center_along * best_x - center_across * best_y,
+        center_along * best_y + center_across * best_x,
+        pick(widths),
+        pick(heights),
+        _normalize_angles(np.degrees(np.arctan2(best_y, best_x)))
+    ])
+    
+    # 所有顶点重合时没有可用的方向：退化为中心点处的零尺寸矩形
+    degenerate = ~np.isfinite(best_area[:, 0])
+    if degenerate.any():
+        result[degenerate] = np.column_stack([corners[degenerate].mean(axis=1), np.zeros((degenerate.sum(), 3))])
+    return result
+
+
+def fit_obb_parameters(corners: np.ndarray, mode: Optional[str] = None) -> np.ndarray:
+    """
+    批量计算参数化 OBB
+    
+    Args:
+        corners: 角点 (N, 4, 2)
+        mode: 拟合方式（edges / min-area，默认使用当前上下文的拟合方式）
+        
+    Returns:
+        np.ndarray: (N, 5)，每行为 (x_center, y_center, width, height, angle_degrees)
+    """
+    mode = mode or get_obb_fit_mode()
+    if mode not in OBB_FIT_MODES:
+        raise ValueError(f"Invalid OBB fit mode '{mode}'. Available modes: {list(OBB_FIT_MODES)}")
+    if len(corners) == 0:
+        return np.zeros((0, 5), dtype=np.float64)
+    if mode == 'min-area':
+        return min_area_rect(corners)
+    return obb_parameters_from_edges(corners)
+
+
+def corners_from_obb_parameters(parameters: np.ndarray) -> np.ndarray:
+    """
+    批量版 obb_to_corners
+    
+    Args:
+        parameters: (N, 5)，每行为 (x_center, y_center, width, height, angle_degrees)
+        
+    Returns:
+        np.ndarray: 角点 (N, 4, 2)，顺序：左上，右上，右下，左下
+    """
+    parameters = np.asarray(parameters, dtype=np.float64)
+    angle_radians = np.radians(parameters[:, 4])
+    cos_angle, sin_angle = np.cos(angle_radians), np.sin(angle_radians)
+    # 局部坐标系中的四个角点（以半宽、半高为单位）
+    signs = np.array([[-1, -1], [1, -1], [1, 1], [-1, 1]], dtype=np.float64)
+    local_x = signs[None, :, 0] * parameters[:, 2, None] / 2
+    local_y = signs[None, :, 1] * parameters[:, 3, None] / 2
+    return np.stack([
+        parameters[:, 0, None] + local_x * cos_angle[:, None] - local_y * sin_angle[:, None],
+        parameters[:, 1, None] + local_x * sin_angle[:, None] + local_y * cos_angle[:, None]
+    ], axis=-1)
+
+
 def obb_to_corners(center_x: float, center_y: float, width: float, height: float, 
                    angle_degrees: float) -> np.ndarray:
     """
@@ -208,4 +398,361 @@ def corners_to_yolo(corners: np.ndarray) -> Tuple[float, float, float, float]:
     width = x_max - x_min
     height = y_max - y_min
     
-    return x_center, y_center, width, height 
\ No newline at end of file
+    return x_center, y_center, width, height 
+
+def polygon_areas(corners: np.ndarray) -> np.ndarray:
+    """
+    批量计算多边形的有向面积（鞋带公式）
+    
+    Args:
+        corners: 多边形顶点 (N, K, 2)
+        
+    Returns:
+        np.ndarray: 有向面积 (N,)，顶点按 x 向右、y 向下的图像坐标顺时针排列时为正
+    """
+    x, y = corners[..., 0], corners[..., 1]
+    return 0.5 * np.sum(x * np.roll(y, -1, axis=-1) - np.roll(x, -1, axis=-1) * y, axis=-1)
+
+
+def convex_hull(points: np.ndarray) -> np.ndarray:
+    """
+    计算点集的凸包（Andrew 单调链）
+    
+    Args:
+        points: 点 (K, 2)
+        
+    Returns:
+        np.ndarray: 凸包顶点 (M, 2)，按 x 向右、y 向下的图像坐标顺时针排列，不含共线点；
+        所有点重合时 M 为 1
+    """
+    ordered = sorted(set(map(tuple, np.asarray(points, dtype=np.float64).tolist())))
+    if len(ordered) <= 2:
+        return np.array(ordered, dtype=np.float64).reshape(-1, 2)
+    
+    def half(sequence) -> list:
+        chain = []
+        for point in sequence:
+            while len(chain) >= 2 and ((chain[-1][0] - chain[-2][0]) * (point[1] - chain[-2][1])
+                                       - (chain[-1][1] - chain[-2][1]) * (point[0] - chain[-2][0])) <= 0:
+                chain.pop()
+            chain.append(point)
+        return chain[:-1]
+    
+    return np.array(half(ordered) + half(reversed(ordered)), dtype=np.float64)
+
+
+def _segments_cross(a: np.ndarray, b: np.ndarray, c: np.ndarray, d: np.ndarray) -> np.ndarray:
+    """批量判断线段 ab 与 cd 是否在内部相交（不含端点接触），各参数形状为 (N, 2)"""
+    def cross(o, p, q):
+        return (p[:, 0] - o[:, 0]) * (q[:, 1] - o[:, 1]) - (p[:, 1] - o[:, 1]) * (q[:, 0] - o[:, 0])
+    return (cross(c, d, a) * cross(c, d, b) < 0) & (cross(a, b, c) * cross(a, b, d) < 0)
+
+
+def quad_self_intersects(corners: np.ndarray) -> np.ndarray:
+    """
+    批量判断四边形是否自相交（“蝴蝶结”形状，即对边相交）
+    
+    Args:
+        corners: 四边形顶点 (N, 4, 2)
+        
+    Returns:
+        np.ndarray: 布尔数组 (N,)
+    """
+    p0, p1, p2, p3 = corners[:, 0], corners[:, 1], corners[:, 2], corners[:, 3]
+    return _segments_cross(p0, p1, p2, p3) | _segments_cross(p1, p2, p3, p0)
+
+
+def _positive_orientation(corners: np.ndarray) -> np.ndarray:
+    """统一顶点顺序，使所有多边形的有向面积为正"""
+    flip = polygon_areas(corners) < 0
+    return np.where(flip[:, None, None], corners[:, ::-1], corners)
+
+
+def canonicalize_corners(corners: np.ndarray, image_width=1.0, image_height=1.0) -> np.ndarray:
+    """
+    批量统一四边形的角点顺序
+    
+    规则（在像素坐标下判断，x 向右、y 向下）：
+    1. 环绕方向：鞋带公式有向面积为负（逆时针）的四边形反转顶点顺序，统一为顺时针；
+    2. 起始顶点：选择出边 i→i+1 与 x 轴夹角的绝对值最小的顶点作为第一个顶点，
+       夹角相同（如旋转 45° 的正方形）时取角度为负的一条，
+       因此矩形的顺序为 左上，右上，右下，左下，边 0→1 的角度范围为 [-45, 45)。
+    
+    只对顶点做循环移位和反转，多边形本身不变；自相交四边形的顶点不会被重新排序。
+    
+    Args:
+        corners: 角点 (N, 4, 2)
+        image_width: 图片宽度，标量或 (N,)（输入为归一化坐标时用于还原像素下的角度，默认 1）
+        image_height: 图片高度，标量或 (N,)
+        
+    Returns:
+        np.ndarray: 重新排序的角点 (N, 4, 2)，数据类型与输入相同
+    """
+    corners = np.asarray(corners)
+    if len(corners) == 0:
+        return corners.copy()
+    scale = np.stack(np.broadcast_arrays(np.asarray(image_width, dtype=np.float64),
+                                         np.asarray(image_height, dtype=np.float64)), axis=-1)
+    pixel = corners.astype(np.float64) * np.reshape(scale, (-1, 1, 2))
+    
+    flip = polygon_areas(pixel) < 0
+    corners = np.where(flip[:, None, None], corners[:, ::-1], corners)
+    pixel = np.where(flip[:, None, None], pixel[:, ::-1], pixel)
+    
+    edges = np.roll(pixel, -1, axis=1) - pixel
+    angles = np.degrees(np.arctan2(edges[..., 1], edges[..., 0]))  # (N, 4)，范围 (-180, 180]
+    # 零长度的边和非有限坐标不参与选择；全部无效时保持原起点
+    usable = np.isfinite(angles) & np.any(edges != 0, axis=2)
+    keys = np.where(usable, np.abs(angles), np.inf)
+    ties = keys <= keys.min(axis=1, keepdims=True) + 1e-9
+    start = np.argmin(np.where(ties, angles, np.inf), axis=1)
+    start[~usable.any(axis=1)] = 0
+    
+    order = (start[:, None] + np.arange(4)) % 4
+    return np.take_along_axis(corners, order[..., None], axis=1)
+
+
+def _clip_polygons(polygons: np.ndarray, clip: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    向量化 Sutherland–Hodgman 裁剪
+    
+    所有多边形同时裁剪：每一步用 clip 的一条边裁剪全部 polygons，
+    裁剪结果按最大顶点数补齐后进入下一步，循环次数只与 clip 的顶点数有关。
+    
+    Args:
+        polygons: 被裁剪的多边形 (P, K, 2)
+        clip: 裁剪用的凸多边形 (P, L, 2)，有向面积须为正
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (裁剪后的多边形 (P, M, 2)，补齐的位置填充第一个顶点,
+        每个多边形的顶点数 (P,))
+    """
+    pair_count = len(polygons)
+    counts = np.full(pair_count, polygons.shape[1], dtype=np.int64)
+    
+    for k in range(clip.shape[1]):
+        start = clip[:, k, None, :]
+        edge = clip[:, (k + 1) % clip.shape[1], None, :] - start
+        # 有向面积为正时多边形内部在每条边的左侧；
+        # 已被完全裁掉的多边形的补齐位置可能是 inf/NaN，其结果同样不会被输出
+        with np.errstate(invalid='ignore'):
+            side = (edge[..., 0] * (polygons[..., 1] - start[..., 1])
+                    - edge[..., 1] * (polygons[..., 0] - start[..., 0]))
+        
+        vertex_ids = np.arange(polygons.shape[1])[None, :]
+        valid = vertex_ids < counts[:, None]
+        next_ids = np.where(vertex_ids + 1 < counts[:, None], vertex_ids + 1, 0)
+        next_points = np.take_along_axis(polygons, next_ids[..., None], axis=1)
+        next_side = np.take_along_axis(side, next_ids, axis=1)
+        
+        inside, next_inside = side >= 0, next_side >= 0
+        # 未穿越裁剪边的位置 t 可能为 NaN/inf，其结果不会被输出
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = side / (side - next_side)
+            crossings = polygons + t[..., None] * (next_points - polygons)
+        
+        # 每个顶点最多输出两个点：自身（在内侧时）和与裁剪边的交点（穿越时）
+        points = np.stack([polygons, crossings], axis=2).reshape(pair_count, -1, 2)
+        keep = np.stack([valid & inside, valid & (inside != next_inside)], axis=2).reshape(pair_count, -1)
+        counts = keep.sum(axis=1)
+        order = np.argsort(~keep, axis=1, kind='stable')
+        polygons = np.take_along_axis(points, order[..., None], axis=1)[:, :max(int(counts.max()), 1)]
+    
+    # 补齐的位置填充第一个顶点，对鞋带公式和外接矩形都没有影响
+    valid = np.arange(polygons.shape[1])[None, :] < counts[:, None]
+    return np.where(valid[..., None], polygons, polygons[:, :1]), counts
+
+
+def convex_intersection_areas(subject: np.ndarray, clip: np.ndarray) -> np.ndarray:
+    """
+    批量计算成对凸多边形的交集面积（向量化 Sutherland–Hodgman 裁剪）
+    
+    Args:
+        subject: 被裁剪的凸多边形 (P, K, 2)
+        clip: 裁剪用的凸多边形 (P, L, 2)
+        
+    Returns:
+        np.ndarray: 交集面积 (P,)
+    """
+    if len(subject) == 0:
+        return np.zeros(0, dtype=np.float64)
+    polygons, counts = _clip_polygons(_positive_orientation(np.asarray(subject, dtype=np.float64)),
+                                      _positive_orientation(np.asarray(clip, dtype=np.float64)))
+    areas = np.abs(polygon_areas(polygons))
+    areas[counts < 3] = 0.0
+    return areas
+
+
+def clip_polygons_to_rect(polygons: np.ndarray, x_min: float = 0.0, y_min: float = 0.0,
+                          x_max: float = 1.0, y_max: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    批量将多边形裁剪到轴对齐矩形内（如图片范围）
+    
+    裁剪是仿射不变的，可以直接在归一化坐标下对单位正方形裁剪。
+    
+    Args:
+        polygons: 多边形 (N, K, 2)
+        x_min, y_min, x_max, y_max: 裁剪矩形（默认为归一化坐标下的整张图片）
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (裁剪后的多边形 (N, M, 2)，补齐的位置填充第一个顶点,
+        每个多边形的顶点数 (N,)，小于 3 表示多边形完全在矩形外)
+    """
+    polygons = np.asarray(polygons, dtype=np.float64)
+    if len(polygons) == 0:
+        return polygons.copy(), np.zeros(0, dtype=np.int64)
+    # 图像坐标（y 向下）中有向面积为正的顺序：左上，右上，右下，左下
+    rect = np.array([[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]], dtype=np.float64)
+    return _clip_polygons(polygons, np.broadcast_to(rect, (len(polygons), 4, 2)))
+
+
+def simplify_polygons(polygons: np.ndarray, counts: np.ndarray, vertex_count: int = 4) -> np.ndarray:
+    """
+    批量将多边形化简为固定顶点数
+    
+    顶点多于 vertex_count 时反复删除与相邻两点构成的三角形面积最小的顶点
+    （对凸多边形，结果始终位于原多边形内）；不足时重复最后一个顶点补齐。
+    
+    Args:
+        polygons: 多边形 (N, K, 2)，每行的前 counts[i] 个顶点有效
+        counts: 每个多边形的顶点数 (N,)，至少为 1
+        vertex_count: 目标顶点数
+        
+    Returns:
+        np.ndarray: 化简后的多边形 (N, vertex_count, 2)
+    """
+    polygons = np.asarray(polygons, dtype=np.float64)
+    counts = np.asarray(counts, dtype=np.int64)
+    vertex_ids = np.arange(polygons.shape[1])[None, :]
+    
+    # 每轮每个多边形删除一个顶点，循环次数为最大的多余顶点数
+    while len(counts) and counts.max() > vertex_count:
+        valid = vertex_ids < counts[:, None]
+        prev_ids = np.where(vertex_ids == 0, counts[:, None] - 1, vertex_ids - 1)
+        next_ids = np.where(vertex_ids + 1 < counts[:, None], vertex_ids + 1, 0)
+        prev_points = np.take_along_axis(polygons, prev_ids[..., None], axis=1)
+        next_points = np.take_along_axis(polygons, next_ids[..., None], axis=1)
+        to_point, to_next = polygons - prev_points, next_points - prev_points
+        triangles = np.abs(to_point[..., 0] * to_next[..., 1] - to_point[..., 1] * to_next[..., 0])
+        drop = np.argmin(np.where(valid, triangles, np.inf), axis=1)
+        
+        keep = valid & ~((vertex_ids == drop[:, None]) & (counts > vertex_count)[:, None])
+        order = np.argsort(~keep, axis=1, kind='stable')
+        polygons = np.take_along_axis(polygons, order[..., None], axis=1)
+        counts = keep.sum(axis=1)
+    
+    ids = np.minimum(np.arange(vertex_count)[None, :], counts[:, None] - 1)
+    return np.take_along_axis(polygons, ids[..., None], axis=1)
+
+
+def rotated_iou(corners_a: np.ndarray, corners_b: np.ndarray) -> np.ndarray:
+    """
+    批量计算成对旋转框（凸四边形）的 IoU
+    
+    Args:
+        corners_a: 角点 (P, 4, 2)
+        corners_b: 角点 (P, 4, 2)
+        
+    Returns:
+        np.ndarray: IoU (P,)
+    """
+    intersection = convex_intersection_areas(corners_a, corners_b)
+    union = np.abs(polygon_areas(corners_a)) + np.abs(polygon_areas(corners_b)) - intersection
+    with np.errstate(divide='ignore', invalid='ignore'):
+        iou = np.where(union > 0, intersection / union, 0.0)
+    return iou
+
+
+def overlapping_pairs(corners: np.ndarray, groups: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    用排序扫描找出外接矩形相交的多边形对（只在同一组内配对）
+    
+    多边形按 (组, x_min) 排序后，每个多边形只需与 x_min 不超过其 x_max 的
+    后续多边形配对（searchsorted 一次求出），再按 y 方向过滤，
+    避免 O(N²) 的两两比较。
+    
+    Args:
+        corners: 多边形顶点 (N, K, 2)
+        groups: 分组编号 (N,)（可选，如 图片×类别）
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 多边形对的序号 (i, j)，i < j
+    """
+    count = len(corners)
+    if count < 2:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    mins, maxs = corners.min(axis=1), corners.max(axis=1)
+    
+    # 把组号编码进 x 坐标，使不同组的区间互不相交
+    stride = float(maxs[:, 0].max() - mins[:, 0].min()) + 1.0
+    offset = np.zeros(count) if groups is None else np.asarray(groups, dtype=np.float64) * stride
+    key_min, key_max = mins[:, 0] + offset, maxs[:, 0] + offset
+    
+    order = np.argsort(key_min, kind='stable')
+    ends = np.searchsorted(key_min[order], key_max[order], side='right')
+    pair_counts = np.maximum(ends - np.arange(count) - 1, 0)
+    first = np.repeat(np.arange(count), pair_counts)
+    starts = np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+    second = first + 1 + np.arange(len(first)) - starts
+    
+    i, j = order[first], order[second]
+    y_overlap = (mins[i, 1] <= maxs[j, 1]) & (mins[j, 1] <= maxs[i, 1])
+    i, j = i[y_overlap], j[y_overlap]
+    return np.minimum(i, j), np.maximum(i, j)
+
+
+def rotated_nms(corners: np.ndarray, iou_threshold: float,
+                scores: Optional[np.ndarray] = None,
+                groups: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    旋转框非极大值抑制：与更高分的保留框 IoU 不小于阈值的框被删除
+    
+    候选对先由 overlapping_pairs 的排序扫描产生，再用外接矩形交集给出的
+    IoU 上界过滤，只对剩余的候选对计算精确的多边形 IoU。
+    
+    Args:
+        corners: 角点 (N, 4, 2)，应使用像素坐标（IoU 与长宽比相关）
+        iou_threshold: IoU 阈值
+        scores: 分数 (N,)（可选，默认按原始顺序，先出现的优先保留；NaN 视为最低）
+        groups: 分组编号 (N,)（可选，只在同一组内抑制）
+        
+    Returns:
+        np.ndarray: 保留的框的布尔掩码 (N,)
+    """
+    count = len(corners)
+    keep = np.ones(count, dtype=bool)
+    i, j = overlapping_pairs(corners, groups)
+    if not len(i):
+        return keep
+    
+    # IoU 上界：交集不超过外接矩形交集，也不超过较小多边形的面积
+    areas = np.abs(polygon_areas(corners))
+    mins, maxs = corners.min(axis=1), corners.max(axis=1)
+    box_overlap = np.prod(np.clip(np.minimum(maxs[i], maxs[j]) - np.maximum(mins[i], mins[j]), 0, None), axis=1)
+    bound = np.minimum(box_overlap, np.minimum(areas[i], areas[j]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        possible = bound / (areas[i] + areas[j] - bound) >= iou_threshold
+    i, j = i[possible], j[possible]
+    
+    overlapping = rotated_iou(corners[i], corners[j]) >= iou_threshold
+    i, j = i[overlapping], j[overlapping]
+    if not len(i):
+        return keep
+    
+    # 优先级：分数降序，分数相同时原始顺序在前
+    if scores is None:
+        priority = np.arange(count)
+    else:
+        ranked_scores = np.where(np.isnan(scores), -np.inf, scores)
+        priority = np.empty(count, dtype=np.int64)
+        priority[np.lexsort((np.arange(count), -ranked_scores))] = np.arange(count)
+    winners = np.where(priority[i] < priority[j], i, j)
+    losers = np.where(priority[i] < priority[j], j, i)
+    
+    # 按胜者的优先级顺序处理：轮到某一对时，胜者是否被保留已经确定
+    for winner, loser in zip(*(array[np.argsort(priority[winners], kind='stable')].tolist()
+                               for array in (winners, losers))):
+        if keep[winner]:
+            keep[loser] = False
+    return keep
@@ -0,0 +1,45 @@
+"""
+图片工具 - 查找标注对应的图片文件并读取图片尺寸
+"""
+
+import os
+from typing import Optional, Tuple
+
+
+# 按优先级查找的图片扩展名
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp')
+
+
+def find_image_file(image_dir: str, image_filename: str) -> Optional[str]:
+    """
+    在图片目录中查找与标注同名的图片文件
+
+    Args:
+        image_dir: 图片目录
+        image_filename: 图片文件名（不含扩展名）
+
+    Returns:
+        Optional[str]: 图片路径，找不到时返回None
+    """
+    for extension in IMAGE_EXTENSIONS:
+        for candidate in (extension, extension.upper()):
+            path = os.path.join(image_dir, f"{image_filename}{candidate}")
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def read_image_size(image_path: str) -> Tuple[int, int]:
+    """
+    读取图片尺寸（只解析文件头，不解码像素数据）
+
+    Args:
+        image_path: 图片路径
+
+    Returns:
+        Tuple[int, int]: (宽度, 高度)
+    """
+    from PIL import Image
+
+    with Image.open(image_path) as image:
+        return image.size
@@ -0,0 +1,322 @@
+"""
+转换任务队列 - 在进程池中并发执行多个转换任务（GUI 任务面板使用）
+
+每个任务在独立的工作进程中执行 convert_directory / convert_file，不受 GIL 限制。
+同时运行的任务数不超过 workers；其余任务等待，由 poll() 在有空闲时提交。
+
+工作进程与主进程之间通过 multiprocessing.Manager 共享：
+- 事件队列：工作进程在每个批次完成后发送进度快照（见 core/progress.py）
+- 控制表：主进程写入 任务ID -> 'pause' / 'cancel'，工作进程在批次之间检查，
+  暂停时在原地等待，取消时抛出 JobCancelled 结束任务（已写出的文件保留）
+
+poll() 不阻塞，应由调用方定期调用（GUI 中由 root.after 定时器调用）。
+"""
+
+import itertools
+import multiprocessing
+import os
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .conversion_result import ConversionResult
+from .progress import ConversionProgress
+
+
+# 任务状态
+JOB_STATUSES = ('pending', 'running', 'paused', 'completed', 'failed', 'cancelled')
+
+# 已结束的任务状态
+FINISHED_STATUSES = ('completed', 'failed', 'cancelled')
+
+# 暂停的任务检查控制表的间隔（秒）
+PAUSE_POLL_INTERVAL = 0.2
+
+
+class JobCancelled(Exception):
+    """任务被取消"""
+
+
+@dataclass
+class ConversionJob:
+    """
+    转换任务
+
+    Attributes:
+        job_id: 任务ID（从 1 开始递增）
+        input_path: 输入目录或文件
+        output_path: 输出目录
+        input_format: 输入格式名称
+        output_format: 输出格式名称
+        image_width: 图片宽度
+        image_height: 图片高度
+        class_names: 类别名称列表（可选）
+        status: 任务状态（见 JOB_STATUSES）
+        progress: 最新的进度快照
+        result: 转换结果（完成时）
+        error: 错误信息（失败时）
+        submitted_at: 加入队列的时间（time.time()）
+        started_at: 开始执行的时间
+        finished_at: 结束的时间
+    """
+    job_id: int
+    input_path: str
+    output_path: str
+    input_format: str
+    output_format: str
+    image_width: int
+    image_height: int
+    class_names: Optional[List[str]] = None
+    status: str = 'pending'
+    progress: Optional[ConversionProgress] = None
+    result: Optional[ConversionResult] = None
+    error: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def is_finished(self) -> bool:
+        """任务是否已结束"""
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def duration(self) -> Optional[float]:
+        """执行时长（秒），未开始时为None"""
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def wait_time(self) -> Optional[float]:
+        """排队等待时长（秒），未开始时为None"""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.submitted_at
+
+    def _spec(self) -> Dict[str, Any]:
+        """传给工作进程的任务参数"""
+        return {
+            'input_path': self.input_path,
+            'output_path': self.output_path,
+            'input_format': self.input_format,
+            'output_format': self.output_format,
+            'image_width': self.image_width,
+            'image_height': self.image_height,
+            'class_names': list(self.class_names) if self.class_names else None,
+        }
+
+
+def _run_job(job_id: int, spec: Dict[str, Any], control, events) -> ConversionResult:
+    """工作进程任务：执行一个转换任务，进度和控制通过 Manager 共享"""
+    from .format_manager import format_manager
+
+    def report_progress(progress: ConversionProgress) -> None:
+        events.put((job_id, progress))
+        while control.get(job_id) == 'pause':
+            time.sleep(PAUSE_POLL_INTERVAL)
+        if control.get(job_id) == 'cancel':
+            raise JobCancelled(f"Job {job_id} cancelled")
+
+    input_path = spec['input_path']
+    common_args = dict(
+        input_format=spec['input_format'], output_format=spec['output_format'],
+        image_width=spec['image_width'], image_height=spec['image_height'],
+        class_names=spec['class_names']
+    )
+    if os.path.isfile(input_path):
+        os.makedirs(spec['output_path'], exist_ok=True)
+        format_manager.convert_file(
+            input_file=input_path,
+            output_file=os.path.join(spec['output_path'], os.path.basename(input_path)),
+            **common_args
+        )
+        return ConversionResult(total_files=1, converted_files=1)
+    return format_manager.convert_directory(
+        input_dir=input_path, output_dir=spec['output_path'], progress=report_progress, **common_args
+    )
+
+
+class JobQueue:
+    """
+    转换任务队列
+
+    用法::
+
+        queue = JobQueue(workers=2)
+        job = queue.submit(input_dir, output_dir, 'DOTA', 'YOLO-OBB', 1024, 1024)
+        while queue.has_active_jobs:
+            queue.poll()
+            time.sleep(0.1)
+        queue.shutdown()
+    """
+
+    def __init__(self, workers: int = 2):
+        """
+        初始化任务队列（进程池在第一次提交任务时创建）
+
+        Args:
+            workers: 同时运行的最大任务数
+        """
+        self.workers = workers
+        self.jobs: Dict[int, ConversionJob] = {}
+        self._ids = itertools.count(1)
+        self._futures: Dict[int, Any] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_workers = 0
+        self._manager = None
+        self._control = None
+        self._events = None
+
+    @property
+    def workers(self) -> int:
+        """同时运行的最大任务数"""
+        return self._workers
+
+    @workers.setter
+    def workers(self, value: int) -> None:
+        if value <= 0:
+            raise ValueError("workers must be positive")
+        self._workers = value
+
+    @property
+    def has_active_jobs(self) -> bool:
+        """是否有未结束的任务"""
+        return any(not job.is_finished for job in self.jobs.values())
+
+    def submit(self, input_path: str, output_path: str,
+               input_format: str, output_format: str,
+               image_width: int, image_height: int,
+               class_names: Optional[List[str]] = None) -> ConversionJob:
+        """
+        加入一个转换任务（在下一次 poll() 时开始执行）
+
+        Args:
+            input_path: 输入目录或文件
+            output_path: 输出目录
+            input_format: 输入格式名称
+            output_format: 输出格式名称
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（可选）
+
+        Returns:
+            ConversionJob: 新任务
+        """
+        job = ConversionJob(next(self._ids), input_path, output_path, input_format, output_format,
+                            image_width, image_height, class_names)
+        self.jobs[job.job_id] = job
+        return job
+
+    def pause(self, job_id: int) -> None:
+        """暂停任务：等待中的任务不再开始，运行中的任务在当前批次完成后暂停"""
+        job = self.jobs[job_id]
+        if job.status == 'running':
+            self._control[job_id] = 'pause'
+            job.status = 'paused'
+        elif job.status == 'pending':
+            job.status = 'paused'
+
+    def resume(self, job_id: int) -> None:
+        """继续已暂停的任务"""
+        job = self.jobs[job_id]
+        if job.status != 'paused':
+            return
+        if job_id in self._futures:
+            self._control.pop(job_id, None)
+            job.status = 'running'
+        else:
+            job.status = 'pending'
+
+    def cancel(self, job_id: int) -> None:
+        """取消任务：未开始的任务直接取消，运行中的任务在当前批次完成后结束"""
+        job = self.jobs[job_id]
+        if job.is_finished:
+            return
+        if job_id in self._futures:
+            self._control[job_id] = 'cancel'
+        else:
+            job.status = 'cancelled'
+            job.finished_at = time.time()
+
+    def clear_finished(self) -> None:
+        """从列表中移除已结束的任务"""
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.is_finished]:
+            del self.jobs[job_id]
+
+    def poll(self) -> List[ConversionJob]:
+        """
+        更新任务状态（不阻塞）：读取进度、收集已结束的任务、在有空闲时开始等待中的任务
+
+        Returns:
+            List[ConversionJob]: 本次调用中结束的任务
+        """
+        finished = []
+        if self._events is not None:
+            # 每个任务只保留最新的进度快照
+            while not self._events.empty():
+                job_id, progress = self._events.get_nowait()
+                if job_id in self.jobs:
+                    self.jobs[job_id].progress = progress
+
+        for job_id, future in list(self._futures.items()):
+            if not future.done():
+                continue
+            del self._futures[job_id]
+            self._control.pop(job_id, None)
+            job = self.jobs.get(job_id)
+            if job is None:
+                continue
+            job.finished_at = time.time()
+            try:
+                job.result = future.result()
+                job.status = 'completed'
+            except (JobCancelled, CancelledError):
+                job.status = 'cancelled'
+            except Exception as e:
+                job.status = 'failed'
+                job.error = str(e)
+            finished.append(job)
+
+        pending = [job for job in self.jobs.values() if job.status == 'pending']
+        while pending and len(self._futures) < self.workers:
+            self._start(pending.pop(0))
+        return finished
+
+    def _start(self, job: ConversionJob) -> None:
+        """在进程池中开始一个任务"""
+        if self._manager is None:
+            self._manager = multiprocessing.Manager()
+            self._control = self._manager.dict()
+            self._events = self._manager.Queue()
+        # 进程池大小跟随 workers 设置，只在没有运行中的任务时重建
+        if self._executor is not None and self._executor_workers != self.workers and not self._futures:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._executor_workers = self.workers
+
+        job.status = 'running'
+        job.started_at = time.time()
+        self._futures[job.job_id] = self._executor.submit(
+            _run_job, job.job_id, job._spec(), self._control, self._events
+        )
+
+    def shutdown(self) -> None:
+        """取消所有任务并关闭进程池"""
+        for job in self.jobs.values():
+            if not job.is_finished:
+                self.cancel(job.job_id)
+        if self._executor is not None:
+            # 尚未开始的任务直接取消（Future.cancel 对运行中的任务无效），再等待运行中的任务结束
+            for future in self._futures.values():
+                future.cancel()
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+            self._control = self._events = None
+        self._futures.clear()
@@ -0,0 +1,145 @@
+"""
+增量 JSON 解析器 - 流式遍历大型 JSON 文件的顶层对象和数组
+
+只把当前正在处理的一个元素保存在内存中，适用于 COCO 这类把整个数据集
+放在一个文件中的格式。单个元素的解码由标准库的 json.JSONDecoder 完成。
+"""
+
+import json
+from typing import Any, Iterator, TextIO
+
+
+_WHITESPACE = ' \t\n\r'
+
+
+class JSONStreamReader:
+    """
+    流式 JSON 读取器
+
+    用法（调用方必须在进入下一个键之前消费掉当前键对应的值）::
+
+        reader = JSONStreamReader(f)
+        for key in reader.iter_object():
+            if key == 'images':
+                for image in reader.iter_array():
+                    ...
+            else:
+                reader.skip_value()
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = 1 << 20):
+        """
+        初始化读取器
+
+        Args:
+            stream: 文本模式打开的文件对象
+            chunk_size: 每次读取的字符数
+        """
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """读取下一块数据，返回是否读到了新数据"""
+        if self._eof:
+            return False
+        chunk = self._stream.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        # 丢弃已消费的部分，避免缓冲区无限增长
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """跳过空白并返回下一个字符（文件结束时返回空字符串）"""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char: str) -> None:
+        """消费一个指定的结构字符"""
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Invalid JSON: expected '{char}' but found '{found or 'EOF'}'")
+        self._pos += 1
+
+    def read_value(self) -> Any:
+        """
+        读取并解码下一个完整的 JSON 值
+
+        Returns:
+            Any: 解码后的值
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # 值恰好结束于缓冲区末尾时（如数字 12 可能是 123 的一部分），需要读取更多数据确认
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def skip_value(self) -> None:
+        """跳过下一个值（数组按元素逐个跳过，不会整体载入内存）"""
+        if self._peek() == '[':
+            for _ in self.iter_array():
+                pass
+        else:
+            self.read_value()
+
+    def iter_array(self) -> Iterator[Any]:
+        """
+        逐个读取数组元素
+
+        Yields:
+            Any: 数组元素
+        """
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.read_value()
+            char = self._peek()
+            self._pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f"Invalid JSON: expected ',' or ']' but found '{char or 'EOF'}'")
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        逐个读取对象的键，值由调用方通过 read_value/iter_array/skip_value 消费
+
+        Yields:
+            str: 对象的键
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise ValueError("Invalid JSON: object keys must be strings")
+            self._expect(':')
+            yield key
+            char = self._peek()
+            self._pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise ValueError(f"Invalid JSON: expected ',' or '}}' but found '{char or 'EOF'}'")
@@ -0,0 +1,264 @@
+"""
+数据集 lint - 不转换数据集，逐文件、逐行检查标注问题
+
+每个工作进程处理一批文件：先用格式的 lint 记录迭代器收集所有记录，
+再在拼接后的角点数组上一次性完成几何检查。诊断以 JSON Lines 输出，每行一条::
+
+    {"file":"labels/P0001.txt","line":3,"code":"out_of_range","message":"..."}
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, TextIO
+
+import numpy as np
+
+from .base_format import BaseFormat
+from .geometry_utils import polygon_areas, quad_self_intersects
+
+
+# 诊断类型
+LINT_CODES = (
+    'read_error',         # 文件无法读取或整体无法解析
+    'malformed',          # 记录字段数量或类型错误
+    'non_finite',         # 坐标包含 NaN 或无穷大
+    'out_of_range',       # 坐标超出图片范围
+    'degenerate',         # 多边形面积为零（如重复顶点、共线）
+    'self_intersecting',  # 四边形对边相交
+    'unknown_class',      # 类别ID/名称不在类别表中
+    'duplicate',          # 与同一文件中之前的记录重复
+)
+
+# 面积（平方像素）不超过此值的多边形视为退化
+DEGENERATE_AREA = 1e-6
+
+# 重复记录比较时坐标的取整精度（归一化坐标的小数位数）
+DUPLICATE_DECIMALS = 6
+
+
+@dataclass
+class LintDiagnostic:
+    """
+    单条诊断
+
+    Attributes:
+        file: 文件路径
+        line: 行号（行式文本格式）或对象序号（其他格式），文件级问题为None
+        code: 诊断类型
+        message: 说明
+    """
+    file: str
+    line: Optional[int]
+    code: str
+    message: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {'file': self.file, 'line': self.line, 'code': self.code, 'message': self.message}
+
+    def to_json(self) -> str:
+        """转换为紧凑的单行 JSON"""
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(',', ':'))
+
+
+@dataclass
+class LintReport:
+    """
+    lint 报告
+
+    Attributes:
+        total_files: 检查的文件数
+        total_records: 检查的记录数
+        diagnostics: 诊断列表（按文件顺序和行号排列）
+    """
+    total_files: int = 0
+    total_records: int = 0
+    diagnostics: List[LintDiagnostic] = field(default_factory=list)
+
+    @property
+    def is_clean(self) -> bool:
+        """是否没有任何诊断"""
+        return not self.diagnostics
+
+    def counts(self) -> Dict[str, int]:
+        """按诊断类型统计数量"""
+        counts: Dict[str, int] = {}
+        for diagnostic in self.diagnostics:
+            counts[diagnostic.code] = counts.get(diagnostic.code, 0) + 1
+        return counts
+
+    def write_jsonl(self, stream: TextIO) -> None:
+        """
+        以 JSON Lines 写出所有诊断
+
+        Args:
+            stream: 文本输出流
+        """
+        for diagnostic in self.diagnostics:
+            stream.write(diagnostic.to_json() + '\n')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            'total_files': self.total_files,
+            'total_records': self.total_records,
+            'counts': self.counts(),
+            'diagnostics': [diagnostic.to_dict() for diagnostic in self.diagnostics]
+        }
+
+
+def lint_files(format_instance: BaseFormat, file_paths: Sequence[str],
+               image_width: int, image_height: int,
+               class_names: Optional[Sequence[str]] = None,
+               tolerance: float = 1e-6) -> LintReport:
+    """
+    检查一批文件（在当前进程中）
+
+    Args:
+        format_instance: 输入格式实例
+        file_paths: 文件路径列表
+        image_width: 图片宽度
+        image_height: 图片高度
+        class_names: 类别名称列表（可选，未指定时只检查类别ID是否为负数）
+        tolerance: 坐标范围检查允许的误差（归一化坐标）
+
+    Returns:
+        LintReport: lint 报告
+    """
+    report = LintReport(total_files=len(file_paths))
+    # (文件序号, 位置, 诊断)，最后按文件顺序和位置排序
+    found = []
+
+    file_ids: List[int] = []
+    lines: List[int] = []
+    class_keys: List[Any] = []
+    corner_blocks: List[np.ndarray] = []
+
+    for file_id, file_path in enumerate(file_paths):
+        try:
+            for line, class_key, corners, error in format_instance.iter_lint_records(
+                    file_path, image_width, image_height):
+                report.total_records += 1
+                if error is not None:
+                    found.append((file_id, line, LintDiagnostic(file_path, line, 'malformed', error)))
+                    continue
+                file_ids.append(file_id)
+                lines.append(line)
+                class_keys.append(class_key)
+                corner_blocks.append(corners)
+        except Exception as e:
+            found.append((file_id, 0, LintDiagnostic(file_path, None, 'read_error', str(e))))
+
+    if corner_blocks:
+        corners = np.stack(corner_blocks).astype(np.float64, copy=False)
+        record_files = np.asarray(file_ids, dtype=np.int64)
+
+        def emit(mask: np.ndarray, code: str, message) -> None:
+            for row in np.flatnonzero(mask):
+                file_id = file_ids[row]
+                text = message(row) if callable(message) else message
+                found.append((file_id, lines[row], LintDiagnostic(file_paths[file_id], lines[row], code, text)))
+
+        # 几何检查：所有记录的角点拼接成 (N, 4, 2) 数组后一次完成
+        finite = np.isfinite(corners).all(axis=(1, 2))
+        emit(~finite, 'non_finite', "Coordinates contain NaN or infinity")
+
+        safe = np.where(finite[:, None, None], corners, 0.0)
+        out_of_range = finite & ((safe < -tolerance) | (safe > 1 + tolerance)).any(axis=(1, 2))
+        emit(out_of_range, 'out_of_range',
+             lambda row: f"Coordinates outside the image: min {corners[row].min():.6f}, "
+                         f"max {corners[row].max():.6f} (normalized)")
+
+        # 对称的“蝴蝶结”四边形有向面积也为零，先判断自相交
+        pixel = safe * [image_width, image_height]
+        self_intersecting = finite & quad_self_intersects(pixel)
+        emit(self_intersecting, 'self_intersecting',
+             "Polygon edges intersect (vertices are not in boundary order)")
+        emit(finite & ~self_intersecting & (np.abs(polygon_areas(pixel)) <= DEGENERATE_AREA),
+             'degenerate', "Polygon has zero area")
+
+        # 类别检查：YOLO 系列为类别ID，其他格式为类别名称
+        known = set(class_names) if class_names is not None else None
+        class_count = len(class_names) if class_names is not None else None
+        for row, class_key in enumerate(class_keys):
+            if isinstance(class_key, int):
+                unknown = class_key < 0 or (class_count is not None and class_key >= class_count)
+            else:
+                unknown = known is not None and class_key not in known
+            if unknown:
+                file_id = file_ids[row]
+                found.append((file_id, lines[row], LintDiagnostic(
+                    file_paths[file_id], lines[row], 'unknown_class',
+                    f"Class {class_key!r} not found in class_names")))
+
+        # 重复检查：同一文件中类别和（取整后的）坐标都相同的记录
+        class_codes: Dict[Any, int] = {}
+        codes = np.fromiter((class_codes.setdefault(key, len(class_codes)) for key in class_keys),
+                            dtype=np.int64, count=len(class_keys))
+        # 先限制范围，避免极大的坐标在取整时溢出
+        rounded = np.round(np.clip(safe, -1e6, 1e6) * 10 ** DUPLICATE_DECIMALS).astype(np.int64)
+        rounded = rounded.reshape(len(corners), 8)
+        keys = np.column_stack([record_files, codes, rounded])
+        _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        first_rows = first[inverse.reshape(-1)]
+        emit(finite & (first_rows != np.arange(len(corners))), 'duplicate',
+             lambda row: f"Duplicate of line {lines[first_rows[row]]}")
+
+    found.sort(key=lambda item: (item[0], item[1]))
+    report.diagnostics = [diagnostic for _, _, diagnostic in found]
+    return report
+
+
+def _lint_task(args) -> LintReport:
+    """进程池任务：检查一批文件"""
+    return lint_files(*args)
+
+
+def lint_paths(format_instance: BaseFormat, file_paths: Sequence[str],
+               image_width: int, image_height: int,
+               class_names: Optional[Sequence[str]] = None,
+               tolerance: float = 1e-6,
+               workers: Optional[int] = None,
+               chunk_size: int = 256) -> LintReport:
+    """
+    并行检查多个文件：按 chunk_size 分块提交到进程池，结果按输入顺序合并
+
+    Args:
+        format_instance: 输入格式实例
+        file_paths: 文件路径列表
+        image_width: 图片宽度
+        image_height: 图片高度
+        class_names: 类别名称列表（可选）
+        tolerance: 坐标范围检查允许的误差（归一化坐标）
+        workers: 工作进程数（默认为CPU核数，1 表示在当前进程中执行）
+        chunk_size: 每个任务检查的文件数
+
+    Returns:
+        LintReport: lint 报告
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    class_names = list(class_names) if class_names is not None else None
+    chunks = [
+        (format_instance, list(file_paths[start:start + chunk_size]),
+         image_width, image_height, class_names, tolerance)
+        for start in range(0, len(file_paths), chunk_size)
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) <= 1:
+        return _merge_reports(map(_lint_task, chunks))
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+        return _merge_reports(executor.map(_lint_task, chunks))
+
+
+def _merge_reports(partial_reports) -> LintReport:
+    """按顺序合并各批次的报告"""
+    report = LintReport()
+    for partial in partial_reports:
+        report.total_files += partial.total_files
+        report.total_records += partial.total_records
+        report.diagnostics.extend(partial.diagnostics)
+    return report
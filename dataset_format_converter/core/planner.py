@@ -0,0 +1,230 @@
+"""
+转换计划 - 转换前估计工作量（文件数、框数、输出大小、耗时），不写出任何文件
+
+只列出全部文件并解析一个随机样本：
+- 框密度、空文件比例、图片尺寸分布由样本估计
+- 耗时 = 校准表中的 解析 + 写出 开销 × 本机速度系数；
+  速度系数 = 样本的实测解析时间 / 校准表预测的样本解析时间
+- 输出文件名冲突（大小写不敏感的文件系统上同名、单文件数据集中重复的图片名）
+  和已存在的输出文件基于完整的文件列表检查
+"""
+
+import os
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, asdict, field
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from .base_format import BaseFormat, ParseStats
+from .class_table import ClassTable
+from .common_format import validation_level
+from .error_report import report_error
+from .image_utils import find_image_file, read_image_size
+
+
+class FormatCost(NamedTuple):
+    """单个格式的校准开销（微秒）和输出大小（字节）"""
+    parse_file_us: float
+    parse_box_us: float
+    write_file_us: float
+    write_box_us: float
+    bytes_per_file: float
+    bytes_per_box: float
+
+
+# 校准表：2000 个文件 × 2/40 个旋转框的合成数据集上测得（单核，strict 校验），
+# 按 开销 = 文件数 × 每文件开销 + 框数 × 每框开销 拟合
+FORMAT_COSTS: Dict[str, FormatCost] = {
+    'YOLO-HBB': FormatCost(54.0, 14.0, 72.0, 14.0, 0.0, 38.0),
+    'YOLO-OBB': FormatCost(54.0, 16.0, 42.0, 12.5, 0.0, 74.0),
+    'LabelImg-OBB': FormatCost(77.0, 29.0, 56.0, 1.5, 9.0, 54.5),
+    'DOTA': FormatCost(60.0, 24.5, 58.0, 10.0, 0.0, 95.5),
+    'PASCAL-VOC': FormatCost(75.0, 33.5, 200.0, 32.0, 215.0, 278.5),
+    'COCO': FormatCost(10.0, 31.0, 10.0, 51.0, 68.0, 193.0),
+}
+
+# 未在校准表中的格式（如自行注册的格式）使用的开销
+DEFAULT_FORMAT_COST = FormatCost(75.0, 30.0, 100.0, 30.0, 100.0, 200.0)
+
+# 本机速度系数的范围（样本过小或受磁盘缓存影响时避免极端估计）
+SPEED_FACTOR_RANGE = (0.1, 10.0)
+
+# 计划中最多列出的文件名冲突数
+MAX_COLLISION_EXAMPLES = 10
+
+
+@dataclass
+class ConversionPlan:
+    """
+    转换计划
+
+    Attributes:
+        input_format: 输入格式名称
+        output_format: 输出格式名称
+        total_files: 输入文件总数
+        sampled_files: 解析的样本文件数
+        failed_samples: 样本中解析失败的文件数
+        boxes_per_file: 样本中每条记录的平均框数
+        estimated_boxes: 估计的总框数
+        estimated_empty_files: 估计的没有框的记录数
+        estimated_output_bytes: 估计的输出大小（字节）
+        estimated_seconds: 估计的耗时（秒）
+        speed_factor: 本机速度系数（相对校准表，大于 1 表示更慢）
+        image_sizes: 样本中的图片尺寸分布（"宽x高" -> 记录数）
+        name_collisions: 输出文件名冲突的示例（每项为相互冲突的名称）
+        collision_count: 输出文件名冲突的组数
+        existing_outputs: 输出目录中已存在、将被覆盖的文件数
+    """
+    input_format: str
+    output_format: str
+    total_files: int = 0
+    sampled_files: int = 0
+    failed_samples: int = 0
+    boxes_per_file: float = 0.0
+    estimated_boxes: int = 0
+    estimated_empty_files: int = 0
+    estimated_output_bytes: int = 0
+    estimated_seconds: float = 0.0
+    speed_factor: float = 1.0
+    image_sizes: Dict[str, int] = field(default_factory=dict)
+    name_collisions: List[List[str]] = field(default_factory=list)
+    collision_count: int = 0
+    existing_outputs: int = 0
+
+    @property
+    def mixed_dimensions(self) -> bool:
+        """样本中是否有多种图片尺寸"""
+        return len(self.image_sizes) > 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return asdict(self)
+
+
+def format_bytes(size: float) -> str:
+    """
+    格式化字节数
+
+    Args:
+        size: 字节数
+
+    Returns:
+        str: 如 ``12.3 MB``
+    """
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def _stem_collisions(names: List[str]) -> List[List[str]]:
+    """大小写不敏感时输出文件名（不含扩展名）相同的名称组"""
+    groups: Dict[str, List[str]] = {}
+    for name in names:
+        groups.setdefault(os.path.splitext(name)[0].lower(), []).append(name)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def plan_conversion(input_fmt: BaseFormat, output_fmt: BaseFormat,
+                    file_paths: List[str], output_dir: str,
+                    image_width: int, image_height: int,
+                    class_names: Optional[List[str]] = None,
+                    image_dir: Optional[str] = None,
+                    sample_size: int = 200,
+                    seed: int = 0,
+                    validation: str = 'strict') -> ConversionPlan:
+    """
+    生成转换计划（只读，不写出任何文件）
+
+    Args:
+        input_fmt: 输入格式实例
+        output_fmt: 输出格式实例
+        file_paths: 输入文件路径列表
+        output_dir: 输出目录（检查将被覆盖的文件）
+        image_width: 图片宽度
+        image_height: 图片高度
+        class_names: 类别名称列表（可选，未指定时由样本动态扩展，不扫描全部文件）
+        image_dir: 图片目录（可选，读取样本图片的实际尺寸）
+        sample_size: 样本文件数
+        seed: 抽样随机种子
+        validation: 校验级别（strict / clip-only / trusted）
+
+    Returns:
+        ConversionPlan: 转换计划
+    """
+    if sample_size <= 0:
+        raise ValueError("sample_size must be positive")
+    plan = ConversionPlan(input_fmt.name, output_fmt.name, total_files=len(file_paths))
+    if not file_paths:
+        return plan
+
+    # 样本按文件名排序后一次解析（单文件数据集如 COCO 通常只有一个文件，即整体解析）
+    sample = random.Random(seed).sample(file_paths, min(sample_size, len(file_paths)))
+    sample.sort()
+    class_names = ClassTable.of(class_names) if class_names is not None else ClassTable()
+    started = time.perf_counter()
+    stats = ParseStats()
+    with validation_level(validation):
+        records = input_fmt.format2commonMulti(
+            os.path.dirname(sample[0]), image_width, image_height, class_names, file_paths=sample, stats=stats
+        )
+    parse_seconds = time.perf_counter() - started
+
+    plan.sampled_files = len(sample)
+    records_per_file = len(records) / len(sample)
+    plan.failed_samples = stats.failed_files
+
+    sample_boxes = sum(len(record.bounding_boxes) for record in records)
+    plan.boxes_per_file = sample_boxes / len(records) if records else 0.0
+    total_records = round(records_per_file * len(file_paths))
+    plan.estimated_boxes = round(plan.boxes_per_file * total_records)
+    empty = sum(1 for record in records if not record.bounding_boxes)
+    plan.estimated_empty_files = round(empty / len(records) * total_records) if records else 0
+
+    # 图片尺寸分布：有图片目录时读取图片头，否则为解析得到的尺寸（VOC/COCO 文件中记录的尺寸）
+    sizes = Counter()
+    for record in records:
+        size = (record.image_width, record.image_height)
+        if image_dir is not None:
+            image_path = find_image_file(image_dir, record.image_filename or '')
+            if image_path is not None:
+                try:
+                    size = read_image_size(image_path)
+                except Exception as e:
+                    report_error('image-size-read', image_path, e)
+        sizes[f"{size[0]}x{size[1]}"] += 1
+    plan.image_sizes = dict(sizes.most_common())
+
+    # 耗时：校准表开销 × 本机速度系数
+    input_cost = FORMAT_COSTS.get(input_fmt.name, DEFAULT_FORMAT_COST)
+    output_cost = FORMAT_COSTS.get(output_fmt.name, DEFAULT_FORMAT_COST)
+    predicted = (len(sample) * input_cost.parse_file_us + sample_boxes * input_cost.parse_box_us) * 1e-6
+    if predicted > 0 and parse_seconds > 0:
+        low, high = SPEED_FACTOR_RANGE
+        plan.speed_factor = min(max(parse_seconds / predicted, low), high)
+    total_us = (len(file_paths) * input_cost.parse_file_us + plan.estimated_boxes * input_cost.parse_box_us
+                + total_records * output_cost.write_file_us + plan.estimated_boxes * output_cost.write_box_us)
+    plan.estimated_seconds = total_us * 1e-6 * plan.speed_factor
+    plan.estimated_output_bytes = round(total_records * output_cost.bytes_per_file
+                                        + plan.estimated_boxes * output_cost.bytes_per_box)
+
+    # 输出文件名冲突：单文件数据集按记录的图片名检查，否则按输入文件名检查
+    if input_fmt.SINGLE_FILE_DATASET:
+        output_names = [record.image_filename or '' for record in records]
+    else:
+        output_names = [os.path.basename(file_path) for file_path in file_paths]
+    collisions = _stem_collisions(output_names)
+    plan.collision_count = len(collisions)
+    plan.name_collisions = collisions[:MAX_COLLISION_EXAMPLES]
+
+    if os.path.isdir(output_dir):
+        existing = set(os.listdir(output_dir))
+        if output_fmt.SINGLE_FILE_DATASET:
+            plan.existing_outputs = sum(1 for name in existing if name.endswith(output_fmt.file_extension))
+        else:
+            plan.existing_outputs = sum(
+                1 for name in output_names
+                if f"{os.path.splitext(name)[0]}{output_fmt.file_extension}" in existing
+            )
+    return plan
@@ -0,0 +1,230 @@
+"""
+标注预览 - 按需解析单个文件并生成预览画面（GUI 预览面板使用）
+
+预览面板可以在成千上万个文件之间翻页，因此：
+- 只在打开时列出文件，每个文件在第一次显示时才解析（COCO 等单文件数据集除外，
+  打开时解析一次，之后按图片翻页）
+- 解析结果（CommonFormat）和生成的画面（缩略图 + 多边形）分别放在 LRU 缓存中，
+  来回翻页时不重复解析和解码
+- 图片用 Pillow 的 draft 模式按目标尺寸解码（JPEG 直接以 1/2、1/4、1/8 分辨率解码），
+  再缩放到显示尺寸，不解码完整分辨率的像素
+"""
+
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+from .base_format import BaseFormat
+from .class_table import ClassTable
+from .common_format import CommonFormat, validation_level
+from .error_report import report_error
+from .image_utils import find_image_file, read_image_size
+
+
+class LRUCache:
+    """最近最少使用缓存（容量固定，超出时淘汰最久未访问的条目）"""
+
+    def __init__(self, capacity: int):
+        """
+        初始化缓存
+
+        Args:
+            capacity: 最大条目数
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        读取缓存，未命中时调用 factory 生成并写入
+
+        Args:
+            key: 缓存键
+            factory: 生成值的函数
+
+        Returns:
+            Any: 缓存的值
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        value = factory()
+        self._entries[key] = value
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+        return value
+
+
+@dataclass
+class PreviewFrame:
+    """
+    预览画面
+
+    Attributes:
+        name: 页面名称（图片文件名）
+        width: 显示宽度（像素）
+        height: 显示高度（像素）
+        image: 缩放到显示尺寸的图片（PIL.Image，找不到图片或未安装 Pillow 时为None）
+        polygons: (类别ID, 类别名称, 显示坐标 [x1, y1, ..., x4, y4]) 列表
+    """
+    name: str
+    width: int
+    height: int
+    image: Optional[Any]
+    polygons: List[Tuple[int, str, List[float]]]
+
+
+class AnnotationPreview:
+    """
+    标注预览器
+
+    用法::
+
+        preview = AnnotationPreview(input_fmt, file_paths, 1920, 1080, image_dir='./images')
+        frame = preview.render(0, 960, 640)
+    """
+
+    def __init__(self, input_fmt: BaseFormat, file_paths: List[str],
+                 image_width: int, image_height: int,
+                 class_names: Optional[List[str]] = None,
+                 image_dir: Optional[str] = None,
+                 cache_size: int = 64):
+        """
+        初始化预览器
+
+        Args:
+            input_fmt: 输入格式实例
+            file_paths: 输入文件路径列表
+            image_width: 默认图片宽度
+            image_height: 默认图片高度
+            class_names: 类别名称列表（可选）
+            image_dir: 图片目录（可选，用于读取实际尺寸和显示图片）
+            cache_size: 解析结果和画面缓存的容量
+        """
+        self.input_fmt = input_fmt
+        self.file_paths = list(file_paths)
+        self.image_width = image_width
+        self.image_height = image_height
+        self.class_names = ClassTable.of(class_names or [])
+        self.image_dir = image_dir
+        self._parsed = LRUCache(cache_size)
+        self._frames = LRUCache(cache_size)
+
+        # 单文件数据集（如 COCO）的一个文件包含所有图片，只能整体解析后按图片翻页
+        self._records: Optional[List[CommonFormat]] = None
+        if input_fmt.SINGLE_FILE_DATASET:
+            self._records = [record for file_path in self.file_paths for record in self._parse(file_path)]
+
+    def __len__(self) -> int:
+        """页数"""
+        return len(self._records) if self._records is not None else len(self.file_paths)
+
+    def page_name(self, index: int) -> str:
+        """页面名称（单文件数据集为图片文件名，否则为标注文件名）"""
+        if self._records is not None:
+            return self._records[index].image_filename or str(index)
+        return os.path.basename(self.file_paths[index])
+
+    def _image_path(self, stem: str) -> Optional[str]:
+        """查找与标注同名的图片"""
+        if self.image_dir is None or not stem:
+            return None
+        return find_image_file(self.image_dir, stem)
+
+    def _parse(self, file_path: str) -> List[CommonFormat]:
+        """解析一个文件（有图片时使用图片的实际尺寸）"""
+        size = (self.image_width, self.image_height)
+        image_path = self._image_path(os.path.splitext(os.path.basename(file_path))[0])
+        if image_path is not None:
+            try:
+                size = read_image_size(image_path)
+            except Exception as e:
+                report_error('image-size-read', image_path, e)
+        # 预览不应因个别越界坐标而失败
+        with validation_level('clip-only'):
+            return self.input_fmt.format2commonMulti(
+                os.path.dirname(file_path), size[0], size[1], self.class_names, file_paths=[file_path]
+            )
+
+    def load(self, index: int) -> Optional[CommonFormat]:
+        """
+        读取一页的中间格式数据（第一次访问时解析，之后从缓存读取）
+
+        Args:
+            index: 页码
+
+        Returns:
+            Optional[CommonFormat]: 中间格式数据，解析失败时返回None
+        """
+        if self._records is not None:
+            return self._records[index]
+        file_path = self.file_paths[index]
+        records = self._parsed.get_or_create(file_path, lambda: self._parse(file_path))
+        return records[0] if records else None
+
+    def render(self, index: int, max_width: int, max_height: int) -> Optional[PreviewFrame]:
+        """
+        生成一页的预览画面（按比例缩放到不超过 max_width × max_height，不放大）
+
+        Args:
+            index: 页码
+            max_width: 最大显示宽度
+            max_height: 最大显示高度
+
+        Returns:
+            Optional[PreviewFrame]: 预览画面，解析失败时返回None
+        """
+        return self._frames.get_or_create((index, max_width, max_height),
+                                          lambda: self._render(index, max_width, max_height))
+
+    def _render(self, index: int, max_width: int, max_height: int) -> Optional[PreviewFrame]:
+        """生成预览画面（不经过缓存）"""
+        common_data = self.load(index)
+        if common_data is None:
+            return None
+        scale = min(max_width / common_data.image_width, max_height / common_data.image_height, 1.0)
+        width = max(1, round(common_data.image_width * scale))
+        height = max(1, round(common_data.image_height * scale))
+
+        image = None
+        image_path = self._image_path(common_data.image_filename or '')
+        if image_path is not None:
+            try:
+                image = decode_thumbnail(image_path, width, height)
+            except Exception as e:
+                report_error('image-read', image_path, e)
+
+        polygons = []
+        for bbox in common_data.bounding_boxes:
+            coords = (bbox.corners * [width, height]).ravel().tolist()
+            polygons.append((bbox.class_id, bbox.class_name, coords))
+        return PreviewFrame(self.page_name(index), width, height, image, polygons)
+
+
+def decode_thumbnail(image_path: str, width: int, height: int):
+    """
+    以接近目标尺寸的分辨率解码图片并缩放到 width × height（需要 Pillow）
+
+    Args:
+        image_path: 图片路径
+        width: 目标宽度
+        height: 目标高度
+
+    Returns:
+        PIL.Image.Image: RGB 图片
+    """
+    from PIL import Image
+
+    with Image.open(image_path) as image:
+        # JPEG 按不小于目标尺寸的最小缩放比例直接解码，其他格式忽略此设置
+        image.draft('RGB', (width, height))
+        return image.convert('RGB').resize((width, height), Image.BILINEAR)
@@ -0,0 +1,126 @@
+"""
+转换进度 - 目录转换过程中的进度、吞吐量和剩余时间
+
+转换引擎每完成一个批次，ProgressTracker 生成一个新的 ConversionProgress 快照并交给回调。
+快照创建后不再修改，可以直接交给其他线程（如 GUI 主线程）读取。
+回调在转换线程中执行，应尽量轻量（例如只保存最新的快照，由界面按固定帧率读取）。
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass(frozen=True)
+class ConversionProgress:
+    """
+    转换进度快照
+
+    Attributes:
+        files_done: 已处理的文件数（含失败的文件）
+        files_total: 待处理的文件总数（不含因断点续传而跳过的文件）
+        records_done: 已写出的记录数（图片数，单文件数据集的一个文件包含多张图片）
+        boxes_done: 已写出的框数
+        failed_files: 转换失败的文件数
+        elapsed: 已用时间（秒）
+    """
+    files_done: int = 0
+    files_total: int = 0
+    records_done: int = 0
+    boxes_done: int = 0
+    failed_files: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def fraction(self) -> float:
+        """完成比例 [0, 1]"""
+        return min(self.files_done / self.files_total, 1.0) if self.files_total else 1.0
+
+    @property
+    def files_per_second(self) -> float:
+        """文件吞吐量（文件/秒）"""
+        return self.files_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def boxes_per_second(self) -> float:
+        """框吞吐量（框/秒）"""
+        return self.boxes_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """按当前平均吞吐量估计的剩余时间（秒），尚无法估计时为None"""
+        rate = self.files_per_second
+        if rate <= 0:
+            return None
+        return max(self.files_total - self.files_done, 0) / rate
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """
+    格式化时长
+
+    Args:
+        seconds: 秒数（None 表示未知）
+
+    Returns:
+        str: ``H:MM:SS`` 或 ``M:SS``，未知时为 ``--:--``
+    """
+    if seconds is None:
+        return "--:--"
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+class ProgressTracker:
+    """
+    进度累计器
+
+    用法::
+
+        tracker = ProgressTracker(len(files), callback)
+        for batch in batches:
+            ...
+            tracker.advance(len(batch), boxes, failed, records)
+    """
+
+    def __init__(self, files_total: int, callback: Callable[[ConversionProgress], None],
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        初始化进度累计器（立即以零进度调用一次回调）
+
+        Args:
+            files_total: 待处理的文件总数
+            callback: 进度回调，每次进度更新时以新的快照调用
+            clock: 计时函数（秒）
+        """
+        self.callback = callback
+        self.clock = clock
+        self.started = clock()
+        self.progress = ConversionProgress(files_total=files_total)
+        callback(self.progress)
+
+    def advance(self, files: int, boxes: int = 0, failed: int = 0, records: int = 0) -> ConversionProgress:
+        """
+        累计一个批次的进度并调用回调
+
+        Args:
+            files: 本批次处理完的文件数
+            boxes: 本批次写出的框数
+            failed: 本批次失败的文件数
+            records: 本批次写出的记录数
+
+        Returns:
+            ConversionProgress: 新的进度快照
+        """
+        previous = self.progress
+        self.progress = ConversionProgress(
+            files_done=previous.files_done + files,
+            files_total=previous.files_total,
+            records_done=previous.records_done + records,
+            boxes_done=previous.boxes_done + boxes,
+            failed_files=previous.failed_files + failed,
+            elapsed=self.clock() - self.started
+        )
+        self.callback(self.progress)
+        return self.progress
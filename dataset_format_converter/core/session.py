@@ -0,0 +1,165 @@
+"""
+转换会话 - 在大量 convert_file 调用之间复用格式实例、类别表和尺寸信息
+
+FormatManager.convert_file 每次调用都会重新解析格式、查找 classes.txt，
+并在未指定类别时额外读取一遍输入文件。逐个文件转换的服务应创建一个
+ConversionSession 并重复调用其 convert_file，结束时调用 close()（或使用 with 语句）
+写出类别表等辅助文件::
+
+    with format_manager.create_session('DOTA', 'YOLO-OBB', 1024, 1024) as session:
+        for input_file, output_file in jobs:
+            session.convert_file(input_file, output_file)
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .base_format import BaseFormat
+from .class_table import ClassTable
+from .common_format import validation_level, precision_mode
+from .geometry_utils import obb_fit_mode
+from .error_report import report_error
+from .image_utils import find_image_file, read_image_size
+
+
+class ConversionSession:
+    """
+    可复用的转换会话（线程安全）
+
+    - 格式实例在创建会话时解析一次
+    - 每个输入目录的 classes.txt 只查找和读取一次
+    - 没有 classes.txt 时，同一目录的所有文件共享一个动态类别表，
+      类别ID在整个会话中保持一致，不再为每个文件预先读取一遍
+    - 指定 image_dir 时，按文件名读取对应图片的尺寸并缓存
+    - convert_file 只写出标注文件；辅助文件（如 classes.txt、dataset.yaml）在 close() 时
+      按最终的类别表为每个输出目录写出一次（与 DatasetWriter.close 相同）
+    """
+
+    def __init__(self, input_fmt: BaseFormat, output_fmt: BaseFormat,
+                 image_width: int, image_height: int,
+                 class_names: Optional[List[str]] = None,
+                 image_dir: Optional[str] = None,
+                 validation: str = 'strict',
+                 precision: str = 'float64',
+                 obb_fit: str = 'edges'):
+        """
+        初始化转换会话
+
+        Args:
+            input_fmt: 输入格式实例
+            output_fmt: 输出格式实例
+            image_width: 默认图片宽度
+            image_height: 默认图片高度
+            class_names: 类别名称列表（可选，指定后所有文件共用）
+            image_dir: 图片目录（可选，用于读取每张图片的实际尺寸）
+            validation: 校验级别（strict / clip-only / trusted）
+            precision: 中间层坐标精度（float64 / float32）
+            obb_fit: 参数化 OBB 输出格式（如 LabelImg-OBB）的拟合方式（edges / min-area）
+        """
+        if image_width <= 0 or image_height <= 0:
+            raise ValueError("Image dimensions must be positive")
+
+        self.input_fmt = input_fmt
+        self.output_fmt = output_fmt
+        self.image_width = image_width
+        self.image_height = image_height
+        self.image_dir = image_dir
+        self.validation = validation
+        self.precision = precision
+        self.obb_fit = obb_fit
+
+        self._fixed_class_names = None if class_names is None else ClassTable.of(class_names)
+        self._lock = threading.Lock()
+        # 输入目录 -> 类别表
+        self._class_tables: Dict[str, ClassTable] = {}
+        self._image_sizes: Dict[str, Tuple[int, int]] = {}
+        # 输出目录 -> 写入该目录的类别表（close() 时写出辅助文件）
+        self._output_dirs: Dict[str, ClassTable] = {}
+
+    def _class_table_for(self, input_file: str) -> ClassTable:
+        """获取输入文件所在目录的类别表（带缓存）"""
+        if self._fixed_class_names is not None:
+            return self._fixed_class_names
+
+        dir_path = os.path.dirname(os.path.abspath(input_file))
+        with self._lock:
+            cached = self._class_tables.get(dir_path)
+            if cached is not None:
+                return cached
+
+            classes_file = os.path.join(dir_path, "classes.txt")
+            if os.path.isfile(classes_file):
+                with open(classes_file, 'r', encoding='utf-8') as f:
+                    table = ClassTable(line.strip() for line in f if line.strip())
+            else:
+                table = ClassTable()
+            self._class_tables[dir_path] = table
+            return table
+
+    def image_size_for(self, input_file: str) -> Tuple[int, int]:
+        """
+        获取输入文件对应图片的尺寸（带缓存）
+
+        Args:
+            input_file: 输入文件路径
+
+        Returns:
+            Tuple[int, int]: (宽度, 高度)；未指定图片目录或找不到图片时返回默认尺寸
+        """
+        if self.image_dir is None:
+            return self.image_width, self.image_height
+
+        stem = os.path.splitext(os.path.basename(input_file))[0]
+        with self._lock:
+            cached = self._image_sizes.get(stem)
+        if cached is not None:
+            return cached
+
+        size = (self.image_width, self.image_height)
+        image_path = find_image_file(self.image_dir, stem)
+        if image_path is not None:
+            try:
+                size = read_image_size(image_path)
+            except Exception as e:
+                report_error('image-size-read', image_path, e)
+
+        with self._lock:
+            self._image_sizes[stem] = size
+        return size
+
+    def convert_file(self, input_file: str, output_file: str) -> None:
+        """
+        转换单个文件
+
+        Args:
+            input_file: 输入文件路径
+            output_file: 输出文件路径
+        """
+        class_names = self._class_table_for(input_file)
+        image_width, image_height = self.image_size_for(input_file)
+
+        # ClassTable 支持并发追加，解析步骤无需加锁
+        with validation_level(self.validation), precision_mode(self.precision):
+            common_data = self.input_fmt.format2commonSolo(input_file, image_width, image_height, class_names)
+
+        output_dir = os.path.dirname(output_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        # 只写出标注文件，辅助文件在 close() 时一次写出
+        with obb_fit_mode(self.obb_fit):
+            self.output_fmt._common2format(common_data, output_file)
+        with self._lock:
+            self._output_dirs.setdefault(os.path.abspath(output_dir or '.'), common_data.class_names)
+
+    def close(self) -> None:
+        """为每个写入过标注文件的输出目录写出辅助文件（按当前的类别表，可重复调用）"""
+        with self._lock:
+            for output_dir, class_names in self._output_dirs.items():
+                self.output_fmt._write_sidecars(list(class_names), output_dir)
+
+    def __enter__(self) -> 'ConversionSession':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
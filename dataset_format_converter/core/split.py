@@ -0,0 +1,283 @@
+"""
+数据集划分 - 转换过程中将图片划分为 train/val/test 并直接写入对应子目录
+
+输出布局（与 YOLO-OBB dataset.yaml 中的路径一致）::
+
+    output_dir/
+        train/labels/...  train/images/...
+        val/labels/...    val/images/...
+        test/labels/...   test/images/...
+
+每个标注文件只写一次，直接写入所属划分的 labels 目录；指定图片目录时，
+图片以硬链接的方式放入 images 目录（跨文件系统时退化为复制）。
+"""
+
+import os
+import shutil
+import zlib
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .base_format import BaseFormat, DatasetWriter
+from .common_format import CommonFormat
+from .dataset_index import DatasetIndex
+from .error_report import record_error
+from .image_utils import find_image_file
+
+
+SPLIT_MODES = ('random', 'stratified', 'list')
+
+
+class DatasetSplitter:
+    """
+    数据集划分器
+
+    - random: 按 (种子, 文件名) 的哈希值划分，与处理顺序和批次大小无关
+    - stratified: 在线贪心分层，每张图片分配给其类别上缺口最大的划分，
+      使各划分的类别直方图接近目标比例
+    - list: 按划分列表文件分配，文件每行为 ``文件名 划分名``，
+      未列出的图片分配给第一个划分
+    """
+
+    def __init__(self, ratios: Dict[str, float], mode: str = 'random',
+                 seed: int = 0, list_file: Optional[str] = None):
+        """
+        初始化划分器
+
+        Args:
+            ratios: 划分名称 -> 比例（会被归一化），如 {'train': 0.8, 'val': 0.1, 'test': 0.1}
+            mode: 划分方式（random / stratified / list）
+            seed: 随机种子（random 模式）
+            list_file: 划分列表文件（list 模式）
+        """
+        if mode not in SPLIT_MODES:
+            raise ValueError(f"Invalid split mode '{mode}'. Available modes: {list(SPLIT_MODES)}")
+        if not ratios or any(ratio < 0 for ratio in ratios.values()) or sum(ratios.values()) <= 0:
+            raise ValueError("Split ratios must be non-negative and sum to a positive value")
+
+        self.split_names: List[str] = list(ratios)
+        weights = np.array([ratios[name] for name in self.split_names], dtype=np.float64)
+        self.ratios = weights / weights.sum()
+        self.mode = mode
+        self.seed = seed
+
+        self._assignments: Dict[str, int] = {}
+        if mode == 'list':
+            if list_file is None:
+                raise ValueError("list_file is required for list split mode")
+            self._load_list(list_file)
+
+        # stratified 模式的在线状态：各划分的类别计数和图片数
+        self._class_counts = np.zeros((len(self.split_names), 0), dtype=np.float64)
+        self._image_counts = np.zeros(len(self.split_names), dtype=np.float64)
+
+    @classmethod
+    def parse_ratios(cls, text: str) -> Dict[str, float]:
+        """
+        解析 ``train=0.8,val=0.1,test=0.1`` 形式的划分比例
+
+        Args:
+            text: 划分比例字符串
+
+        Returns:
+            Dict[str, float]: 划分名称 -> 比例
+        """
+        ratios: Dict[str, float] = {}
+        for item in text.split(','):
+            item = item.strip()
+            if not item:
+                continue
+            if '=' not in item:
+                raise ValueError(f"Invalid split ratio '{item}', expected 'name=ratio'")
+            name, ratio = item.split('=', 1)
+            ratios[name.strip()] = float(ratio)
+        return ratios
+
+    def _load_list(self, list_file: str) -> None:
+        """读取划分列表文件"""
+        split_ids = {name: split_id for split_id, name in enumerate(self.split_names)}
+        with open(list_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.split()
+                if not parts or parts[0].startswith('#'):
+                    continue
+                if len(parts) != 2 or parts[1] not in split_ids:
+                    raise ValueError(f"Invalid split list line '{line.strip()}'")
+                stem = os.path.splitext(os.path.basename(parts[0]))[0]
+                self._assignments[stem] = split_ids[parts[1]]
+
+    def _hash_unit(self, image_filename: str) -> float:
+        """将 (种子, 文件名) 映射到 [0, 1) 内的确定性数值"""
+        return zlib.crc32(f"{self.seed}:{image_filename}".encode('utf-8')) / 2 ** 32
+
+    def assign(self, common_data_list: Sequence[CommonFormat]) -> np.ndarray:
+        """
+        为一个批次的图片分配划分
+
+        Args:
+            common_data_list: 中间格式数据列表
+
+        Returns:
+            np.ndarray: 每张图片的划分序号 (M,)
+        """
+        names = [common_data.image_filename or '' for common_data in common_data_list]
+
+        if self.mode == 'random':
+            units = np.fromiter((self._hash_unit(name) for name in names), dtype=np.float64, count=len(names))
+            split_ids = np.searchsorted(np.cumsum(self.ratios), units, side='right')
+            return np.minimum(split_ids, len(self.split_names) - 1)
+
+        if self.mode == 'list':
+            return np.fromiter((self._assignments.get(name, 0) for name in names), dtype=np.int64, count=len(names))
+
+        return self._assign_stratified(common_data_list)
+
+    def _assign_stratified(self, common_data_list: Sequence[CommonFormat]) -> np.ndarray:
+        """
+        在线贪心分层划分
+
+        每张图片的分配依赖之前所有图片的分配结果，只能逐张进行；类别直方图一次性
+        以稀疏形式构建，逐张分配时只访问图片中出现的类别，代价与类别总数无关。
+        """
+        if not common_data_list:
+            return np.empty(0, dtype=np.int64)
+        index = DatasetIndex(common_data_list, common_data_list[0].class_names)
+
+        class_count = len(index.class_names)
+        if self._class_counts.shape[1] < class_count:
+            grown = np.zeros((len(self.split_names), class_count), dtype=np.float64)
+            grown[:, :self._class_counts.shape[1]] = self._class_counts
+            self._class_counts = grown
+
+        # 每张图片的稀疏类别直方图：(图片, 类别) 对计数，按图片、类别排序
+        # （只对出现过的组合计数，不分配 图片数 x 类别数 的稠密数组）
+        pairs, pair_counts = np.unique(index.image_ids.astype(np.int64) * class_count + index.class_ids,
+                                       return_counts=True)
+        bounds = np.searchsorted(pairs // max(class_count, 1), np.arange(index.image_count + 1)).tolist()
+        pair_classes = (pairs % max(class_count, 1)).tolist()
+        pair_counts = pair_counts.astype(np.float64).tolist()
+
+        # 逐张分配在 Python 列表上进行（每张图片只涉及少数几个类别，小数组上的 numpy 调用开销更大）
+        ratios = self.ratios.tolist()
+        class_counts = self._class_counts.tolist()
+        totals = self._class_counts.sum(axis=0).tolist()
+        image_counts = self._image_counts.tolist()
+        image_total = sum(image_counts)
+        split_ids = np.empty(index.image_count, dtype=np.int64)
+        for image_id in range(index.image_count):
+            histogram = list(zip(pair_classes[bounds[image_id]:bounds[image_id + 1]],
+                                 pair_counts[bounds[image_id]:bounds[image_id + 1]]))
+            if histogram:
+                # 各划分在该图片所含类别上的缺口（目标数量 - 已分配数量），按图片中的框数加权
+                weight = sum((totals[class_id] + count) * count for class_id, count in histogram)
+                deficits = [ratio * weight - sum(counts[class_id] * count for class_id, count in histogram)
+                            for ratio, counts in zip(ratios, class_counts)]
+            else:
+                # 没有框的图片按图片数的缺口分配
+                deficits = [ratio * (image_total + 1) - count for ratio, count in zip(ratios, image_counts)]
+            split_id = deficits.index(max(deficits))
+            split_ids[image_id] = split_id
+            for class_id, count in histogram:
+                class_counts[split_id][class_id] += count
+                totals[class_id] += count
+            image_counts[split_id] += 1
+            image_total += 1
+
+        self._class_counts = np.array(class_counts, dtype=np.float64).reshape(self._class_counts.shape)
+        self._image_counts = np.array(image_counts, dtype=np.float64)
+        return split_ids
+
+
+def _link_or_copy(source: str, target: str) -> None:
+    """硬链接文件，不支持时（如跨文件系统）复制"""
+    if os.path.exists(target):
+        return
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+class SplitDatasetWriter(DatasetWriter):
+    """
+    划分数据集写入器 - 按划分器的分配将每个批次写入 <split>/labels，
+    并将对应图片链接到 <split>/images
+    """
+
+    def __init__(self, format_instance: BaseFormat, output_dir: str,
+                 splitter: DatasetSplitter, image_dir: Optional[str] = None):
+        """
+        初始化写入器
+
+        Args:
+            format_instance: 输出格式实例
+            output_dir: 输出根目录
+            splitter: 数据集划分器
+            image_dir: 图片目录（可选）
+        """
+        super().__init__(format_instance, output_dir)
+        self.splitter = splitter
+        self.image_dir = image_dir
+        self.split_counts: Dict[str, int] = {name: 0 for name in splitter.split_names}
+        # 整个数据集保存为单个文件的格式（如 COCO），每个划分使用独立的写入器
+        self._sub_writers: Dict[str, DatasetWriter] = {}
+
+    def split_dir(self, split_name: str, kind: str = 'labels') -> str:
+        """获取划分的 labels/images 目录"""
+        return os.path.join(self.output_dir, split_name, kind)
+
+    def write_batch(self, common_data_list: List[CommonFormat]) -> List[CommonFormat]:
+        """
+        写出一个批次
+
+        Args:
+            common_data_list: 中间格式数据列表
+
+        Returns:
+            List[CommonFormat]: 写出失败的记录
+        """
+        if not common_data_list:
+            return []
+        self._class_names = common_data_list[-1].class_names
+        failed = []
+
+        split_ids = self.splitter.assign(common_data_list)
+        for split_id, split_name in enumerate(self.splitter.split_names):
+            members = [common_data_list[i] for i in np.flatnonzero(split_ids == split_id)]
+            if not members:
+                continue
+
+            labels_dir = self.split_dir(split_name)
+            if self.format_instance.SINGLE_FILE_DATASET:
+                if split_name not in self._sub_writers:
+                    self._sub_writers[split_name] = self.format_instance.open_dataset_writer(labels_dir)
+                split_failed = self._sub_writers[split_name].write_batch(members)
+            else:
+                split_failed = self.format_instance._write_labels(members, labels_dir)
+            self.split_counts[split_name] += len(members) - len(split_failed)
+            failed.extend(split_failed)
+
+            if self.image_dir is not None:
+                self._link_images(members, split_name)
+        return failed
+
+    def _link_images(self, common_data_list: List[CommonFormat], split_name: str) -> None:
+        """将图片硬链接到划分的 images 目录"""
+        images_dir = self.split_dir(split_name, 'images')
+        os.makedirs(images_dir, exist_ok=True)
+        for common_data in common_data_list:
+            image_path = find_image_file(self.image_dir, common_data.image_filename or '')
+            if image_path is None:
+                record_error('image-missing', common_data.image_filename or '', 'FileNotFoundError',
+                             f"图片目录 {self.image_dir} 中没有同名图片")
+                continue
+            _link_or_copy(image_path, os.path.join(images_dir, os.path.basename(image_path)))
+
+    def close(self) -> None:
+        """结束写入，写出各划分的辅助文件"""
+        for writer in self._sub_writers.values():
+            writer.close()
+        if self._class_names is not None:
+            used_splits = [name for name, count in self.split_counts.items() if count]
+            self.format_instance._write_split_sidecars(self._class_names, self.output_dir, used_splits)
@@ -0,0 +1,155 @@
+"""
+数据集统计 - 在转换过程中按批次增量累计统计信息
+
+统计项：各类别的框数和图片数、空图片数、框尺寸（面积平方根，像素）直方图、
+长宽比直方图，以及旋转框的角度分布。每个批次构建一次列式索引，
+所有直方图均由 numpy 一次完成，开销与解析相比可以忽略。
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .class_table import ClassTable
+from .common_format import CommonFormat
+from .dataset_index import DatasetIndex
+
+
+# 默认直方图分箱
+SIZE_BINS = (0, 8, 16, 32, 64, 128, 256, 512, 1024, np.inf)
+ASPECT_BINS = (1, 1.5, 2, 3, 4, 6, 8, 16, np.inf)
+ANGLE_BINS = tuple(range(-90, 91, 15))
+
+# 第一条边与水平或竖直方向的夹角在此范围内（度）的框视为水平框
+_AXIS_ALIGNED_TOLERANCE = 1e-3
+
+
+def _bin_labels(bins: Sequence[float]) -> List[str]:
+    """生成分箱标签，如 '16~32'、'1024+'"""
+    labels = []
+    for low, high in zip(bins[:-1], bins[1:]):
+        low_text = f"{low:g}"
+        labels.append(f"{low_text}+" if np.isinf(high) else f"{low_text}~{high:g}")
+    return labels
+
+
+class DatasetStatistics:
+    """
+    数据集统计收集器
+
+    用法::
+
+        stats = DatasetStatistics()
+        for batch in batches:
+            stats.update(batch)
+        print(stats.to_dict())
+    """
+
+    def __init__(self, class_names: Optional[List[str]] = None,
+                 size_bins: Sequence[float] = SIZE_BINS,
+                 aspect_bins: Sequence[float] = ASPECT_BINS,
+                 angle_bins: Sequence[float] = ANGLE_BINS):
+        """
+        初始化统计收集器
+
+        Args:
+            class_names: 类别表（可选，默认使用第一个批次的类别表）
+            size_bins: 框尺寸直方图分箱（面积平方根，像素）
+            aspect_bins: 长宽比直方图分箱
+            angle_bins: 旋转框角度直方图分箱（度）
+        """
+        self.class_names = None if class_names is None else ClassTable.of(class_names)
+        self.size_bins = np.asarray(size_bins, dtype=np.float64)
+        self.aspect_bins = np.asarray(aspect_bins, dtype=np.float64)
+        self.angle_bins = np.asarray(angle_bins, dtype=np.float64)
+
+        self.image_count = 0
+        self.empty_image_count = 0
+        self.box_count = 0
+        self.rotated_box_count = 0
+        self.class_box_counts = np.zeros(0, dtype=np.int64)
+        self.class_image_counts = np.zeros(0, dtype=np.int64)
+        self.size_histogram = np.zeros(len(self.size_bins) - 1, dtype=np.int64)
+        self.aspect_histogram = np.zeros(len(self.aspect_bins) - 1, dtype=np.int64)
+        self.angle_histogram = np.zeros(len(self.angle_bins) - 1, dtype=np.int64)
+
+    def _grow_class_counts(self, class_count: int) -> None:
+        """类别表增长时扩展按类别计数的数组"""
+        if len(self.class_box_counts) < class_count:
+            extra = class_count - len(self.class_box_counts)
+            self.class_box_counts = np.concatenate([self.class_box_counts, np.zeros(extra, dtype=np.int64)])
+            self.class_image_counts = np.concatenate([self.class_image_counts, np.zeros(extra, dtype=np.int64)])
+
+    def update(self, common_data_list: Sequence[CommonFormat]) -> None:
+        """
+        累计一个批次
+
+        Args:
+            common_data_list: 中间格式数据列表
+        """
+        if not common_data_list:
+            return
+        if self.class_names is None:
+            self.class_names = ClassTable.of(common_data_list[0].class_names)
+        self.update_index(DatasetIndex(common_data_list, self.class_names))
+
+    def update_index(self, index: DatasetIndex) -> None:
+        """
+        从已构建的列式索引累计一个批次
+
+        Args:
+            index: 数据集索引（类别ID需对应本收集器的类别表）
+        """
+        if self.class_names is None:
+            self.class_names = index.class_names
+
+        boxes_per_image = np.diff(index.offsets)
+        self.image_count += index.image_count
+        self.empty_image_count += int(np.count_nonzero(boxes_per_image == 0))
+        self.box_count += len(index)
+        if not len(index):
+            return
+
+        valid = index.class_ids >= 0
+        class_ids = index.class_ids[valid]
+        self._grow_class_counts(len(index.class_names))
+        self.class_box_counts[:len(index.class_names)] += np.bincount(class_ids, minlength=len(index.class_names))
+        for class_id, images in index._postings.items():
+            self.class_image_counts[class_id] += len(images)
+
+        self.size_histogram += np.histogram(np.sqrt(index.areas[valid]), bins=self.size_bins)[0]
+        aspects = index.aspect_ratios[valid]
+        self.aspect_histogram += np.histogram(aspects[np.isfinite(aspects)], bins=self.aspect_bins)[0]
+
+        # 旋转框角度：第一条边（左上 -> 右上）在像素坐标下与 x 轴的夹角，归一化到 [-90, 90)
+        corners = index.corners[valid]
+        image_ids = index.image_ids[valid]
+        dx = (corners[:, 1, 0] - corners[:, 0, 0]) * index.image_widths[image_ids]
+        dy = (corners[:, 1, 1] - corners[:, 0, 1]) * index.image_heights[image_ids]
+        angles = (np.degrees(np.arctan2(dy, dx)) + 90.0) % 180.0 - 90.0
+        # 角点顺序未统一时，水平框的第一条边可能是竖直边（-90°），按与最近坐标轴的夹角判断
+        axis_offset = angles % 90.0
+        rotated = np.minimum(axis_offset, 90.0 - axis_offset) > _AXIS_ALIGNED_TOLERANCE
+        self.rotated_box_count += int(np.count_nonzero(rotated))
+        self.angle_histogram += np.histogram(angles[rotated], bins=self.angle_bins)[0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式（可直接序列化为 JSON）"""
+        class_names = list(self.class_names or [])
+        self._grow_class_counts(len(class_names))
+        return {
+            'images': self.image_count,
+            'empty_images': self.empty_image_count,
+            'boxes': self.box_count,
+            'rotated_boxes': self.rotated_box_count,
+            'classes': {
+                name: {
+                    'boxes': int(self.class_box_counts[class_id]),
+                    'images': int(self.class_image_counts[class_id])
+                }
+                for class_id, name in enumerate(class_names)
+            },
+            'box_size_px': dict(zip(_bin_labels(self.size_bins), self.size_histogram.tolist())),
+            'aspect_ratio': dict(zip(_bin_labels(self.aspect_bins), self.aspect_histogram.tolist())),
+            'angle_deg': dict(zip(_bin_labels(self.angle_bins), self.angle_histogram.tolist())),
+        }
@@ -0,0 +1,249 @@
+"""
+图片切片 - 将大尺寸图片（如 DOTA 航拍图）的标注切分为带重叠的固定尺寸切片
+
+每张图片的切片网格沿 x、y 方向分别确定（步长 = 切片尺寸 - 重叠，最后一片贴齐图片边缘）。
+框与切片的对应关系由网格查找一次得到：框的外接矩形在每个方向上覆盖的切片是连续区间，
+用 searchsorted 求出区间端点后展开为 (框, 切片) 对，总开销与这些对的数量成正比，
+而不是 框数 × 切片数。
+跨越切片边界的框按多边形裁剪（见 core/clipping.py），可见比例低于阈值的部分被丢弃。
+
+切片记录的图片文件名为 ``<原文件名>__<左>__<上>``，例如 ``P0001__824__0``。
+"""
+
+import os
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from .clipping import CLIP_MODES, ClipStats, clip_change, quads_from_clipped
+from .common_format import CommonFormat, make_bounding_box, validation_level
+from .dataset_index import DatasetIndex
+from .geometry_utils import clip_polygons_to_rect, polygon_areas
+
+
+# 框的坐标超出切片不超过此值（归一化坐标）时视为完全在切片内
+TILE_TOLERANCE = 1e-9
+
+
+@dataclass
+class Tile:
+    """
+    切片
+
+    Attributes:
+        source: 原图片文件名（不含扩展名）
+        left: 切片左边界（像素）
+        top: 切片上边界（像素）
+        width: 切片宽度（像素）
+        height: 切片高度（像素）
+    """
+    source: str
+    left: int
+    top: int
+    width: int
+    height: int
+
+    @property
+    def name(self) -> str:
+        """切片的图片文件名（不含扩展名）"""
+        return f"{self.source}__{self.left}__{self.top}"
+
+
+def tile_origins(length: int, tile_size: int, stride: int) -> np.ndarray:
+    """
+    计算一个方向上的切片起点
+
+    Args:
+        length: 图片在该方向上的尺寸（像素）
+        tile_size: 切片尺寸
+        stride: 步长
+
+    Returns:
+        np.ndarray: 切片起点（升序），最后一片贴齐图片边缘；图片小于切片时只有起点 0
+    """
+    if length <= tile_size:
+        return np.zeros(1, dtype=np.int64)
+    origins = np.arange(0, length - tile_size, stride, dtype=np.int64)
+    return np.append(origins, length - tile_size)
+
+
+def _covered_range(low: np.ndarray, high: np.ndarray, origins: np.ndarray,
+                   size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """区间 (low, high) 在一个方向上覆盖的切片序号范围 [first, last]（last < first 表示没有）"""
+    first = np.searchsorted(origins + size, low, side='right')
+    last = np.searchsorted(origins, high, side='left') - 1
+    return first, np.minimum(last, len(origins) - 1)
+
+
+class ImageTiler:
+    """
+    标注切片器
+
+    用法::
+
+        tiler = ImageTiler(tile_size=1024, overlap=200)
+        for tile, tile_data in tiler.tile(common_data):
+            ...
+    """
+
+    def __init__(self, tile_size: int = 1024, overlap: int = 200,
+                 min_visibility: float = 0.5, clip_mode: str = 'polygon',
+                 keep_empty: bool = False):
+        """
+        初始化切片器
+
+        Args:
+            tile_size: 切片尺寸（像素，正方形）
+            overlap: 相邻切片的重叠（像素）
+            min_visibility: 框被切片截断后保留的最小可见比例（切片内面积 / 原面积）
+            clip_mode: 被截断的框还原为四个角点的方式（polygon / min-area）
+            keep_empty: 是否输出没有框的切片
+        """
+        if tile_size <= 0:
+            raise ValueError("tile_size must be positive")
+        if not 0 <= overlap < tile_size:
+            raise ValueError(f"overlap must be in [0, tile_size), got {overlap}")
+        if not 0 <= min_visibility <= 1:
+            raise ValueError(f"min_visibility must be in [0, 1], got {min_visibility}")
+        if clip_mode not in CLIP_MODES:
+            raise ValueError(f"Invalid clip mode '{clip_mode}'. Available modes: {list(CLIP_MODES)}")
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.min_visibility = min_visibility
+        self.clip_mode = clip_mode
+        self.keep_empty = keep_empty
+        self.stats = ClipStats()
+
+    def tile(self, common_data: CommonFormat) -> List[Tuple[Tile, CommonFormat]]:
+        """
+        切分一张图片的标注
+
+        被切片截断的框计入 self.stats.clipped_boxes（形变比例见 ClipStats），
+        可见比例不足而丢弃的部分计入 removed_boxes。
+
+        Args:
+            common_data: 中间格式数据（坐标未经逐坐标裁剪时，图片外的部分同样被切片边界裁掉）
+
+        Returns:
+            List[Tuple[Tile, CommonFormat]]: (切片, 切片的中间格式数据) 列表，按行优先顺序排列
+        """
+        width, height = common_data.image_width, common_data.image_height
+        stride = self.tile_size - self.overlap
+        origins_x = tile_origins(width, self.tile_size, stride)
+        origins_y = tile_origins(height, self.tile_size, stride)
+        tile_width, tile_height = min(self.tile_size, width), min(self.tile_size, height)
+        tile_count = len(origins_x) * len(origins_y)
+        source = common_data.image_filename or ''
+
+        index = DatasetIndex([common_data], common_data.class_names)
+        finite = np.isfinite(index.corners).all(axis=(1, 2))
+        pixel = np.where(finite[:, None, None], index.corners, 0.0) * [width, height]
+
+        # 网格查找：每个框在 x、y 方向覆盖的切片序号区间，展开为 (框, 切片) 对
+        first_x, last_x = _covered_range(pixel[..., 0].min(axis=1), pixel[..., 0].max(axis=1), origins_x, tile_width)
+        first_y, last_y = _covered_range(pixel[..., 1].min(axis=1), pixel[..., 1].max(axis=1), origins_y, tile_height)
+        count_x = np.maximum(last_x - first_x + 1, 0)
+        count_y = np.maximum(last_y - first_y + 1, 0)
+        pair_counts = np.where(finite, count_x * count_y, 0)
+        box_ids = np.repeat(np.arange(len(index)), pair_counts)
+        offsets = np.arange(len(box_ids)) - np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+        tile_x = first_x[box_ids] + offsets % count_x[box_ids]
+        tile_y = first_y[box_ids] + offsets // count_x[box_ids]
+        tile_ids = tile_y * len(origins_x) + tile_x
+
+        # 转换为切片内的归一化坐标
+        tile_scale = np.array([tile_width, tile_height], dtype=np.float64)
+        origins = np.column_stack([origins_x[tile_x], origins_y[tile_y]]).astype(np.float64)
+        local = (pixel[box_ids] - origins[:, None, :]) / tile_scale
+
+        crossing = ((local < -TILE_TOLERANCE) | (local > 1 + TILE_TOLERANCE)).any(axis=(1, 2))
+        keep = np.ones(len(box_ids), dtype=bool)
+        rows = np.flatnonzero(crossing)
+        if len(rows):
+            polygons, vertex_counts = clip_polygons_to_rect(local[rows])
+            scale = np.broadcast_to(tile_scale, (len(rows), 1, 2))
+            original_areas = np.abs(polygon_areas(local[rows] * scale))
+            clipped_areas = np.where(vertex_counts >= 3, np.abs(polygon_areas(polygons * scale)), 0.0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                visibility = np.where(original_areas > 0, clipped_areas / original_areas, 0.0)
+            visible = (vertex_counts >= 3) & (clipped_areas > 0) & (visibility >= self.min_visibility)
+            keep[rows[~visible]] = False
+
+            kept = rows[visible]
+            fitted = quads_from_clipped(polygons[visible], vertex_counts[visible], scale[visible], self.clip_mode)
+            change = clip_change(local[kept], fitted, scale[visible])
+            local[kept] = fitted
+            self.stats.merge(ClipStats(
+                clipped_boxes=len(kept), removed_boxes=int(np.count_nonzero(~visible)),
+                change_sum=float(change.sum()),
+                change_max=float(change.max()) if len(kept) else 0.0
+            ))
+        local = np.clip(local, 0.0, 1.0)
+
+        # 按切片分组（稳定排序，切片内保持原来的框顺序）
+        box_ids, tile_ids, local = box_ids[keep], tile_ids[keep], local[keep]
+        order = np.argsort(tile_ids, kind='stable')
+        box_ids, tile_ids, local = box_ids[order], tile_ids[order], local[order]
+        bounds = np.searchsorted(tile_ids, np.arange(tile_count + 1))
+
+        class_names = index.class_names
+        class_ids = index.class_ids.tolist()
+        confidences = index.confidences.tolist()
+        difficulties = index.difficulties.tolist()
+        box_ids = box_ids.tolist()
+
+        results = []
+        # 切片内的坐标已裁剪到 [0, 1]，构造对象时无需再次检查
+        with validation_level('trusted'):
+            for tile_id in range(tile_count):
+                start, end = bounds[tile_id], bounds[tile_id + 1]
+                if start == end and not self.keep_empty:
+                    continue
+                tile = Tile(source, int(origins_x[tile_id % len(origins_x)]),
+                            int(origins_y[tile_id // len(origins_x)]), tile_width, tile_height)
+                bounding_boxes = []
+                for row in range(start, end):
+                    box = box_ids[row]
+                    bounding_boxes.append(make_bounding_box(
+                        class_name=class_names[class_ids[box]],
+                        corners=local[row],
+                        class_id=class_ids[box],
+                        confidence=None if np.isnan(confidences[box]) else confidences[box],
+                        difficulty=None if difficulties[box] < 0 else difficulties[box]
+                    ))
+                results.append((tile, CommonFormat(
+                    image_width=tile_width,
+                    image_height=tile_height,
+                    bounding_boxes=bounding_boxes,
+                    class_names=class_names,
+                    image_filename=tile.name
+                )))
+        return results
+
+
+def crop_tiles(image_path: str, tiles: List[Tile], output_dir: str) -> int:
+    """
+    从原图中裁出切片图片（需要 Pillow）
+
+    Args:
+        image_path: 原图路径
+        tiles: 同一张原图的切片列表
+        output_dir: 切片图片输出目录（文件名为 Tile.name，扩展名与原图相同）
+
+    Returns:
+        int: 写出的切片图片数
+    """
+    from PIL import Image
+
+    if not tiles:
+        return 0
+    os.makedirs(output_dir, exist_ok=True)
+    extension = os.path.splitext(image_path)[1]
+    with Image.open(image_path) as image:
+        image.load()
+        for tile in tiles:
+            crop = image.crop((tile.left, tile.top, tile.left + tile.width, tile.top + tile.height))
+            crop.save(os.path.join(output_dir, f"{tile.name}{extension}"))
+    return len(tiles)
+
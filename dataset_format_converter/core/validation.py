@@ -0,0 +1,165 @@
+"""
+数据集校验 - 一次性向量化检查整个数据集的中间格式数据
+
+与 BoundingBox/CommonFormat 构造时的逐个检查不同，这里在所有边界框的角点
+拼接成的一个数组上完成检查，并报告全部违规项而不是在第一个错误处中止。
+通常与 trusted 校验级别配合使用：先快速构造对象，再统一校验。
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .common_format import CommonFormat
+from .class_table import ClassTable
+
+
+@dataclass
+class ValidationIssue:
+    """
+    单个违规项
+
+    Attributes:
+        image_filename: 图片文件名
+        box_index: 边界框在图片中的序号（图片级问题为None）
+        kind: 违规类型
+        message: 说明
+    """
+    image_filename: Optional[str]
+    box_index: Optional[int]
+    kind: str
+    message: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            'image_filename': self.image_filename,
+            'box_index': self.box_index,
+            'kind': self.kind,
+            'message': self.message
+        }
+
+
+@dataclass
+class ValidationReport:
+    """
+    校验报告
+
+    Attributes:
+        total_images: 图片数
+        total_boxes: 边界框数
+        issues: 违规项列表
+    """
+    total_images: int = 0
+    total_boxes: int = 0
+    issues: List[ValidationIssue] = field(default_factory=list)
+
+    @property
+    def is_valid(self) -> bool:
+        """是否没有任何违规项"""
+        return not self.issues
+
+    def counts(self) -> Dict[str, int]:
+        """按违规类型统计数量"""
+        counts: Dict[str, int] = {}
+        for issue in self.issues:
+            counts[issue.kind] = counts.get(issue.kind, 0) + 1
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            'total_images': self.total_images,
+            'total_boxes': self.total_boxes,
+            'counts': self.counts(),
+            'issues': [issue.to_dict() for issue in self.issues]
+        }
+
+
+def validate(common_data_list: List[CommonFormat], tolerance: float = 1e-6) -> ValidationReport:
+    """
+    校验整个数据集，报告所有违规项
+
+    检查项：
+    - invalid_image_size: 图片尺寸不是正数
+    - invalid_corners_shape: 角点不是 (4, 2) 数组
+    - non_finite: 坐标包含 NaN 或无穷大
+    - out_of_range: 坐标超出 [0, 1]（允许 tolerance 的误差）
+    - unknown_class: 类别名称不在类别表中
+
+    Args:
+        common_data_list: 中间格式数据列表
+        tolerance: 坐标范围检查允许的误差
+
+    Returns:
+        ValidationReport: 校验报告
+    """
+    report = ValidationReport(total_images=len(common_data_list))
+    issues = report.issues
+
+    corner_blocks = []
+    image_indices = []
+    box_indices = []
+    # 按类别表对象分组收集类别名称，共享类别表的数据集只需一次成员检查
+    names_by_table: Dict[int, List[Any]] = {}
+
+    for image_index, common_data in enumerate(common_data_list):
+        name = common_data.image_filename
+        if common_data.image_width <= 0 or common_data.image_height <= 0:
+            issues.append(ValidationIssue(
+                name, None, 'invalid_image_size',
+                f"Image dimensions must be positive, got {common_data.image_width}x{common_data.image_height}"
+            ))
+
+        table_entry = names_by_table.setdefault(id(common_data.class_names), [common_data.class_names, [], []])
+        for box_index, bbox in enumerate(common_data.bounding_boxes):
+            report.total_boxes += 1
+            table_entry[1].append(bbox.class_name)
+            table_entry[2].append((image_index, box_index))
+
+            corners = np.asarray(bbox.corners)
+            if corners.shape != (4, 2):
+                issues.append(ValidationIssue(
+                    name, box_index, 'invalid_corners_shape',
+                    f"corners must be a (4, 2) array, got shape {corners.shape}"
+                ))
+                continue
+            corner_blocks.append(corners)
+            image_indices.append(image_index)
+            box_indices.append(box_index)
+
+    # 坐标检查：所有角点拼接成 (N, 4, 2) 数组后一次完成
+    if corner_blocks:
+        corners = np.stack(corner_blocks).astype(np.float64, copy=False)
+        non_finite = ~np.isfinite(corners).all(axis=(1, 2))
+        with np.errstate(invalid='ignore'):
+            out_of_range = ((corners < -tolerance) | (corners > 1 + tolerance)).any(axis=(1, 2)) & ~non_finite
+
+        for row in np.flatnonzero(non_finite):
+            issues.append(ValidationIssue(
+                common_data_list[image_indices[row]].image_filename, box_indices[row],
+                'non_finite', "Coordinates contain NaN or infinity"
+            ))
+        for row in np.flatnonzero(out_of_range):
+            issues.append(ValidationIssue(
+                common_data_list[image_indices[row]].image_filename, box_indices[row],
+                'out_of_range',
+                f"Coordinates outside [0, 1]: min {corners[row].min():.6f}, max {corners[row].max():.6f}"
+            ))
+
+    # 类别检查：每个类别表一次哈希查找
+    for class_names, box_class_names, positions in names_by_table.values():
+        if not box_class_names:
+            continue
+        class_table = ClassTable.of(class_names)
+        known = np.fromiter((class_name in class_table for class_name in box_class_names),
+                            dtype=bool, count=len(box_class_names))
+        for row in np.flatnonzero(~known):
+            image_index, box_index = positions[row]
+            issues.append(ValidationIssue(
+                common_data_list[image_index].image_filename, box_index,
+                'unknown_class', f"Class '{box_class_names[row]}' not found in class_names"
+            ))
+
+    return report
@@ -0,0 +1,271 @@
+"""
+分布式工作队列 - 基于 SQLite 的批次租约队列
+
+多个工作进程（同一主机或共享文件系统的多台主机）从同一个 SQLite 数据库中
+租用文件批次。租约超时后，崩溃进程未完成的批次会重新回到队列；
+同一批次租用 max_attempts 次仍未完成时标记为 failed，不再重试。
+
+注意：
+- 跨主机使用时，各主机的时钟需要同步（租约过期基于 time.time()）
+- 数据库使用默认的回滚日志模式，以兼容不支持 WAL 的网络文件系统
+"""
+
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+
+def shard_for(file_name: str, shard_count: int) -> int:
+    """
+    计算文件所属的分片（确定性哈希划分）
+
+    使用 CRC32 而不是内置 hash()，保证不同进程、不同主机上结果一致。
+
+    Args:
+        file_name: 输入文件名（相对输入目录）
+        shard_count: 分片总数
+
+    Returns:
+        int: 分片索引（0 ~ shard_count-1）
+    """
+    return zlib.crc32(file_name.encode('utf-8')) % shard_count
+
+
+class WorkQueue:
+    """
+    SQLite 工作队列
+
+    每个批次的状态为 pending（待处理）、leased（已租用）、done（已完成）或
+    failed（有文件写出失败，或已租用 max_attempts 次仍未完成，例如每次都导致工作进程崩溃）。
+    """
+
+    PENDING = 'pending'
+    LEASED = 'leased'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, db_path: str, lease_timeout: float = 600.0, max_attempts: int = 3):
+        """
+        初始化工作队列
+
+        Args:
+            db_path: SQLite 数据库文件路径
+            lease_timeout: 租约超时时间（秒）
+            max_attempts: 每个批次最多租用的次数，超过后标记为 failed
+        """
+        if lease_timeout <= 0:
+            raise ValueError("lease_timeout must be positive")
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be positive")
+
+        self.db_path = db_path
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        # isolation_level=None：由我们显式控制事务
+        self._conn = sqlite3.connect(db_path, timeout=60.0, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS batches ("
+            " id INTEGER PRIMARY KEY,"
+            " files TEXT NOT NULL,"
+            " state TEXT NOT NULL,"
+            " worker TEXT,"
+            " lease_expires REAL,"
+            " attempts INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS batches_state ON batches (state, lease_expires)"
+        )
+        # 队列元数据（如输入文件列表的指纹）
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+
+    @staticmethod
+    def default_worker_id() -> str:
+        """生成默认的工作进程标识：主机名:进程号"""
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        self._conn.close()
+
+    @staticmethod
+    def _fingerprint(file_names: List[str], batch_size: int) -> str:
+        """输入文件列表和批次大小的指纹"""
+        return hashlib.sha1(json.dumps([batch_size, file_names]).encode('utf-8')).hexdigest()
+
+    def populate(self, file_names: List[str], batch_size: int) -> int:
+        """
+        用文件列表初始化队列（仅当队列为空时写入）
+
+        多个工作进程可以同时调用，只有第一个会真正写入批次；之后的调用须使用相同的
+        文件列表和批次大小（按指纹比较），否则说明队列属于另一次转换，抛出异常。
+
+        Args:
+            file_names: 输入文件名（相对输入目录）
+            batch_size: 每批文件数
+
+        Returns:
+            int: 本次写入的批次数
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        fingerprint = self._fingerprint(file_names, batch_size)
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM batches").fetchone()
+            if count:
+                row = self._conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+                self._conn.execute("COMMIT")
+                stored = None if row is None else row[0]
+            else:
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)",
+                                   (fingerprint,))
+                rows = [
+                    (json.dumps(file_names[start:start + batch_size]), self.PENDING)
+                    for start in range(0, len(file_names), batch_size)
+                ]
+                self._conn.executemany("INSERT INTO batches (files, state) VALUES (?, ?)", rows)
+                self._conn.execute("COMMIT")
+                return len(rows)
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+        if stored != fingerprint:
+            raise ValueError(f"Work queue {self.db_path} was created for a different input listing or batch size")
+        return 0
+
+    def lease(self, worker_id: str) -> Optional[Tuple[int, List[str]]]:
+        """
+        租用下一个待处理批次（包括租约已过期的批次）
+
+        已租用 max_attempts 次的批次不再租用，标记为 failed。
+
+        Args:
+            worker_id: 工作进程标识
+
+        Returns:
+            Optional[Tuple[int, List[str]]]: (批次ID, 文件名列表)，队列中没有可租用批次时返回None
+        """
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "UPDATE batches SET state = ?, worker = NULL, lease_expires = NULL"
+                " WHERE (state = ? OR (state = ? AND lease_expires < ?)) AND attempts >= ?",
+                (self.FAILED, self.PENDING, self.LEASED, now, self.max_attempts)
+            )
+            row = self._conn.execute(
+                "SELECT id, files FROM batches"
+                " WHERE state = ? OR (state = ? AND lease_expires < ?)"
+                " ORDER BY id LIMIT 1",
+                (self.PENDING, self.LEASED, now)
+            ).fetchone()
+            if row is None:
+                self._conn.execute("COMMIT")
+                return None
+
+            batch_id, files = row
+            self._conn.execute(
+                "UPDATE batches SET state = ?, worker = ?, lease_expires = ?,"
+                " attempts = attempts + 1 WHERE id = ?",
+                (self.LEASED, worker_id, now + self.lease_timeout, batch_id)
+            )
+            self._conn.execute("COMMIT")
+            return batch_id, json.loads(files)
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def renew(self, batch_id: int, worker_id: str) -> bool:
+        """
+        续租批次
+
+        Args:
+            batch_id: 批次ID
+            worker_id: 工作进程标识
+
+        Returns:
+            bool: 租约仍属于该工作进程并已续期时返回True
+        """
+        cursor = self._conn.execute(
+            "UPDATE batches SET lease_expires = ? WHERE id = ? AND state = ? AND worker = ?",
+            (time.time() + self.lease_timeout, batch_id, self.LEASED, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def _finish(self, batch_id: int, worker_id: str, state: str) -> bool:
+        """将本进程持有租约的批次设为指定状态"""
+        cursor = self._conn.execute(
+            "UPDATE batches SET state = ?, lease_expires = NULL WHERE id = ? AND state = ? AND worker = ?",
+            (state, batch_id, self.LEASED, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, batch_id: int, worker_id: str) -> bool:
+        """
+        标记批次已完成
+
+        租约已被其他进程接管时不做修改，由持有租约的进程完成该批次。
+
+        Args:
+            batch_id: 批次ID
+            worker_id: 工作进程标识
+
+        Returns:
+            bool: 租约仍属于该工作进程并已标记时返回True
+        """
+        return self._finish(batch_id, worker_id, self.DONE)
+
+    def fail(self, batch_id: int, worker_id: str) -> bool:
+        """
+        标记批次失败（有文件写出失败时），不再被租用
+
+        Args:
+            batch_id: 批次ID
+            worker_id: 工作进程标识
+
+        Returns:
+            bool: 租约仍属于该工作进程并已标记时返回True
+        """
+        return self._finish(batch_id, worker_id, self.FAILED)
+
+    def release(self, batch_id: int, worker_id: str) -> None:
+        """
+        归还批次（处理失败时），使其可被其他进程重新租用
+
+        Args:
+            batch_id: 批次ID
+            worker_id: 工作进程标识
+        """
+        self._conn.execute(
+            "UPDATE batches SET state = ?, worker = NULL, lease_expires = NULL"
+            " WHERE id = ? AND state = ? AND worker = ?",
+            (self.PENDING, batch_id, self.LEASED, worker_id)
+        )
+
+    def progress(self) -> Dict[str, int]:
+        """
+        获取各状态的批次数
+
+        Returns:
+            Dict[str, int]: 状态 -> 批次数
+        """
+        counts = {self.PENDING: 0, self.LEASED: 0, self.DONE: 0, self.FAILED: 0}
+        for state, count in self._conn.execute(
+            "SELECT state, COUNT(*) FROM batches GROUP BY state"
+        ):
+            counts[state] = count
+        return counts
@@ -7,11 +7,13 @@ from .yolo_obb import YoloOBBFormat
 from .labelimg_obb import LabelImgOBBFormat
 from .dota import DOTAFormat
 from .pascal_voc import PascalVOCFormat
+from .coco import COCOFormat
 
 __all__ = [
     'YoloHBBFormat',
     'YoloOBBFormat', 
     'LabelImgOBBFormat',
     'DOTAFormat',
-    'PascalVOCFormat'
+    'PascalVOCFormat',
+    'COCOFormat'
 ]
\ No newline at end of file
@@ -0,0 +1,606 @@
+"""
+COCO 格式处理类
+
+格式说明：
+- 整个数据集保存在一个JSON文件中，包含 images、annotations、categories 三个数组
+- bbox 为 [x, y, width, height]（像素坐标，左上角+宽高）
+- 旋转框：segmentation 为单个四点多边形 [[x1, y1, x2, y2, x3, y3, x4, y4]]，
+  或 bbox 为五元组 [x_center, y_center, width, height, angle]（角度为度数）
+- 读取时其他多边形 segmentation（多于四个顶点或多个部分）取全部顶点的凸包，凸包为四边形时
+  直接使用，否则拟合最小面积外接矩形；RLE 等非多边形 segmentation 使用 bbox 并记录错误
+- category_id 从1开始，按类别名称列表的顺序编号
+
+读取和写出都是流式的：读取时逐个解码数组元素，写出时逐条写入，
+不会在内存中构建整个数据集的JSON对象。读取时标注须暂存到文件末尾
+（categories 可能位于最后），暂存为紧凑的数组，内存约为每个标注 90 字节；
+中间格式对象按图片逐个生成，目录转换按批次消费，不会同时存在全部图片的对象。
+"""
+
+from array import array
+import io
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TextIO
+
+from ..core.base_format import BaseFormat, DatasetWriter, ParseStats
+from ..core.common_format import CommonFormat, make_bounding_box
+from ..core.class_table import ClassTable
+from ..core.error_report import record_error, report_error
+from ..core.geometry_utils import (
+    normalize_coordinates, denormalize_coordinates,
+    rect_to_corners, obb_to_corners, corners_to_rect,
+    convex_hull, min_area_rect, corners_from_obb_parameters
+)
+from ..core.json_stream import JSONStreamReader
+from ..core.archive_io import ArchiveReader
+
+
+# 批量拟合最小面积外接矩形时每次调用的中间数组上限（元素数，约为 框数 x 顶点数^3 / 2）
+_FIT_CHUNK_ELEMENTS = 2_000_000
+
+
+def _fit_polygons(hulls: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    批量拟合凸多边形的最小面积外接矩形（按顶点数分组调用 min_area_rect）
+
+    Args:
+        hulls: 凸包顶点列表，每个为 (K, 2)（像素坐标）
+
+    Returns:
+        np.ndarray: 外接矩形的角点 (N, 4, 2)
+    """
+    corners = np.zeros((len(hulls), 4, 2), dtype=np.float64)
+    groups: Dict[int, List[int]] = {}
+    for position, hull in enumerate(hulls):
+        groups.setdefault(len(hull), []).append(position)
+    for vertex_count, positions in groups.items():
+        chunk = max(1, _FIT_CHUNK_ELEMENTS // vertex_count ** 3)
+        for start in range(0, len(positions), chunk):
+            selected = positions[start:start + chunk]
+            parameters = min_area_rect(np.stack([hulls[position] for position in selected]))
+            corners[selected] = corners_from_obb_parameters(parameters)
+    return corners
+
+
+class COCOStreamWriter(DatasetWriter):
+    """
+    COCO 流式写入器
+
+    images 数组直接写入输出文件，annotations 先写入临时文件，
+    结束时依次拼接 annotations 和 categories，内存占用与数据集大小无关。
+    """
+
+    def __init__(self, format_instance: 'COCOFormat', output_path: str):
+        """
+        初始化写入器
+
+        Args:
+            format_instance: COCO格式实例
+            output_path: 输出JSON文件路径
+        """
+        super().__init__(format_instance, os.path.dirname(output_path))
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+
+        self._file = open(output_path, 'w', encoding='utf-8')
+        self._annotations = tempfile.TemporaryFile('w+', encoding='utf-8')
+        self._file.write('{"images": [')
+        self._image_count = 0
+        self._annotation_count = 0
+        self._class_names: List[str] = []
+
+    def write(self, common_data: CommonFormat) -> None:
+        """
+        写出一张图片及其标注
+
+        Args:
+            common_data: 中间格式数据
+        """
+        self._image_count += 1
+        self._class_names = common_data.class_names
+
+        image = self.format_instance._image_record(common_data, self._image_count)
+        if self._image_count > 1:
+            self._file.write(', ')
+        self._file.write(json.dumps(image, ensure_ascii=False))
+
+        for annotation in self.format_instance._annotation_records(
+                common_data, self._image_count, self._annotation_count + 1):
+            if self._annotation_count > 0:
+                self._annotations.write(', ')
+            self._annotations.write(json.dumps(annotation))
+            self._annotation_count += 1
+
+    def write_batch(self, common_data_list: List[CommonFormat]) -> List[CommonFormat]:
+        """
+        写出一个批次（写出失败时抛出异常，整个文件无效）
+
+        Args:
+            common_data_list: 中间格式数据列表
+
+        Returns:
+            List[CommonFormat]: 写出失败的记录（始终为空）
+        """
+        for common_data in common_data_list:
+            self.write(common_data)
+        return []
+
+    def close(self) -> None:
+        """拼接 annotations 和 categories，结束JSON文件"""
+        if self._file.closed:
+            return
+        try:
+            self._file.write('], "annotations": [')
+            self._annotations.seek(0)
+            shutil.copyfileobj(self._annotations, self._file)
+            self._file.write('], "categories": ')
+            self._file.write(json.dumps(self.format_instance._category_records(self._class_names),
+                                        ensure_ascii=False))
+            self._file.write('}\n')
+        finally:
+            self._annotations.close()
+            self._file.close()
+
+
+class COCOFormat(BaseFormat):
+    """COCO 格式处理类"""
+
+    SINGLE_FILE_DATASET = True
+
+    # 目录输出时的数据集文件名
+    OUTPUT_FILENAME = "annotations.json"
+
+    @property
+    def name(self) -> str:
+        return "COCO"
+
+    @property
+    def file_extension(self) -> str:
+        return ".json"
+
+    @property
+    def description(self) -> str:
+        return "COCO format: JSON with images/annotations/categories, bbox [x, y, w, h] or 4-point segmentation (pixel coordinates)"
+
+    def verify(self, file_path: str) -> bool:
+        """
+        验证文件是否符合COCO格式（只检查 images/annotations 数组的第一个元素）
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            bool: 是否符合格式
+        """
+        if not os.path.exists(file_path):
+            return False
+
+        if not file_path.endswith('.json'):
+            return False
+
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                reader = JSONStreamReader(f, chunk_size=1 << 16)
+                for key in reader.iter_object():
+                    if key == 'images':
+                        for image in reader.iter_array():
+                            return isinstance(image, dict) and 'id' in image
+                        return True
+                    if key == 'annotations':
+                        for annotation in reader.iter_array():
+                            return (isinstance(annotation, dict) and 'image_id' in annotation
+                                    and 'bbox' in annotation)
+                        return True
+                    reader.skip_value()
+            return False
+
+        except Exception:
+            return False
+
+    def _image_record(self, common_data: CommonFormat, image_id: int) -> Dict:
+        """生成 images 数组中的一条记录"""
+        return {
+            'id': image_id,
+            'file_name': f"{common_data.image_filename or image_id}.jpg",  # 假设是jpg格式
+            'width': common_data.image_width,
+            'height': common_data.image_height,
+        }
+
+    def _annotation_records(self, common_data: CommonFormat, image_id: int,
+                            first_annotation_id: int) -> List[Dict]:
+        """生成一张图片在 annotations 数组中的记录（bbox + 四点多边形）"""
+        records = []
+        for offset, bbox in enumerate(common_data.bounding_boxes):
+            pixel_corners = denormalize_coordinates(
+                bbox.corners, common_data.image_width, common_data.image_height
+            )
+            x_min, y_min, x_max, y_max = corners_to_rect(pixel_corners)
+            x, y = pixel_corners[:, 0], pixel_corners[:, 1]
+            area = 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+            record = {
+                'id': first_annotation_id + offset,
+                'image_id': image_id,
+                'category_id': common_data.get_class_id(bbox.class_name) + 1,
+                'bbox': [round(float(v), 6) for v in (x_min, y_min, x_max - x_min, y_max - y_min)],
+                'segmentation': [[round(float(v), 6) for v in pixel_corners.reshape(-1)]],
+                'area': round(float(area), 6),
+                'iscrowd': 0,
+            }
+            if bbox.confidence is not None:
+                record['score'] = bbox.confidence
+            records.append(record)
+        return records
+
+    def _category_records(self, class_names: List[str]) -> List[Dict]:
+        """生成 categories 数组（ID从1开始）"""
+        return [
+            {'id': index + 1, 'name': name, 'supercategory': ''}
+            for index, name in enumerate(class_names)
+        ]
+
+    @staticmethod
+    def _polygon_points(segmentation: Any) -> Optional[np.ndarray]:
+        """多边形 segmentation 的全部顶点 (K, 2)（像素坐标），不是多边形（如 RLE）或格式不正确时返回None"""
+        if not isinstance(segmentation, list) or not segmentation:
+            return None
+        if not all(isinstance(part, list) and len(part) >= 6 and len(part) % 2 == 0 for part in segmentation):
+            return None
+        return np.array([value for part in segmentation for value in part], dtype=float).reshape(-1, 2)
+
+    def _annotation_corners(self, annotation: Dict, points: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        从标注中提取角点（像素坐标）
+
+        优先使用多边形 segmentation：单个四点多边形直接使用，其他多边形取全部顶点的凸包
+        （返回的顶点数不为 4 时由调用方拟合最小面积外接矩形）；其次是五元组旋转 bbox，
+        最后是水平 bbox。
+
+        Args:
+            annotation: 标注记录
+            points: segmentation 的全部顶点（可选，见 _polygon_points，未提供时从标注中提取）
+
+        Returns:
+            Optional[np.ndarray]: 角点 (4, 2) 或凸包顶点 (K, 2)，没有可用的几何信息时返回None
+        """
+        segmentation = annotation.get('segmentation')
+        if points is None:
+            points = self._polygon_points(segmentation)
+        if points is not None:
+            if len(segmentation) == 1 and len(points) == 4:
+                return points
+            hull = convex_hull(points)
+            if len(hull) >= 3:
+                return hull
+
+        bbox = annotation.get('bbox')
+        if not bbox:
+            return None
+        if len(bbox) == 5:
+            return obb_to_corners(*[float(v) for v in bbox])
+        x, y, width, height = [float(v) for v in bbox[:4]]
+        return rect_to_corners(x, y, x + width, y + height)
+
+    def _iter_dataset(self, stream: TextIO, image_width: int, image_height: int,
+                      class_names: Optional[List[str]] = None,
+                      source: Optional[str] = None) -> Iterator[CommonFormat]:
+        """
+        流式解析COCO数据集，为每张图片生成一个中间格式对象
+
+        数组按元素逐个解码；categories 可能位于 annotations 之后，
+        因此标注先暂存在紧凑的数组中（每个标注约 90 字节：图片序号、类别ID、
+        8 个像素坐标、置信度），解析结束后再按图片分组逐个生成对象。
+
+        Args:
+            stream: 文本模式打开的JSON文件
+            image_width: 默认图片宽度（图片记录中没有尺寸时使用）
+            image_height: 默认图片高度
+            class_names: 类别名称列表（将被更新）
+            source: 错误记录中使用的来源（可选，默认为流的文件名）
+
+        Yields:
+            CommonFormat: 中间格式对象
+        """
+        class_names = ClassTable.of(class_names)
+        source = source or getattr(stream, 'name', '<stream>')
+
+        images: Dict[int, tuple] = {}
+        categories: Dict[int, str] = {}
+        # 图片ID -> 序号（标注可能先于图片出现，ID 也不一定是整数）
+        image_index: Dict[Any, int] = {}
+        ann_images = array('q')
+        ann_categories = array('q')
+        ann_corners = array('d')
+        ann_scores = array('d')
+        # 需要拟合最小面积外接矩形的标注：(标注序号, 凸包顶点)
+        fit_positions: List[int] = []
+        fit_hulls: List[np.ndarray] = []
+        ignored_segmentations = 0
+
+        reader = JSONStreamReader(stream)
+        for key in reader.iter_object():
+            if key == 'images':
+                for image in reader.iter_array():
+                    file_name = image.get('file_name') or str(image['id'])
+                    images[image['id']] = (
+                        os.path.splitext(os.path.basename(file_name))[0],
+                        int(image.get('width') or image_width),
+                        int(image.get('height') or image_height),
+                    )
+            elif key == 'annotations':
+                for annotation in reader.iter_array():
+                    segmentation = annotation.get('segmentation')
+                    points = self._polygon_points(segmentation)
+                    if points is None and segmentation:
+                        ignored_segmentations += 1
+                    corners = self._annotation_corners(annotation, points)
+                    if corners is None:
+                        continue
+                    if len(corners) != 4:
+                        # 解析结束后批量拟合，先占位
+                        fit_positions.append(len(ann_scores))
+                        fit_hulls.append(corners)
+                        corners = np.zeros((4, 2))
+                    score = annotation.get('score')
+                    ann_images.append(image_index.setdefault(annotation['image_id'], len(image_index)))
+                    ann_categories.append(int(annotation['category_id']))
+                    ann_corners.extend(corners.ravel().tolist())
+                    ann_scores.append(np.nan if score is None else float(score))
+            elif key == 'categories':
+                for category in reader.iter_array():
+                    categories[category['id']] = str(category['name'])
+            else:
+                reader.skip_value()
+
+        # 按类别ID顺序补充类别名称列表
+        for category_id in sorted(categories):
+            class_names.add(categories[category_id])
+
+        # 按图片序号稳定排序，每张图片的标注为一段连续的区间（保持文件中的顺序）
+        image_of = np.frombuffer(ann_images, dtype=np.int64) if ann_images else np.zeros(0, dtype=np.int64)
+        order = np.argsort(image_of, kind='stable')
+        bounds = np.searchsorted(image_of[order], np.arange(len(image_index) + 1))
+        corners_all = np.frombuffer(ann_corners, dtype=np.float64).reshape(-1, 4, 2) if ann_corners \
+            else np.zeros((0, 4, 2))
+        if fit_hulls:
+            corners_all = corners_all.copy()
+            corners_all[fit_positions] = _fit_polygons(fit_hulls)
+        if ignored_segmentations:
+            record_error('parse', source, 'UnsupportedSegmentation',
+                         f"{ignored_segmentations} 个标注的 segmentation 不是多边形（如 RLE），已使用 bbox")
+
+        for image_id, (image_filename, width, height) in images.items():
+            bounding_boxes = []
+            index = image_index.get(image_id)
+            if index is not None:
+                for position in order[bounds[index]:bounds[index + 1]]:
+                    category_id = ann_categories[position]
+                    class_name = categories.get(category_id, f"class_{category_id}")
+                    score = ann_scores[position]
+                    bounding_boxes.append(make_bounding_box(
+                        class_name=class_name,
+                        corners=normalize_coordinates(corners_all[position], width, height),
+                        class_id=class_names.add(class_name),
+                        confidence=None if np.isnan(score) else score
+                    ))
+
+            yield CommonFormat(
+                image_width=width,
+                image_height=height,
+                bounding_boxes=bounding_boxes,
+                class_names=class_names,
+                image_filename=image_filename
+            )
+
+    def _single_image(self, common_data_list: List[CommonFormat], source: str) -> CommonFormat:
+        """单文件接口只接受只包含一张图片的COCO文件"""
+        if len(common_data_list) != 1:
+            raise ValueError(f"{source} contains {len(common_data_list)} images; "
+                             f"use directory conversion for multi-image COCO files")
+        return common_data_list[0]
+
+    def _format2common(self, file_path: str, image_width: int, image_height: int,
+                      class_names: Optional[List[str]] = None) -> CommonFormat:
+        """
+        将只包含一张图片的COCO文件转换为中间格式
+
+        Args:
+            file_path: 输入文件路径
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（将被更新）
+
+        Returns:
+            CommonFormat: 中间格式对象
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            common_data_list = list(self._iter_dataset(f, image_width, image_height, class_names))
+        return self._single_image(common_data_list, file_path)
+
+    def _parse_file(self, file_path: str, image_width: int, image_height: int,
+                    class_names: Optional[List[str]] = None) -> List[CommonFormat]:
+        """
+        解析一个COCO文件中的所有图片
+
+        Args:
+            file_path: 输入文件路径
+            image_width: 默认图片宽度
+            image_height: 默认图片高度
+            class_names: 类别名称列表（将被更新）
+
+        Returns:
+            List[CommonFormat]: 中间格式对象列表
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return list(self._iter_dataset(f, image_width, image_height, class_names))
+
+    def _text2common(self, text: str, image_filename: str, image_width: int, image_height: int,
+                     class_names: Optional[List[str]] = None) -> CommonFormat:
+        """
+        将只包含一张图片的COCO文本转换为中间格式
+
+        Args:
+            text: 文件内容
+            image_filename: 图片文件名（不含扩展名，COCO中的 file_name 优先）
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（将被更新）
+
+        Returns:
+            CommonFormat: 中间格式对象
+        """
+        common_data_list = list(self._iter_dataset(io.StringIO(text), image_width, image_height, class_names))
+        return self._single_image(common_data_list, image_filename)
+
+    def _common2format(self, common_data: CommonFormat, output_path: str) -> None:
+        """
+        将中间格式转换为只包含一张图片的COCO文件
+
+        Args:
+            common_data: 中间格式数据
+            output_path: 输出文件路径
+        """
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(self._common2text(common_data))
+
+    def _common2text(self, common_data: CommonFormat) -> str:
+        """
+        将中间格式转换为只包含一张图片的COCO文本
+
+        Args:
+            common_data: 中间格式数据
+
+        Returns:
+            str: 文件内容
+        """
+        dataset = {
+            'images': [self._image_record(common_data, 1)],
+            'annotations': self._annotation_records(common_data, 1, 1),
+            'categories': self._category_records(common_data.class_names),
+        }
+        return json.dumps(dataset, ensure_ascii=False) + "\n"
+
+    def iter_format2common(self, file_paths: List[str], image_width: int, image_height: int,
+                           class_names: Optional[List[str]] = None,
+                           stats: Optional[ParseStats] = None) -> Iterator[CommonFormat]:
+        """
+        多文件转换：每个COCO文件包含多张图片，逐张生成中间格式对象
+
+        Args:
+            file_paths: 输入文件路径列表
+            image_width: 默认图片宽度
+            image_height: 默认图片高度
+            class_names: 类别名称列表（可选）
+            stats: 待累计的解析统计（可选）
+
+        Yields:
+            CommonFormat: 中间格式对象
+        """
+        class_names = ClassTable.of(class_names)
+        for file_path in file_paths:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    yield from self._counted(self._iter_dataset(f, image_width, image_height, class_names), stats)
+            except Exception as e:
+                report_error('parse', file_path, e)
+                if stats is not None:
+                    stats.failed_files += 1
+                continue
+            if stats is not None:
+                stats.parsed_files += 1
+
+    @staticmethod
+    def _counted(records: Iterator[CommonFormat], stats: Optional[ParseStats]) -> Iterator[CommonFormat]:
+        """累计生成的记录数"""
+        for common_data in records:
+            if stats is not None:
+                stats.records += 1
+            yield common_data
+
+    def iter_format2common_archive(self, archive_path: str, image_width: int, image_height: int,
+                                   class_names: Optional[List[str]] = None,
+                                   stats: Optional[ParseStats] = None) -> Iterator[CommonFormat]:
+        """
+        归档转换：归档中的每个COCO文件都可以包含多张图片
+
+        Args:
+            archive_path: 输入归档路径（tar/zip）
+            image_width: 默认图片宽度
+            image_height: 默认图片高度
+            class_names: 类别名称列表（可选）
+            stats: 待累计的解析统计（可选，文件数按归档成员计）
+
+        Yields:
+            CommonFormat: 中间格式对象
+        """
+        class_names = ClassTable.of(class_names)
+        for member_name, data in ArchiveReader(archive_path).iter_members(self.file_extension):
+            try:
+                stream = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8')
+                yield from self._counted(self._iter_dataset(stream, image_width, image_height, class_names,
+                                                            f"{archive_path}:{member_name}"), stats)
+            except Exception as e:
+                report_error('archive-parse', f"{archive_path}:{member_name}", e)
+                if stats is not None:
+                    stats.failed_files += 1
+                continue
+            if stats is not None:
+                stats.parsed_files += 1
+
+    def open_dataset_writer(self, output_dir: str) -> DatasetWriter:
+        """
+        打开流式写入器，所有批次写入同一个 annotations.json
+
+        Args:
+            output_dir: 输出目录
+
+        Returns:
+            DatasetWriter: COCO流式写入器
+        """
+        return COCOStreamWriter(self, os.path.join(output_dir, self.OUTPUT_FILENAME))
+
+    def common2formatMulti(self, common_data_list: List[CommonFormat], output_dir: str) -> None:
+        """
+        多文件转换：中间格式 -> 单个 annotations.json
+
+        Args:
+            common_data_list: 中间格式数据列表
+            output_dir: 输出目录
+        """
+        writer = self.open_dataset_writer(output_dir)
+        try:
+            writer.write_batch(common_data_list)
+        finally:
+            writer.close()
+
+    def _extract_class_names_from_files(self, file_paths: List[str]) -> List[str]:
+        """
+        从COCO文件的 categories 中提取类别名称（按类别ID排序）
+
+        Args:
+            file_paths: 文件路径列表
+
+        Returns:
+            List[str]: 类别名称列表
+        """
+        class_names = ClassTable()
+        for file_path in file_paths:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    reader = JSONStreamReader(f)
+                    for key in reader.iter_object():
+                        if key != 'categories':
+                            reader.skip_value()
+                            continue
+                        categories = sorted(reader.iter_array(), key=lambda c: c['id'])
+                        for category in categories:
+                            class_names.add(category['name'])
+                        # 只需要 categories，不再读取文件的其余部分
+                        break
+            except Exception as e:
+                report_error('class-scan', file_path, e)
+
+        return class_names
@@ -9,17 +9,23 @@ DOTA 格式处理类
 """
 
 import os
+import re
 import numpy as np
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
-from ..core.base_format import BaseFormat
-from ..core.common_format import CommonFormat, BoundingBox
+from ..core.base_format import BaseFormat, LintRecord
+from ..core.common_format import CommonFormat, make_bounding_box
+from ..core.class_table import ClassTable
+from ..core.error_report import report_error
 from ..core.geometry_utils import normalize_coordinates, denormalize_coordinates
 
 
 class DOTAFormat(BaseFormat):
     """DOTA 格式处理类"""
     
+    # 8个数值之后的第9个字段为类别名称（imagesource/gsd 等头部行不匹配）
+    CLASS_NAME_PATTERN = re.compile(rb'^[ \t]*(?:[-+.0-9eE]+[ \t]+){8}([^\s]+)', re.MULTILINE)
+    
     @property
     def name(self) -> str:
         return "DOTA"
@@ -103,15 +109,32 @@ class DOTAFormat(BaseFormat):
         Returns:
             CommonFormat: 中间格式对象
         """
-        if class_names is None:
-            class_names = []
+        with open(file_path, 'r', encoding='utf-8') as f:
+            text = f.read()
         
-        bounding_boxes = []
+        return self._text2common(text, os.path.splitext(os.path.basename(file_path))[0],
+                                 image_width, image_height, class_names)
+    
+    def _text2common(self, text: str, image_filename: str, image_width: int, image_height: int,
+                     class_names: Optional[List[str]] = None) -> CommonFormat:
+        """
+        将DOTA格式文本转换为中间格式
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        Args:
+            text: 文件内容
+            image_filename: 图片文件名（不含扩展名）
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（将被更新）
+            
+        Returns:
+            CommonFormat: 中间格式对象
+        """
+        class_names = ClassTable.of(class_names)
+        
+        bounding_boxes = []
         
-        for line in lines:
+        for line in text.splitlines():
             line = line.strip()
             if not line:
                 continue
@@ -142,15 +165,14 @@ class DOTAFormat(BaseFormat):
                 except ValueError:
                     pass
             
-            # 更新类别名称列表
-            if class_name not in class_names:
-                class_names.append(class_name)
+            # 更新类别名称列表（查找或追加）
+            class_id = class_names.add(class_name)
             
             # 创建边界框对象
-            bbox = BoundingBox(
+            bbox = make_bounding_box(
                 class_name=class_name,
                 corners=normalized_corners,
-                class_id=class_names.index(class_name),
+                class_id=class_id,
                 difficulty=difficulty
             )
             
@@ -161,9 +183,35 @@ class DOTAFormat(BaseFormat):
             image_height=image_height,
             bounding_boxes=bounding_boxes,
             class_names=class_names,
-            image_filename=os.path.splitext(os.path.basename(file_path))[0]
+            image_filename=image_filename
         )
     
+    def iter_lint_records(self, file_path: str, image_width: int, image_height: int) -> Iterator[LintRecord]:
+        """
+        逐行产出DOTA标注记录供 lint 检查
+        
+        Args:
+            file_path: 输入文件路径
+            image_width: 图片宽度
+            image_height: 图片高度
+            
+        Yields:
+            LintRecord: (行号, 类别名称, 归一化角点, 格式错误说明)
+        """
+        for line_no, parts in self._iter_text_lines(file_path):
+            if len(parts) < 9:
+                yield line_no, None, None, f"Expected at least 9 fields, got {len(parts)}"
+                continue
+            try:
+                pixel_corners = np.array(parts[:8], dtype=np.float64).reshape(4, 2)
+            except ValueError:
+                yield line_no, None, None, "Coordinates must be numbers"
+                continue
+            if len(parts) > 9 and not parts[9].lstrip('-').isdigit():
+                yield line_no, None, None, f"Difficulty must be an integer, got '{parts[9]}'"
+                continue
+            yield line_no, parts[8], pixel_corners / [image_width, image_height], None
+    
     def _common2format(self, common_data: CommonFormat, output_path: str) -> None:
         """
         将中间格式转换为DOTA格式
@@ -172,6 +220,19 @@ class DOTAFormat(BaseFormat):
             common_data: 中间格式数据
             output_path: 输出文件路径
         """
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(self._common2text(common_data))
+    
+    def _common2text(self, common_data: CommonFormat) -> str:
+        """
+        将中间格式转换为DOTA格式文本
+        
+        Args:
+            common_data: 中间格式数据
+            
+        Returns:
+            str: 文件内容
+        """
         lines = []
         
         for bbox in common_data.bounding_boxes:
@@ -201,9 +262,7 @@ class DOTAFormat(BaseFormat):
             
             lines.append(" ".join(line_parts) + "\n")
         
-        # 写入文件
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.writelines(lines) 
+        return "".join(lines)
 
     def _extract_class_names_from_files(self, file_paths: List[str]) -> List[str]:
         """
@@ -234,6 +293,7 @@ class DOTAFormat(BaseFormat):
                     class_name = parts[8]
                     class_names.add(class_name)
             except Exception as e:
-                print(f"警告：读取文件 {file_path} 时出错: {e}")
+                report_error('class-scan', file_path, e)
                 
-        return list(class_names)
\ No newline at end of file
+        # 排序保证不同进程得到相同的类别ID顺序
+        return sorted(class_names)
\ No newline at end of file
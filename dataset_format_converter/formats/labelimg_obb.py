@@ -10,13 +10,16 @@ LabelImg-OBB 格式处理类
 
 import os
 import numpy as np
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 
-from ..core.base_format import BaseFormat
-from ..core.common_format import CommonFormat, BoundingBox
+from ..core.base_format import BaseFormat, LintRecord
+from ..core.archive_io import ArchiveWriter
+from ..core.common_format import CommonFormat, make_bounding_box
+from ..core.class_table import ClassTable
+from ..core.error_report import report_error
 from ..core.geometry_utils import (
-    normalize_coordinates, denormalize_coordinates,
-    obb_to_corners, calculate_obb_parameters
+    normalize_coordinates,
+    obb_to_corners, fit_obb_parameters
 )
 
 
@@ -106,17 +109,36 @@ class LabelImgOBBFormat(BaseFormat):
         Returns:
             CommonFormat: 中间格式对象
         """
-        if class_names is None:
-            class_names = []
-        
-        bounding_boxes = []
-        
         # 跳过 classes.txt
         if os.path.basename(file_path) == "classes.txt":
             return None
 
         with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+            text = f.read()
+        
+        return self._text2common(text, os.path.splitext(os.path.basename(file_path))[0],
+                                 image_width, image_height, class_names)
+    
+    def _text2common(self, text: str, image_filename: str, image_width: int, image_height: int,
+                     class_names: Optional[List[str]] = None) -> CommonFormat:
+        """
+        将LabelImg-OBB格式文本转换为中间格式
+        
+        Args:
+            text: 文件内容
+            image_filename: 图片文件名（不含扩展名）
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表
+            
+        Returns:
+            CommonFormat: 中间格式对象
+        """
+        class_names = ClassTable.of(class_names)
+        
+        bounding_boxes = []
+        
+        lines = text.splitlines()
         
         # 跳过第一行的"YOLO_OBB"标识
         for line in lines[1:]:
@@ -147,11 +169,10 @@ class LabelImgOBBFormat(BaseFormat):
             else:
                 class_name = f"class_{class_id}"
                 # 扩展类别名称列表
-                while len(class_names) <= class_id:
-                    class_names.append(f"class_{len(class_names)}")
+                class_names.ensure_size(class_id + 1)
             
             # 创建边界框对象
-            bbox = BoundingBox(
+            bbox = make_bounding_box(
                 class_name=class_name,
                 corners=normalized_corners,
                 class_id=class_id
@@ -164,9 +185,34 @@ class LabelImgOBBFormat(BaseFormat):
             image_height=image_height,
             bounding_boxes=bounding_boxes,
             class_names=class_names,
-            image_filename=os.path.splitext(os.path.basename(file_path))[0]
+            image_filename=image_filename
         )
     
+    def iter_lint_records(self, file_path: str, image_width: int, image_height: int) -> Iterator[LintRecord]:
+        """
+        逐行产出LabelImg-OBB标注记录供 lint 检查（跳过第一行的"YOLO_OBB"标识）
+        
+        Args:
+            file_path: 输入文件路径
+            image_width: 图片宽度
+            image_height: 图片高度
+            
+        Yields:
+            LintRecord: (行号, 类别ID, 归一化角点, 格式错误说明)
+        """
+        for line_no, parts in self._iter_text_lines(file_path, skip_lines=1):
+            if len(parts) != 6:
+                yield line_no, None, None, f"Expected 6 fields, got {len(parts)}"
+                continue
+            try:
+                class_id = int(parts[0])
+                x_center, y_center, width, height, angle_degrees = (float(part) for part in parts[1:])
+            except ValueError:
+                yield line_no, None, None, "Class ID must be an integer and OBB parameters must be numbers"
+                continue
+            pixel_corners = obb_to_corners(x_center, y_center, width, height, angle_degrees)
+            yield line_no, class_id, pixel_corners / [image_width, image_height], None
+    
     def _common2format(self, common_data: CommonFormat, output_path: str) -> None:
         """
         将中间格式转换为LabelImg-OBB格式
@@ -175,29 +221,113 @@ class LabelImgOBBFormat(BaseFormat):
             common_data: 中间格式数据
             output_path: 输出文件路径
         """
-        lines = ["YOLO_OBB\n"]  # 第一行标识符
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(self._common2text(common_data))
+    
+    def _common2text(self, common_data: CommonFormat) -> str:
+        """
+        将中间格式转换为LabelImg-OBB格式文本
         
-        for bbox in common_data.bounding_boxes:
-            # 获取类别ID
-            class_id = common_data.get_class_id(bbox.class_name)
+        Args:
+            common_data: 中间格式数据
             
-            # 将归一化坐标转换为像素坐标
-            pixel_corners = denormalize_coordinates(
-                bbox.corners, 
-                common_data.image_width, 
-                common_data.image_height
+        Returns:
+            str: 文件内容
+        """
+        return self._common2texts([common_data])[0]
+    
+    def _common2texts(self, common_data_list: List[CommonFormat]) -> List[str]:
+        """
+        批量将中间格式转换为LabelImg-OBB格式文本
+        
+        整个批次的框一次计算OBB参数（拟合方式见 geometry_utils.obb_fit_mode），
+        避免逐框调用的开销。
+        
+        Args:
+            common_data_list: 中间格式数据列表
+            
+        Returns:
+            List[str]: 每张图片的文件内容
+        """
+        boxes = [bbox for common_data in common_data_list for bbox in common_data.bounding_boxes]
+        obb_parameters = []
+        if boxes:
+            corners = np.stack([bbox.corners for bbox in boxes])
+            # 将归一化坐标转换为像素坐标（每个框乘以所属图片的尺寸）
+            counts = [len(common_data.bounding_boxes) for common_data in common_data_list]
+            sizes = np.repeat(
+                np.array([[c.image_width, c.image_height] for c in common_data_list], dtype=corners.dtype),
+                counts, axis=0
             )
+            obb_parameters = fit_obb_parameters(corners * sizes[:, None, :]).tolist()
+        
+        texts = []
+        row = 0
+        for common_data in common_data_list:
+            lines = ["YOLO_OBB\n"]  # 第一行标识符
+            for bbox in common_data.bounding_boxes:
+                # 获取类别ID
+                class_id = common_data.get_class_id(bbox.class_name)
+                x_center, y_center, width, height, angle_degrees = obb_parameters[row]
+                row += 1
+                
+                # 构建输出行
+                lines.append(f"{class_id} {x_center:.6f} {y_center:.6f} {width:.6f} {height:.6f} {angle_degrees:.6f}\n")
+            texts.append("".join(lines))
+        return texts
+    
+    def _write_labels(self, common_data_list: List[CommonFormat], output_dir: str) -> List[CommonFormat]:
+        """
+        将中间格式数据写为标注文件（整个批次一次计算OBB参数）
+        
+        Args:
+            common_data_list: 中间格式数据列表
+            output_dir: 输出目录
+            
+        Returns:
+            List[CommonFormat]: 写出失败的记录
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        
+        failed = []
+        for common_data, text in zip(common_data_list, self._common2texts(common_data_list)):
+            if common_data.image_filename:
+                output_filename = f"{common_data.image_filename}{self.file_extension}"
+            else:
+                output_filename = f"converted_{len(os.listdir(output_dir))}{self.file_extension}"
             
-            # 计算OBB参数
-            x_center, y_center, width, height, angle_degrees = calculate_obb_parameters(pixel_corners)
+            output_path = os.path.join(output_dir, output_filename)
             
-            # 构建输出行
-            line = f"{class_id} {x_center:.6f} {y_center:.6f} {width:.6f} {height:.6f} {angle_degrees:.6f}\n"
-            lines.append(line)
+            try:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+            except Exception as e:
+                report_error('write', output_path, e)
+                failed.append(common_data)
+        return failed
+    
+    def _write_archive_members(self, common_data_list: List[CommonFormat],
+                               writer: ArchiveWriter) -> List[CommonFormat]:
+        """
+        将中间格式数据作为成员写入已打开的归档（整个批次一次计算OBB参数）
         
-        # 写入文件
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.writelines(lines) 
+        Args:
+            common_data_list: 中间格式数据列表
+            writer: 归档写入器
+            
+        Returns:
+            List[CommonFormat]: 写出失败的记录
+        """
+        failed = []
+        for index, (common_data, text) in enumerate(zip(common_data_list, self._common2texts(common_data_list))):
+            stem = common_data.image_filename or f"converted_{index}"
+            member_name = f"{stem}{self.file_extension}"
+            try:
+                writer.write(member_name, text.encode('utf-8'))
+            except Exception as e:
+                report_error('archive-write', member_name, e)
+                failed.append(common_data)
+        return failed
 
     def _generate_classes_txt(self, class_names: List[str], output_path: str) -> bool:
         """
@@ -233,6 +363,12 @@ class LabelImgOBBFormat(BaseFormat):
             print(f"Error generating classes.txt file: {e}")
             return False
         
+    def _sidecar_files(self, class_names: List[str]) -> Dict[str, str]:
+        """
+        输出数据集附带的 classes.txt
+        """
+        return {"classes.txt": "".join(class_name + "\n" for class_name in class_names)}
+        
     def common2formatSolo(self, common_data: CommonFormat, output_path: str) -> None:
         """
         将中间格式转换为LabelImg-OBB格式
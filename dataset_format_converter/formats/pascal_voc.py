@@ -8,19 +8,26 @@ PASCAL VOC 格式处理类
 - 这是水平边界框格式（不支持旋转）
 """
 
+import html
 import os
+import re
 import xml.etree.ElementTree as ET
 import numpy as np
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from ..core.base_format import BaseFormat
-from ..core.common_format import CommonFormat, BoundingBox
+from ..core.common_format import CommonFormat, make_bounding_box
+from ..core.class_table import ClassTable
+from ..core.error_report import record_error, report_error
 from ..core.geometry_utils import rect_to_corners, corners_to_rect, normalize_coordinates, denormalize_coordinates
 
 
 class PascalVOCFormat(BaseFormat):
     """PASCAL VOC 格式处理类"""
     
+    # 每个 <object> 之后的第一个 <name> 为类别名称（与解析时的 obj.find('name') 一致）
+    CLASS_NAME_PATTERN = re.compile(rb'<object\b.*?<name>([^<]+)</name>', re.DOTALL)
+    
     @property
     def name(self) -> str:
         return "PASCAL-VOC"
@@ -107,13 +114,33 @@ class PascalVOCFormat(BaseFormat):
         Returns:
             CommonFormat: 中间格式对象
         """
-        if class_names is None:
-            class_names = []
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        
+        return self._text2common(data, os.path.splitext(os.path.basename(file_path))[0],
+                                 image_width, image_height, class_names)
+    
+    def _text2common(self, text: Union[str, bytes], image_filename: str,
+                     image_width: int, image_height: int,
+                     class_names: Optional[List[str]] = None) -> CommonFormat:
+        """
+        将PASCAL VOC格式文本转换为中间格式
+        
+        Args:
+            text: 文件内容（XML文本或原始字节，字节时按XML声明的编码解析）
+            image_filename: 图片文件名（不含扩展名）
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表（将被更新）
+            
+        Returns:
+            CommonFormat: 中间格式对象
+        """
+        class_names = ClassTable.of(class_names)
         
         bounding_boxes = []
         
-        tree = ET.parse(file_path)
-        root = tree.getroot()
+        root = ET.fromstring(text)
         
         # 提取图片信息（如果XML中有的话）
         size_node = root.find('size')
@@ -126,7 +153,9 @@ class PascalVOCFormat(BaseFormat):
                     xml_height = int(height_node.text)
                     # 如果XML中的尺寸与提供的尺寸不同，使用XML中的
                     if xml_width != image_width or xml_height != image_height:
-                        print(f"警告：XML中的图片尺寸 ({xml_width}x{xml_height}) 与提供的尺寸 ({image_width}x{image_height}) 不一致，使用XML中的尺寸")
+                        record_error('image-size', image_filename, 'SizeMismatch',
+                                     f"XML中的图片尺寸 ({xml_width}x{xml_height}) 与提供的尺寸 "
+                                     f"({image_width}x{image_height}) 不一致，使用XML中的尺寸")
                         image_width = xml_width
                         image_height = xml_height
                 except ValueError:
@@ -156,15 +185,14 @@ class PascalVOCFormat(BaseFormat):
             # 转换为归一化坐标
             normalized_corners = normalize_coordinates(pixel_corners, image_width, image_height)
             
-            # 更新类别名称列表
-            if class_name not in class_names:
-                class_names.append(class_name)
+            # 更新类别名称列表（查找或追加）
+            class_id = class_names.add(class_name)
             
             # 创建边界框对象
-            bbox = BoundingBox(
+            bbox = make_bounding_box(
                 class_name=class_name,
                 corners=normalized_corners,
-                class_id=class_names.index(class_name)
+                class_id=class_id
             )
             
             bounding_boxes.append(bbox)
@@ -174,7 +202,7 @@ class PascalVOCFormat(BaseFormat):
             image_height=image_height,
             bounding_boxes=bounding_boxes,
             class_names=class_names,
-            image_filename=os.path.splitext(os.path.basename(file_path))[0]
+            image_filename=image_filename
         )
     
     def _common2format(self, common_data: CommonFormat, output_path: str) -> None:
@@ -185,6 +213,19 @@ class PascalVOCFormat(BaseFormat):
             common_data: 中间格式数据
             output_path: 输出文件路径
         """
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(self._common2text(common_data))
+    
+    def _common2text(self, common_data: CommonFormat) -> str:
+        """
+        将中间格式转换为PASCAL VOC格式文本
+        
+        Args:
+            common_data: 中间格式数据
+            
+        Returns:
+            str: 文件内容
+        """
         # 创建根节点
         root = ET.Element('annotation')
         
@@ -257,11 +298,23 @@ class PascalVOCFormat(BaseFormat):
             else:
                 difficult.text = '0'
         
-        # 写入文件
         tree = ET.ElementTree(root)
         ET.indent(tree, space="  ", level=0)  # 格式化XML
-        tree.write(output_path, encoding='utf-8', xml_declaration=True) 
+        return "<?xml version='1.0' encoding='utf-8'?>\n" + ET.tostring(root, encoding='unicode')
 
+    def _scan_class_names(self, data: bytes) -> List[str]:
+        """
+        从XML原始字节中提取类别名称（只做正则匹配，不构建语法树）
+        
+        Args:
+            data: 文件内容
+            
+        Returns:
+            List[str]: 文件中出现的类别名称（可能重复）
+        """
+        return [html.unescape(token.decode('utf-8', errors='replace'))
+                for token in self.CLASS_NAME_PATTERN.findall(data)]
+    
     def _extract_class_names_from_files(self, file_paths: List[str]) -> List[str]:
         """
         从PASCAL VOC格式文件中提取类别名称
@@ -288,7 +341,8 @@ class PascalVOCFormat(BaseFormat):
                     if name is not None and name.text:
                         class_names.add(name.text)
             except Exception as e:
-                print(f"警告：读取文件 {file_path} 时出错: {e}")
+                report_error('class-scan', file_path, e)
                 
-        return list(class_names)
+        # 排序保证不同进程得到相同的类别ID顺序
+        return sorted(class_names)
     
\ No newline at end of file
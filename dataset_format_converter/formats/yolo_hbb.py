@@ -9,10 +9,11 @@ YOLO-HBB 格式处理类
 
 import os
 import numpy as np
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 
-from ..core.base_format import BaseFormat
-from ..core.common_format import CommonFormat, BoundingBox
+from ..core.base_format import BaseFormat, LintRecord
+from ..core.common_format import CommonFormat, make_bounding_box
+from ..core.class_table import ClassTable
 from ..core.geometry_utils import yolo_to_corners, corners_to_yolo
 
 
@@ -99,17 +100,36 @@ class YoloHBBFormat(BaseFormat):
         Returns:
             CommonFormat: 中间格式对象
         """
-        if class_names is None:
-            class_names = []
-        
-        bounding_boxes = []
-
         # 跳过 classes.txt
         if os.path.basename(file_path) == "classes.txt":
             return None
         
         with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+            text = f.read()
+        
+        return self._text2common(text, os.path.splitext(os.path.basename(file_path))[0],
+                                 image_width, image_height, class_names)
+    
+    def _text2common(self, text: str, image_filename: str, image_width: int, image_height: int,
+                     class_names: Optional[List[str]] = None) -> CommonFormat:
+        """
+        将YOLO-HBB格式文本转换为中间格式
+        
+        Args:
+            text: 文件内容
+            image_filename: 图片文件名（不含扩展名）
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表
+            
+        Returns:
+            CommonFormat: 中间格式对象
+        """
+        class_names = ClassTable.of(class_names)
+        
+        bounding_boxes = []
+
+        lines = text.splitlines()
         
         for line in lines:
             line = line.strip()
@@ -135,11 +155,10 @@ class YoloHBBFormat(BaseFormat):
             else:
                 class_name = f"class_{class_id}"
                 # 扩展类别名称列表
-                while len(class_names) <= class_id:
-                    class_names.append(f"class_{len(class_names)}")
+                class_names.ensure_size(class_id + 1)
             
             # 创建边界框对象
-            bbox = BoundingBox(
+            bbox = make_bounding_box(
                 class_name=class_name,
                 corners=corners,
                 class_id=class_id
@@ -152,9 +171,33 @@ class YoloHBBFormat(BaseFormat):
             image_height=image_height,
             bounding_boxes=bounding_boxes,
             class_names=class_names,
-            image_filename=os.path.splitext(os.path.basename(file_path))[0]
+            image_filename=image_filename
         )
     
+    def iter_lint_records(self, file_path: str, image_width: int, image_height: int) -> Iterator[LintRecord]:
+        """
+        逐行产出YOLO-HBB标注记录供 lint 检查
+        
+        Args:
+            file_path: 输入文件路径
+            image_width: 图片宽度
+            image_height: 图片高度
+            
+        Yields:
+            LintRecord: (行号, 类别ID, 归一化角点, 格式错误说明)
+        """
+        for line_no, parts in self._iter_text_lines(file_path):
+            if len(parts) != 5:
+                yield line_no, None, None, f"Expected 5 fields, got {len(parts)}"
+                continue
+            try:
+                class_id = int(parts[0])
+                x_center, y_center, width, height = (float(part) for part in parts[1:])
+            except ValueError:
+                yield line_no, None, None, "Class ID must be an integer and coordinates must be numbers"
+                continue
+            yield line_no, class_id, yolo_to_corners(x_center, y_center, width, height), None
+    
     def _common2format(self, common_data: CommonFormat, output_path: str) -> None:
         """
         将中间格式转换为YOLO-HBB格式
@@ -163,6 +206,19 @@ class YoloHBBFormat(BaseFormat):
             common_data: 中间格式数据
             output_path: 输出文件路径
         """
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(self._common2text(common_data))
+    
+    def _common2text(self, common_data: CommonFormat) -> str:
+        """
+        将中间格式转换为YOLO-HBB格式文本
+        
+        Args:
+            common_data: 中间格式数据
+            
+        Returns:
+            str: 文件内容
+        """
         lines = []
         
         for bbox in common_data.bounding_boxes:
@@ -176,9 +232,7 @@ class YoloHBBFormat(BaseFormat):
             line = f"{class_id} {x_center:.6f} {y_center:.6f} {width:.6f} {height:.6f}\n"
             lines.append(line)
         
-        # 写入文件
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.writelines(lines) 
+        return "".join(lines)
 
     def _generate_classes_txt(self, class_names: List[str], output_path: str) -> bool:
         """
@@ -197,6 +251,12 @@ class YoloHBBFormat(BaseFormat):
             print(f"Error generating classes.txt file: {e}")
             return False
         
+    def _sidecar_files(self, class_names: List[str]) -> Dict[str, str]:
+        """
+        输出数据集附带的 classes.txt
+        """
+        return {"classes.txt": "".join(class_name + "\n" for class_name in class_names)}
+        
     def common2formatSolo(self, common_data: CommonFormat, output_path: str) -> None:
         """
         将中间格式转换为YOLO-HBB格式
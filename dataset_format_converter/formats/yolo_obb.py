@@ -9,10 +9,11 @@ YOLO-OBB (Ultralytics) 格式处理类
 
 import os
 import numpy as np
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 
-from ..core.base_format import BaseFormat
-from ..core.common_format import CommonFormat, BoundingBox
+from ..core.base_format import BaseFormat, LintRecord
+from ..core.common_format import CommonFormat, make_bounding_box
+from ..core.class_table import ClassTable
 from ..core.geometry_utils import normalize_coordinates, denormalize_coordinates
 
 
@@ -99,11 +100,6 @@ class YoloOBBFormat(BaseFormat):
         Returns:
             CommonFormat: 中间格式对象
         """
-        if class_names is None:
-            class_names = []
-        
-        bounding_boxes = []
-
         # 跳过 class_names.txt
         if os.path.basename(file_path) == "class_names.txt":
             return None
@@ -113,7 +109,31 @@ class YoloOBBFormat(BaseFormat):
             return None
         
         with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+            text = f.read()
+        
+        return self._text2common(text, os.path.splitext(os.path.basename(file_path))[0],
+                                 image_width, image_height, class_names)
+    
+    def _text2common(self, text: str, image_filename: str, image_width: int, image_height: int,
+                     class_names: Optional[List[str]] = None) -> CommonFormat:
+        """
+        将YOLO-OBB格式文本转换为中间格式
+        
+        Args:
+            text: 文件内容
+            image_filename: 图片文件名（不含扩展名）
+            image_width: 图片宽度
+            image_height: 图片高度
+            class_names: 类别名称列表
+            
+        Returns:
+            CommonFormat: 中间格式对象
+        """
+        class_names = ClassTable.of(class_names)
+        
+        bounding_boxes = []
+
+        lines = text.splitlines()
         
         for line in lines:
             line = line.strip()
@@ -140,11 +160,10 @@ class YoloOBBFormat(BaseFormat):
             else:
                 class_name = f"class_{class_id}"
                 # 扩展类别名称列表
-                while len(class_names) <= class_id:
-                    class_names.append(f"class_{len(class_names)}")
+                class_names.ensure_size(class_id + 1)
             
             # 创建边界框对象
-            bbox = BoundingBox(
+            bbox = make_bounding_box(
                 class_name=class_name,
                 corners=corners,
                 class_id=class_id
@@ -157,9 +176,33 @@ class YoloOBBFormat(BaseFormat):
             image_height=image_height,
             bounding_boxes=bounding_boxes,
             class_names=class_names,
-            image_filename=os.path.splitext(os.path.basename(file_path))[0]
+            image_filename=image_filename
         )
     
+    def iter_lint_records(self, file_path: str, image_width: int, image_height: int) -> Iterator[LintRecord]:
+        """
+        逐行产出YOLO-OBB标注记录供 lint 检查
+        
+        Args:
+            file_path: 输入文件路径
+            image_width: 图片宽度
+            image_height: 图片高度
+            
+        Yields:
+            LintRecord: (行号, 类别ID, 归一化角点, 格式错误说明)
+        """
+        for line_no, parts in self._iter_text_lines(file_path):
+            if len(parts) != 9:
+                yield line_no, None, None, f"Expected 9 fields, got {len(parts)}"
+                continue
+            try:
+                class_id = int(parts[0])
+                corners = np.array(parts[1:], dtype=np.float64).reshape(4, 2)
+            except ValueError:
+                yield line_no, None, None, "Class ID must be an integer and coordinates must be numbers"
+                continue
+            yield line_no, class_id, corners, None
+    
     def _common2format(self, common_data: CommonFormat, output_path: str) -> None:
         """
         将中间格式转换为YOLO-OBB格式
@@ -168,6 +211,19 @@ class YoloOBBFormat(BaseFormat):
             common_data: 中间格式数据
             output_path: 输出文件路径
         """
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(self._common2text(common_data))
+    
+    def _common2text(self, common_data: CommonFormat) -> str:
+        """
+        将中间格式转换为YOLO-OBB格式文本
+        
+        Args:
+            common_data: 中间格式数据
+            
+        Returns:
+            str: 文件内容
+        """
         lines = []
         
         for bbox in common_data.bounding_boxes:
@@ -187,9 +243,7 @@ class YoloOBBFormat(BaseFormat):
             
             lines.append(" ".join(line_parts) + "\n")
         
-        # 写入文件
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.writelines(lines) 
+        return "".join(lines)
 
     def _generate_class_names_txt(self, class_names: List[str], output_path: str) -> bool:
         """
@@ -219,17 +273,50 @@ class YoloOBBFormat(BaseFormat):
             else:
                 dir_path = os.path.dirname(output_path)
             with open(os.path.join(dir_path, "dataset.yaml"), 'w', encoding='utf-8') as f:
-                f.write(f"path: {dir_path}\n")
-                f.write(f"train: train/images\n")
-                f.write(f"val: val/images\n")
-                f.write(f"test: test/images\n")
-                f.write(f"nc: {len(class_names)}\n")
-                f.write(f"""names: [{', '.join([f"'{name}'" for name in class_names])}]\n""")
+                f.write(self._dataset_yaml_text(class_names, dir_path))
             return True
         except Exception as e:
             print(f"Error generating dataset yaml file: {e}")
             return False
     
+    def _dataset_yaml_text(self, class_names: List[str], dir_path: str) -> str:
+        """
+        生成 dataset.yaml 的内容
+        """
+        return (
+            f"path: {dir_path}\n"
+            f"train: train/images\n"
+            f"val: val/images\n"
+            f"test: test/images\n"
+            f"nc: {len(class_names)}\n"
+            f"""names: [{', '.join([f"'{name}'" for name in class_names])}]\n"""
+        )
+    
+    def _sidecar_files(self, class_names: List[str]) -> Dict[str, str]:
+        """
+        输出数据集附带的 class_names.txt 和 dataset.yaml（归档内路径为相对路径）
+        """
+        return {
+            "class_names.txt": "".join(class_name + "\n" for class_name in class_names),
+            "dataset.yaml": self._dataset_yaml_text(class_names, "."),
+        }
+    
+    def _write_sidecars(self, class_names: List[str], output_dir: str) -> None:
+        """
+        写出 class_names.txt 和 dataset.yaml（dataset.yaml 使用输出目录的路径）
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        self._generate_class_names_txt(class_names, output_dir)
+        self._generate_dataset_yaml(class_names, output_dir)
+    
+    def _write_split_sidecars(self, class_names: List[str], output_dir: str, split_names: List[str]) -> None:
+        """
+        划分数据集：class_names.txt 写入每个划分的 labels 目录，dataset.yaml 写入根目录
+        """
+        for split_name in split_names:
+            self._generate_class_names_txt(class_names, os.path.join(output_dir, split_name, "labels"))
+        self._generate_dataset_yaml(class_names, output_dir)
+    
     def common2formatSolo(self, common_data: CommonFormat, output_path: str) -> None:
         """
         将中间格式转换为YOLO-OBB格式
@@ -19,10 +19,26 @@ except ImportError:
     GUI_AVAILABLE = False
 
 from ..core.format_manager import format_manager
+from ..core.progress import format_duration
+from ..core.job_queue import JobQueue
 from ..config.settings import get_settings, update_settings, save_settings
 from ..i18n.translation import get_available_languages, set_language, t
 
 
+# 转换进度显示的刷新间隔（毫秒）：转换线程只保存最新进度，界面按此间隔读取
+PROGRESS_REFRESH_MS = 100
+
+# 目录转换的批次大小（较小的批次使进度更新更及时）
+GUI_BATCH_SIZE = 64
+
+# 预览翻页的防抖延迟（毫秒）：拖动滑块时只渲染停下来的那一页
+PREVIEW_DEBOUNCE_MS = 50
+
+# 预览中按类别ID循环使用的框颜色
+PREVIEW_COLORS = ('#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6',
+                  '#1abc9c', '#e67e22', '#34495e', '#ff6b81', '#7bed9f')
+
+
 class DatasetConverterGUI:
     """数据集格式转换器图形界面"""
     
@@ -38,6 +54,21 @@ class DatasetConverterGUI:
         # 初始化变量
         self.root = tk.Tk()
         self.current_class_names = []
+        # 当前后台扫描的取消事件（没有进行中的扫描时为None）
+        self._scan_cancel: Optional[threading.Event] = None
+        # 转换线程写入的最新进度快照（见 core/progress.py），由 refresh_progress 读取
+        self._latest_progress = None
+        self._converting = False
+        # 任务队列（进程池在第一次加入任务时创建）
+        self.job_queue = JobQueue(workers=max(1, self.settings.job_workers))
+        self._jobs_polling = False
+        # 预览器（见 core/preview.py）和当前显示的图片（须保留引用，否则 Tk 图片被回收）
+        self.preview = None
+        self.preview_image_dir = None
+        self._preview_photo = None
+        self._preview_after_id = None
+        # 当前后台加载的标识（没有进行中的加载时为None），旧的加载结果不再显示
+        self._preview_token = None
         self.setup_window()
         self.setup_styles()
         self.create_widgets()
@@ -120,6 +151,8 @@ class DatasetConverterGUI:
         
         # 创建各个Tab
         self.create_converter_tab()
+        self.create_jobs_tab()
+        self.create_preview_tab()
         self.create_settings_tab()
         
         # 状态栏
@@ -173,6 +206,196 @@ class DatasetConverterGUI:
         # 转换区域
         self.create_conversion_step(content_frame, 5)
     
+    def create_jobs_tab(self):
+        """创建任务队列Tab"""
+        jobs_frame = ttk.Frame(self.notebook, padding="20")
+        self.notebook.add(jobs_frame, text=t('gui.jobs'))
+        jobs_frame.columnconfigure(0, weight=1)
+        jobs_frame.rowconfigure(1, weight=1)
+        
+        # 并发任务数
+        workers_frame = ttk.Frame(jobs_frame)
+        workers_frame.grid(row=0, column=0, sticky=tk.W, pady=(0, 10))
+        ttk.Label(workers_frame, text=t('gui.job_workers')).pack(side=tk.LEFT, padx=(0, 8))
+        self.job_workers_var = tk.StringVar(value=str(self.job_queue.workers))
+        ttk.Spinbox(workers_frame, from_=1, to=os.cpu_count() or 1, width=5,
+                    textvariable=self.job_workers_var,
+                    command=self.on_job_workers_change).pack(side=tk.LEFT)
+        
+        # 任务列表
+        columns = ('job_id', 'input', 'output', 'status', 'progress', 'speed', 'duration')
+        self.jobs_tree = ttk.Treeview(jobs_frame, columns=columns, show='headings', height=12)
+        widths = {'job_id': 40, 'input': 180, 'output': 180, 'status': 90,
+                  'progress': 90, 'speed': 90, 'duration': 80}
+        for column in columns:
+            self.jobs_tree.heading(column, text=t(f'gui.job_column_{column}'))
+            self.jobs_tree.column(column, width=widths[column], anchor=tk.W)
+        self.jobs_tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        jobs_scrollbar = ttk.Scrollbar(jobs_frame, orient="vertical", command=self.jobs_tree.yview)
+        jobs_scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        self.jobs_tree.configure(yscrollcommand=jobs_scrollbar.set)
+        
+        # 操作按钮
+        button_frame = ttk.Frame(jobs_frame)
+        button_frame.grid(row=2, column=0, sticky=tk.W, pady=(10, 0))
+        for text_key, action in (('gui.job_pause', self.job_queue.pause),
+                                 ('gui.job_resume', self.job_queue.resume),
+                                 ('gui.job_cancel', self.job_queue.cancel)):
+            button = ttk.Button(button_frame, text=t(text_key), width=12,
+                                command=lambda action=action: self.apply_to_selected_jobs(action))
+            button.pack(side=tk.LEFT, padx=(0, 8))
+        ttk.Button(button_frame, text=t('gui.job_clear_finished'), width=16,
+                   command=self.clear_finished_jobs).pack(side=tk.LEFT)
+    
+    def create_preview_tab(self):
+        """创建预览Tab"""
+        preview_frame = ttk.Frame(self.notebook, padding="20")
+        self.notebook.add(preview_frame, text=t('gui.preview'))
+        preview_frame.columnconfigure(0, weight=1)
+        preview_frame.rowconfigure(1, weight=1)
+        
+        # 工具栏
+        toolbar = ttk.Frame(preview_frame)
+        toolbar.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        toolbar.columnconfigure(4, weight=1)
+        ttk.Button(toolbar, text=t('gui.preview_load'), width=12,
+                   command=self.load_preview).grid(row=0, column=0, padx=(0, 8))
+        ttk.Button(toolbar, text=t('gui.preview_image_folder'), width=12,
+                   command=self.select_preview_image_dir).grid(row=0, column=1, padx=(0, 8))
+        ttk.Button(toolbar, text="◀", width=3,
+                   command=lambda: self.step_preview(-1)).grid(row=0, column=2)
+        ttk.Button(toolbar, text="▶", width=3,
+                   command=lambda: self.step_preview(1)).grid(row=0, column=3, padx=(0, 8))
+        self.preview_index_var = tk.DoubleVar(value=0)
+        self.preview_scale = ttk.Scale(toolbar, from_=0, to=0, variable=self.preview_index_var,
+                                       command=lambda value: self.schedule_preview())
+        self.preview_scale.grid(row=0, column=4, sticky=(tk.W, tk.E))
+        
+        # 画布（只绘制当前页）
+        self.preview_canvas = tk.Canvas(preview_frame, background='#2c3e50', highlightthickness=0,
+                                        width=800, height=500)
+        self.preview_canvas.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.preview_canvas.bind('<Configure>', lambda event: self.schedule_preview())
+        
+        self.preview_label = ttk.Label(preview_frame, text=t('gui.preview_empty'), style='Info.TLabel')
+        self.preview_label.grid(row=2, column=0, sticky=tk.W, pady=(8, 0))
+    
+    def select_preview_image_dir(self):
+        """选择预览使用的图片目录"""
+        dirname = filedialog.askdirectory(title=t('gui.preview_image_folder'))
+        if dirname:
+            self.preview_image_dir = dirname
+            if self.preview is not None:
+                self.load_preview()
+    
+    def load_preview(self):
+        """按当前输入配置打开预览（在后台线程中打开，COCO 等单文件数据集需要先解析整个文件）"""
+        input_path = self.input_var.get()
+        input_format = self.input_format_var.get()
+        try:
+            width = int(self.width_var.get())
+            height = int(self.height_var.get())
+            if not input_path or not input_format or width <= 0 or height <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror(t('gui.error'), t('gui.complete_all_steps'))
+            return
+        
+        token = object()
+        self._preview_token = token
+        self.preview_label.config(text=t('gui.preview_loading'))
+        class_names = self.current_class_names if self.current_class_names else None
+        thread = threading.Thread(target=self.perform_preview_load,
+                                  args=(token, input_path, input_format, width, height,
+                                        class_names, self.preview_image_dir))
+        thread.daemon = True
+        thread.start()
+    
+    def perform_preview_load(self, token, input_path, input_format, width, height, class_names, image_dir):
+        """后台打开预览，结果通过 root.after 交回主线程"""
+        try:
+            preview = format_manager.open_preview(
+                input_path, input_format, width, height, class_names, image_dir=image_dir
+            )
+        except Exception as e:
+            error_msg = str(e)
+            self.root.after(0, lambda: self.preview_load_failed(token, error_msg))
+            return
+        self.root.after(0, lambda: self.preview_loaded(token, preview))
+    
+    def preview_loaded(self, token, preview):
+        """预览打开完成（主线程）"""
+        if token is not self._preview_token:
+            return
+        self._preview_token = None
+        self.preview = preview
+        self.preview_scale.config(to=max(len(self.preview) - 1, 0))
+        self.preview_index_var.set(0)
+        self.render_preview()
+    
+    def preview_load_failed(self, token, error_msg):
+        """预览打开失败（主线程，保留之前的预览）"""
+        if token is not self._preview_token:
+            return
+        self._preview_token = None
+        self.render_preview()
+        messagebox.showerror(t('gui.error'), error_msg)
+    
+    def step_preview(self, offset):
+        """前后翻页"""
+        if self.preview is None or not len(self.preview):
+            return
+        index = min(max(int(round(self.preview_index_var.get())) + offset, 0), len(self.preview) - 1)
+        self.preview_index_var.set(index)
+        self.render_preview()
+    
+    def schedule_preview(self):
+        """延迟渲染预览（连续拖动滑块或调整窗口大小时只渲染最后一次）"""
+        if self._preview_after_id is not None:
+            self.root.after_cancel(self._preview_after_id)
+        self._preview_after_id = self.root.after(PREVIEW_DEBOUNCE_MS, self.render_preview)
+    
+    def render_preview(self):
+        """渲染当前页：图片、旋转框多边形和类别名称"""
+        self._preview_after_id = None
+        canvas = self.preview_canvas
+        canvas.delete('all')
+        if self.preview is None or not len(self.preview):
+            self.preview_label.config(text=t('gui.preview_empty'))
+            return
+        
+        index = min(max(int(round(self.preview_index_var.get())), 0), len(self.preview) - 1)
+        canvas_width = max(canvas.winfo_width(), 1)
+        canvas_height = max(canvas.winfo_height(), 1)
+        frame = self.preview.render(index, canvas_width, canvas_height)
+        page = f"{index + 1} / {len(self.preview)}: {self.preview.page_name(index)}"
+        if frame is None:
+            self.preview_label.config(text=f"{page} - {t('gui.preview_failed')}")
+            return
+        
+        left = (canvas_width - frame.width) // 2
+        top = (canvas_height - frame.height) // 2
+        self._preview_photo = None
+        if frame.image is not None:
+            try:
+                from PIL import ImageTk
+                self._preview_photo = ImageTk.PhotoImage(frame.image)
+                canvas.create_image(left, top, image=self._preview_photo, anchor=tk.NW)
+            except ImportError:
+                pass
+        if self._preview_photo is None:
+            # 没有图片时只画出图片范围
+            canvas.create_rectangle(left, top, left + frame.width, top + frame.height, outline='#7f8c8d')
+        
+        for class_id, class_name, coords in frame.polygons:
+            color = PREVIEW_COLORS[(class_id or 0) % len(PREVIEW_COLORS)]
+            points = [value + (left if i % 2 == 0 else top) for i, value in enumerate(coords)]
+            canvas.create_polygon(points, outline=color, fill='', width=2)
+            canvas.create_text(points[0], points[1], text=class_name, fill=color, anchor=tk.SW,
+                               font=('TkDefaultFont', 8))
+        
+        self.preview_label.config(text=f"{page} ({t('gui.preview_boxes', count=len(frame.polygons))})")
+    
     def create_settings_tab(self):
         """创建设置Tab"""
         settings_frame = ttk.Frame(self.notebook, padding="20")
@@ -406,7 +629,12 @@ class DatasetConverterGUI:
         self.convert_button = ttk.Button(button_frame, text=t('gui.start_conversion'), 
                                        command=self.start_conversion, state='disabled',
                                        style='Primary.TButton', width=20, padding=(10, 8))
-        self.convert_button.pack()
+        self.convert_button.pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.enqueue_button = ttk.Button(button_frame, text=t('gui.add_to_queue'), 
+                                       command=self.enqueue_conversion, state='disabled',
+                                       width=16, padding=(10, 8))
+        self.enqueue_button.pack(side=tk.LEFT)
     
     def create_language_section(self, parent):
         """创建语言选择区域"""
@@ -525,12 +753,13 @@ class DatasetConverterGUI:
     def show_format_example(self, format_name, text_widget):
         """显示格式示例"""
         examples = {
-            '': '请选择一个格式以查看示例\n\n支持的格式包括：\n• YOLO-HBB - 水平边界框格式\n• YOLO-OBB - 旋转边界框格式\n• LabelImg-OBB - LabelImg工具格式\n• DOTA - 遥感数据格式\n• PASCAL-VOC - XML标注格式',
+            '': '请选择一个格式以查看示例\n\n支持的格式包括：\n• YOLO-HBB - 水平边界框格式\n• YOLO-OBB - 旋转边界框格式\n• LabelImg-OBB - LabelImg工具格式\n• DOTA - 遥感数据格式\n• PASCAL-VOC - XML标注格式\n• COCO - JSON数据集格式',
             'YOLO-HBB': '格式说明：\nclass_id x_center y_center width height\n(归一化坐标，范围0-1)\n\n示例内容：\n0 0.5 0.5 0.3 0.4\n1 0.2 0.3 0.1 0.2\n\n说明：\n第一行：类别0，中心点(0.5,0.5)，宽0.3，高0.4\n第二行：类别1，中心点(0.2,0.3)，宽0.1，高0.2',
             'YOLO-OBB': '格式说明：\nclass_id x1 y1 x2 y2 x3 y3 x4 y4\n(归一化坐标，四个角点)\n\n示例内容：\n0 0.1 0.1 0.9 0.1 0.9 0.9 0.1 0.9\n1 0.2 0.2 0.8 0.2 0.8 0.8 0.2 0.8\n\n说明：\n每行8个坐标值表示矩形的4个角点\n按顺序：左上→右上→右下→左下',
             'LabelImg-OBB': '格式说明：\n第一行固定为"YOLO_OBB"\n后续：class_id x_center y_center width height angle\n(像素坐标+角度)\n\n示例内容：\nYOLO_OBB\n0 960 540 800 600 45.0\n1 480 270 400 300 0.0\n\n说明：\n包含旋转角度信息的边界框格式',
             'DOTA': '格式说明：\nx1 y1 x2 y2 x3 y3 x4 y4 class_name [difficulty]\n(像素坐标+类别名+难度)\n\n示例内容：\n100 100 200 100 200 200 100 200 plane 0\n300 300 400 300 400 400 300 400 ship 1\n\n说明：\n遥感图像标注格式，支持任意四边形\n最后的数字表示标注难度（可选）',
-            'PASCAL-VOC': '格式说明：\nXML文件格式，包含边界框信息\n\n示例结构：\n<?xml version="1.0"?>\n<annotation>\n  <object>\n    <name>person</name>\n    <bndbox>\n      <xmin>100</xmin>\n      <ymin>100</ymin>\n      <xmax>200</xmax>\n      <ymax>200</ymax>\n    </bndbox>\n  </object>\n</annotation>\n\n说明：标准的目标检测XML格式'
+            'PASCAL-VOC': '格式说明：\nXML文件格式，包含边界框信息\n\n示例结构：\n<?xml version="1.0"?>\n<annotation>\n  <object>\n    <name>person</name>\n    <bndbox>\n      <xmin>100</xmin>\n      <ymin>100</ymin>\n      <xmax>200</xmax>\n      <ymax>200</ymax>\n    </bndbox>\n  </object>\n</annotation>\n\n说明：标准的目标检测XML格式',
+            'COCO': '格式说明：\n整个数据集保存在一个JSON文件中\n\n示例结构：\n{\n  "images": [{"id": 1, "file_name": "a.jpg",\n              "width": 1920, "height": 1080}],\n  "annotations": [{"id": 1, "image_id": 1,\n                   "category_id": 1,\n                   "bbox": [100, 100, 100, 100]}],\n  "categories": [{"id": 1, "name": "person"}]\n}\n\n说明：bbox为像素坐标[x, y, w, h]，\n旋转框使用四点segmentation多边形'
         }
         
         example_text = examples.get(format_name, f'{format_name} 格式示例')
@@ -549,6 +778,8 @@ class DatasetConverterGUI:
         # 根据格式设置文件类型过滤
         if input_format == 'PASCAL-VOC':
             filetypes = [(t('gui.xml_files'), "*.xml"), (t('gui.all_files'), "*.*")]
+        elif input_format == 'COCO':
+            filetypes = [(t('gui.json_files'), "*.json"), (t('gui.all_files'), "*.*")]
         else:
             filetypes = [(t('gui.text_files'), "*.txt"), (t('gui.all_files'), "*.*")]
         
@@ -558,21 +789,8 @@ class DatasetConverterGUI:
         )
         if filename:
             self.input_var.set(filename)
-            # 自动检测格式（可选）
-            detected = format_manager.detect_format(filename)
-            if detected and detected != input_format:
-                result = messagebox.askyesno(
-                    t('gui.format_mismatch_title'), 
-                    t('gui.format_mismatch_message').format(
-                        detected=detected, selected=input_format
-                    )
-                )
-                if result:
-                    self.input_format_var.set(detected)
-                    self.on_input_format_change()
-            
-            # 刷新类别
-            self.refresh_classes()
+            # 刷新类别，同时在后台自动检测格式
+            self.refresh_classes(detect_format=True)
     
     def select_input_folder(self):
         """选择输入目录"""
@@ -606,15 +824,25 @@ class DatasetConverterGUI:
             ]
         )
         if filename:
+            # 手动加载的类别表优先，不再显示后台扫描的结果
+            self.cancel_scan()
             try:
                 with open(filename, 'r', encoding='utf-8') as f:
                     self.current_class_names = [line.strip() for line in f.readlines() if line.strip()]
-                self.update_classes_display()
             except Exception as e:
                 messagebox.showerror(t('gui.error'), f"{t('gui.load_classes_error')}: {e}")
+            self.update_classes_display()
     
-    def refresh_classes(self):
-        """刷新类别列表"""
+    def refresh_classes(self, detect_format=False):
+        """
+        刷新类别列表（在后台线程中扫描，不阻塞界面）
+        
+        进行中的扫描会被取消，其结果不再显示。
+        
+        Args:
+            detect_format: 是否同时检测输入文件的格式（仅输入为单个文件时）
+        """
+        self.cancel_scan()
         input_path = self.input_var.get()
         input_format = self.input_format_var.get()
         
@@ -623,26 +851,88 @@ class DatasetConverterGUI:
             self.update_classes_display()
             return
         
-        try:
-            format_instance = format_manager.get_format(input_format)
-            
-            if os.path.isfile(input_path):
-                self.current_class_names = format_instance._get_class_names([input_path])
-            else:
-                # 目录情况
-                file_paths = []
-                for f in os.listdir(input_path):
-                    if f.endswith(format_instance.file_extension):
-                        file_paths.append(os.path.join(input_path, f))
-                self.current_class_names = format_instance._get_class_names(file_paths[:5])  # 只检查前5个文件
-            
-            self.update_classes_display()
+        cancel = threading.Event()
+        self._scan_cancel = cancel
+        self.current_class_names = []
+        self.update_classes_display()
+        self.refresh_classes_btn.config(state='disabled')
+        self.classes_status.config(text=t('gui.scanning'), style='Info.TLabel')
+        self.status_var.set(t('gui.scanning'))
+        
+        thread = threading.Thread(target=self.perform_scan,
+                                  args=(input_path, input_format, detect_format, cancel))
+        thread.daemon = True
+        thread.start()
+    
+    def cancel_scan(self):
+        """取消进行中的后台扫描（恢复刷新按钮和状态栏，新的扫描开始时会重新设置）"""
+        if self._scan_cancel is not None:
+            self._scan_cancel.set()
+            self._scan_cancel = None
             self.refresh_classes_btn.config(state='normal')
-            
+            self.status_var.set(t('gui.ready'))
+    
+    def perform_scan(self, input_path, input_format, detect_format, cancel):
+        """后台扫描：格式检测和类别提取，结果通过 root.after 交回主线程"""
+        def report_progress(scanned, total):
+            if not cancel.is_set():
+                self.root.after(0, lambda: self.scan_progress(cancel, scanned, total))
+        
+        try:
+            detected = None
+            if detect_format and os.path.isfile(input_path):
+                detected = format_manager.detect_format(input_path)
+            # 扫描全部文件（并行、带缓存），避免只检查前几个文件时遗漏类别
+            class_names = format_manager.discover_class_names(
+                input_path, input_format, cancel=cancel, progress=report_progress
+            )
         except Exception as e:
-            self.current_class_names = []
-            self.update_classes_display()
-            print(f"刷新类别时出错: {e}")
+            error_msg = str(e)
+            self.root.after(0, lambda: self.scan_failed(cancel, error_msg))
+            return
+        
+        if class_names is not None:
+            self.root.after(0, lambda: self.scan_completed(cancel, input_format, class_names, detected))
+    
+    def scan_progress(self, cancel, scanned, total):
+        """后台扫描进度（主线程）"""
+        if cancel is not self._scan_cancel:
+            return
+        text = t('gui.scanning_files', count=total, scanned=scanned)
+        self.classes_status.config(text=text, style='Info.TLabel')
+        self.status_var.set(text)
+    
+    def scan_completed(self, cancel, input_format, class_names, detected):
+        """后台扫描完成（主线程）"""
+        if cancel is not self._scan_cancel:
+            return
+        self._scan_cancel = None
+        self.current_class_names = class_names
+        self.refresh_classes_btn.config(state='normal')
+        self.status_var.set(t('gui.ready'))
+        self.update_classes_display()
+        
+        if detected and detected != input_format:
+            result = messagebox.askyesno(
+                t('gui.format_mismatch_title'), 
+                t('gui.format_mismatch_message').format(
+                    detected=detected, selected=input_format
+                )
+            )
+            if result:
+                self.input_format_var.set(detected)
+                self.on_input_format_change()
+    
+    def scan_failed(self, cancel, error_msg):
+        """后台扫描失败（主线程）"""
+        if cancel is not self._scan_cancel:
+            return
+        self._scan_cancel = None
+        self.current_class_names = []
+        self.refresh_classes_btn.config(state='normal')
+        self.status_var.set(t('gui.ready'))
+        self.update_classes_display()
+        print(f"刷新类别时出错: {error_msg}")
     
     def update_classes_display(self):
         """更新类别显示"""
@@ -683,6 +973,7 @@ class DatasetConverterGUI:
             self.conversion_summary.config(text=t('gui.complete_all_steps'))
             if hasattr(self, 'convert_button'):
                 self.convert_button.config(state='disabled')
+                self.enqueue_button.config(state='disabled')
             return
         
         try:
@@ -694,6 +985,7 @@ class DatasetConverterGUI:
             self.conversion_summary.config(text=t('gui.invalid_dimensions'))
             if hasattr(self, 'convert_button'):
                 self.convert_button.config(state='disabled')
+                self.enqueue_button.config(state='disabled')
             return
         
         # 创建摘要文本
@@ -711,7 +1003,10 @@ class DatasetConverterGUI:
         summary_text = "\n".join(summary_parts)
         self.conversion_summary.config(text=summary_text)
         if hasattr(self, 'convert_button'):
-            self.convert_button.config(state='normal')
+            # 类别扫描完成前不允许开始转换
+            state = 'disabled' if self._scan_cancel is not None else 'normal'
+            self.convert_button.config(state=state)
+            self.enqueue_button.config(state=state)
     
     def on_language_change(self, event=None):
         """语言切换事件处理"""
@@ -728,8 +1023,8 @@ class DatasetConverterGUI:
                 )
                 break
     
-    def start_conversion(self):
-        """开始转换（在新线程中执行）"""
+    def check_conversion_config(self):
+        """检查转换配置是否完整，不完整时显示错误并返回False"""
         input_format = self.input_format_var.get()
         output_format = self.output_format_var.get()
         input_path = self.input_var.get()
@@ -737,7 +1032,7 @@ class DatasetConverterGUI:
         
         if not all([input_format, output_format, input_path, output_path]):
             messagebox.showerror(t('gui.error'), t('gui.complete_all_steps'))
-            return
+            return False
         
         try:
             width = int(self.width_var.get())
@@ -746,22 +1041,124 @@ class DatasetConverterGUI:
                 raise ValueError
         except ValueError:
             messagebox.showerror(t('gui.error'), t('gui.invalid_dimensions'))
-            return
+            return False
         
         if not os.path.exists(input_path):
             messagebox.showerror(t('gui.error'), t('gui.input_not_exists'))
+            return False
+        return True
+    
+    def enqueue_conversion(self):
+        """将当前配置加入任务队列（在进程池中执行，可与其他任务并发）"""
+        if not self.check_conversion_config():
+            return
+        self.job_queue.submit(
+            self.input_var.get(), self.output_var.get(),
+            self.input_format_var.get(), self.output_format_var.get(),
+            int(self.width_var.get()), int(self.height_var.get()),
+            self.current_class_names if self.current_class_names else None
+        )
+        self.status_var.set(t('gui.job_added'))
+        if not self._jobs_polling:
+            self._jobs_polling = True
+            self.root.after(0, self.refresh_jobs)
+    
+    def refresh_jobs(self):
+        """定时更新任务队列并刷新任务列表（主线程）"""
+        self.job_queue.poll()
+        self.update_jobs_display()
+        if self.job_queue.has_active_jobs:
+            self.root.after(PROGRESS_REFRESH_MS, self.refresh_jobs)
+        else:
+            self._jobs_polling = False
+    
+    def update_jobs_display(self):
+        """刷新任务列表"""
+        jobs = self.job_queue.jobs
+        for item in self.jobs_tree.get_children():
+            if int(item) not in jobs:
+                self.jobs_tree.delete(item)
+        for job_id, job in jobs.items():
+            progress = job.progress
+            if job.status == 'failed':
+                progress_text = job.error or ''
+            elif progress is not None:
+                progress_text = f"{progress.files_done}/{progress.files_total}"
+            else:
+                progress_text = ''
+            values = (
+                job_id, os.path.basename(job.input_path), os.path.basename(job.output_path),
+                t(f'gui.job_{job.status}'), progress_text,
+                f"{progress.files_per_second:.1f}/s" if progress is not None else '',
+                format_duration(job.duration) if job.duration is not None else ''
+            )
+            if self.jobs_tree.exists(str(job_id)):
+                self.jobs_tree.item(str(job_id), values=values)
+            else:
+                self.jobs_tree.insert('', tk.END, iid=str(job_id), values=values)
+    
+    def apply_to_selected_jobs(self, action):
+        """对选中的任务执行暂停/继续/取消"""
+        for item in self.jobs_tree.selection():
+            if int(item) in self.job_queue.jobs:
+                action(int(item))
+        self.update_jobs_display()
+        if self.job_queue.has_active_jobs and not self._jobs_polling:
+            self._jobs_polling = True
+            self.root.after(PROGRESS_REFRESH_MS, self.refresh_jobs)
+    
+    def clear_finished_jobs(self):
+        """从列表中移除已结束的任务"""
+        self.job_queue.clear_finished()
+        self.update_jobs_display()
+    
+    def on_job_workers_change(self):
+        """并发任务数变化事件"""
+        try:
+            workers = int(self.job_workers_var.get())
+            self.job_queue.workers = workers
+        except ValueError:
+            return
+        update_settings(job_workers=workers)
+    
+    def start_conversion(self):
+        """开始转换（在新线程中执行）"""
+        if not self.check_conversion_config():
             return
         
         # 禁用转换按钮
         self.convert_button.config(state='disabled')
         self.progress_var.set(0)
         self.status_var.set(t('gui.converting'))
+        self._latest_progress = None
+        self._converting = True
+        self.root.after(PROGRESS_REFRESH_MS, self.refresh_progress)
         
         # 在新线程中执行转换
         thread = threading.Thread(target=self.perform_conversion)
         thread.daemon = True
         thread.start()
     
+    def report_progress(self, progress):
+        """转换进度回调（转换线程）：只保存最新快照，不直接更新界面"""
+        self._latest_progress = progress
+    
+    def refresh_progress(self):
+        """按固定帧率显示最新的转换进度（主线程）"""
+        if not self._converting:
+            return
+        progress = self._latest_progress
+        if progress is not None:
+            self.progress_var.set(progress.fraction * 100)
+            self.status_var.set(t(
+                'gui.conversion_progress',
+                done=progress.files_done, total=progress.files_total,
+                files_rate=f"{progress.files_per_second:.1f}",
+                boxes_rate=f"{progress.boxes_per_second:.0f}",
+                eta=format_duration(progress.eta), errors=progress.failed_files
+            ))
+        self.root.after(PROGRESS_REFRESH_MS, self.refresh_progress)
+    
     def perform_conversion(self):
         """执行转换操作"""
         try:
@@ -772,9 +1169,6 @@ class DatasetConverterGUI:
             width = int(self.width_var.get())
             height = int(self.height_var.get())
             
-            # 更新进度
-            self.root.after(0, lambda: self.progress_var.set(25))
-            
             # 执行转换
             if os.path.isfile(input_path):
                 # 单文件转换
@@ -796,11 +1190,11 @@ class DatasetConverterGUI:
                     output_format=output_format,
                     image_width=width,
                     image_height=height,
-                    class_names=self.current_class_names if self.current_class_names else None
+                    class_names=self.current_class_names if self.current_class_names else None,
+                    batch_size=GUI_BATCH_SIZE,
+                    progress=self.report_progress
                 )
             
-            # 更新进度
-            self.root.after(0, lambda: self.progress_var.set(100))
             self.root.after(0, self.conversion_completed)
             
         except Exception as e:
@@ -809,6 +1203,7 @@ class DatasetConverterGUI:
     
     def conversion_completed(self):
         """转换完成处理"""
+        self._converting = False
         self.status_var.set(t('gui.conversion_completed'))
         self.convert_button.config(state='normal')
         self.progress_var.set(0)
@@ -824,6 +1219,7 @@ class DatasetConverterGUI:
     
     def conversion_failed(self, error_msg):
         """转换失败处理"""
+        self._converting = False
         self.status_var.set(t('gui.conversion_failed'))
         self.convert_button.config(state='normal')
         self.progress_var.set(0)
@@ -831,6 +1227,8 @@ class DatasetConverterGUI:
     
     def on_closing(self):
         """窗口关闭事件"""
+        self.cancel_scan()
+        self.job_queue.shutdown()
         # 保存窗口大小
         width = self.root.winfo_width()
         height = self.root.winfo_height()